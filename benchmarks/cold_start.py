@@ -0,0 +1,87 @@
+"""Cold start benchmark for the Streamlit entry point.
+
+Imports every app module in a fresh interpreter (so nothing is cached by an earlier import)
+and reports the wall time of each import plus the slowest dependencies from `python -X importtime`.
+
+Run from the repository root:
+
+	python benchmarks/cold_start.py
+	python benchmarks/cold_start.py --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported by streamlit_app.py before the first paint, then the ones it loads lazily
+EAGER_MODULES = [
+	"streamlit",
+	"utils.diagnostics.startup",
+	"utils.sidebar.navigation",
+	"utils.sidebar.helper",
+	"utils.page_config",
+]
+LAZY_MODULES = [
+	"utils.connection.weaviate_client",
+	"utils.cluster.cluster_operations_handlers",
+]
+
+# Import a module in a fresh interpreter, returns (wall seconds, importtime stderr)
+def import_in_subprocess(module_name):
+	start = time.perf_counter()
+	result = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+		cwd=REPO_ROOT,
+		capture_output=True,
+		text=True,
+	)
+	elapsed = time.perf_counter() - start
+	if result.returncode != 0:
+		raise RuntimeError(f"Importing {module_name} failed:\n{result.stderr[-2000:]}")
+	return elapsed, result.stderr
+
+# Interpreter start-up imports, present in every run
+STARTUP_PACKAGES = {"site", "encodings", "_frozen_importlib_external", "codecs", "io", "abc", "os", "stat", "posixpath", "genericpath", "_collections_abc", "_distutils_hack", "_sitebuiltins"}
+
+# Parse `-X importtime` output into {top level package: self time in microseconds}.
+# Summing self times per package attributes every nested import to the package it belongs to.
+def package_breakdown(importtime_output):
+	breakdown = {}
+	for line in importtime_output.splitlines():
+		if not line.startswith("import time:") or "self [us]" in line:
+			continue
+		self_us, _, name = line[len("import time:"):].split("|")
+		package = name.strip().split(".")[0]
+		if package not in STARTUP_PACKAGES:
+			breakdown[package] = breakdown.get(package, 0) + int(self_us)
+	return breakdown
+
+def main():
+	parser = argparse.ArgumentParser(description="Cold start breakdown per module")
+	parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module (median is reported)")
+	parser.add_argument("--top", type=int, default=10, help="slowest dependencies to list per module")
+	args = parser.parse_args()
+
+	baseline = statistics.median(import_in_subprocess("sys")[0] for _ in range(args.runs))
+	print(f"Interpreter start-up: {baseline * 1000:.0f} ms (subtracted below)\n")
+
+	for phase, modules in (("before first paint", EAGER_MODULES), ("lazy, on first use", LAZY_MODULES)):
+		print(f"== Modules imported {phase} ==")
+		for module_name in modules:
+			runs = [import_in_subprocess(module_name) for _ in range(args.runs)]
+			wall = statistics.median(elapsed for elapsed, _ in runs) - baseline
+			print(f"{module_name:<45} {wall * 1000:8.0f} ms")
+			breakdown = package_breakdown(runs[-1][1])
+			for package, cumulative_us in sorted(breakdown.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+				print(f"    {package:<41} {cumulative_us / 1000:8.1f} ms")
+		print()
+
+	eager_total = import_in_subprocess(", ".join(EAGER_MODULES))[0] - baseline
+	print(f"All eager imports together (shared dependencies counted once): {eager_total * 1000:.0f} ms")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,629 @@
+"""Local stand-in for a Weaviate cluster, for benchmarks.
+
+Synthesizes a cluster of any size (collections, tenants, nodes, shards, replicas and objects) without
+storing objects: object UUIDs are derived from their position, so a 100M object cluster costs no more
+memory than a small one. It serves the REST endpoints the app uses (meta, nodes, schema, tenants,
+objects, cluster statistics, GraphQL aggregate) and the gRPC calls the Python client needs
+(health check, tenants, fetch objects, also by ID), with a configurable latency per request.
+
+Replicas can be given drift: some shards miss their last objects on one replica. Reading a missing
+object with consistency_level=ALL (REST, or a gRPC fetch by ID) repairs it, like a read repair on a real
+cluster. Reading a single object with node_name answers for that node's replica only; like Weaviate, the
+list endpoint ignores node_name. Shards can also start READONLY (like after disk pressure) and be set
+back to READY through the shard status endpoint.
+
+Run from the repository root:
+
+	python benchmarks/fake_weaviate.py --collections 100 --mt-collections 10 --tenants 1000
+	python benchmarks/fake_weaviate.py --port 8080 --grpc-port 50051 --latency 5 --drift 0.1
+
+Connect the app with a Custom connection to 127.0.0.1 and the printed ports.
+"""
+import argparse
+import json
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+import grpc
+from weaviate.proto.v1 import weaviate_pb2_grpc, health_weaviate_pb2, search_get_pb2, tenants_pb2, properties_pb2, base_pb2
+
+# Reported server version. Below 1.29 the client aggregates through GraphQL (REST), from 1.25 it
+# lists tenants and fetches objects through gRPC.
+FAKE_VERSION = "1.28.4"
+VECTOR_DIMENSIONS = 8
+
+# Synthetic cluster state. Shards are (collection index, shard index) pairs; multi-tenant collections
+# have one shard per tenant. Every shard keeps its object count and the count on each replica.
+class FakeCluster:
+	def __init__(self, collections=20, mt_collections=5, tenants=100, nodes=3, shards=3, replication=3, objects=1000, drift=0.0, latency=0.0, seed=42, readonly=0.0, raft_lag=0.0, leader_change=0.0, error_rate=0.0):
+		self.latency = latency / 1000
+		self.error_rate = error_rate
+		self.raft_lag = raft_lag
+		self.leader_change = leader_change
+		self.nodes = [f"weaviate-{i}" for i in range(nodes)]
+		self.replication = min(replication, nodes)
+		self.started_at = time.time()
+		self.lock = threading.Lock()
+		self.state_version = 0
+		self.requests = {}
+		self._nodes_cache = {}
+
+		rng = random.Random(seed)
+		self.collections = []
+		for index in range(collections + mt_collections):
+			multi_tenant = index >= collections
+			name = f"TenantCollection{index:05d}" if multi_tenant else f"Collection{index:05d}"
+			shard_total = tenants if multi_tenant else shards
+			collection = {"name": name, "multi_tenant": multi_tenant, "shards": []}
+			for shard_index in range(shard_total):
+				count = int(objects * rng.uniform(0.5, 1.5))
+				start = (index + shard_index) % nodes
+				replicas = [self.nodes[(start + r) % nodes] for r in range(self.replication)]
+				replica_counts = [count] * len(replicas)
+				if drift and rng.random() < drift and count:
+					replica_counts[rng.randrange(len(replicas))] = count - rng.randint(1, max(count // 100, 1))
+				collection["shards"].append({
+					"name": f"tenant{shard_index:07d}" if multi_tenant else f"{index:05d}{shard_index:07d}",
+					"count": count,
+					"replicas": replicas,
+					"replica_counts": replica_counts,
+					"status": "READONLY" if readonly and rng.random() < readonly else "READY",
+				})
+			collection["total"] = sum(shard["count"] for shard in collection["shards"])
+			collection["tenants"] = {shard["name"]: i for i, shard in enumerate(collection["shards"])} if multi_tenant else {}
+			self.collections.append(collection)
+		self.by_name = {collection["name"].lower(): index for index, collection in enumerate(self.collections)}
+		self.shard_positions = [{shard["name"]: position for position, shard in enumerate(collection["shards"])} for collection in self.collections]
+
+	# ---------------------------------------------------------------- objects
+	# Object UUIDs sort in position order: collection, tenant, shard, object index
+	@staticmethod
+	def object_uuid(collection_index, tenant_index, shard_index, object_index):
+		return f"{collection_index:08x}-{tenant_index >> 12:04x}-4{tenant_index & 0xfff:03x}-8{shard_index:03x}-{object_index:012x}"
+
+	@staticmethod
+	def parse_uuid(value):
+		try:
+			parts = str(uuid.UUID(str(value))).split("-")
+			tenant_index = (int(parts[1], 16) << 12) | int(parts[2][1:], 16)
+			return int(parts[0], 16), tenant_index, int(parts[3][1:], 16), int(parts[4], 16)
+		except (ValueError, IndexError):
+			return None
+
+	def collection_index(self, name):
+		return self.by_name.get((name or "").lower())
+
+	# Shard and (tenant, shard) indexes of the objects visible for a collection / tenant
+	def _scopes(self, collection_index, tenant):
+		collection = self.collections[collection_index]
+		if collection["multi_tenant"]:
+			tenant_index = collection["tenants"].get(tenant)
+			return [] if tenant_index is None else [(tenant_index, 0, collection["shards"][tenant_index])]
+		return [(0, shard_index, shard) for shard_index, shard in enumerate(collection["shards"])]
+
+	def count(self, collection_index, tenant=None):
+		return sum(shard["count"] for _, _, shard in self._scopes(collection_index, tenant))
+
+	# UUIDs of a page of objects, starting at `offset` or after the `after` UUID
+	def list_uuids(self, collection_index, tenant=None, limit=25, offset=0, after=None):
+		scopes = self._scopes(collection_index, tenant)
+		if after:
+			parsed = self.parse_uuid(after)
+			if parsed is None:
+				return []
+			keys = [(tenant_index, shard_index) for tenant_index, shard_index, _ in scopes]
+			if parsed[0] != collection_index or (parsed[1], parsed[2]) not in keys:
+				return []
+			start_scope, start_index = keys.index((parsed[1], parsed[2])), parsed[3] + 1
+		else:
+			starts = [0]
+			for _, _, shard in scopes:
+				starts.append(starts[-1] + shard["count"])
+			start_scope = max(bisect_right(starts, offset) - 1, 0)
+			start_index = offset - starts[start_scope] if start_scope < len(scopes) else 0
+
+		uuids = []
+		for tenant_index, shard_index, shard in scopes[start_scope:]:
+			for object_index in range(start_index, shard["count"]):
+				if len(uuids) >= limit:
+					return uuids
+				uuids.append(self.object_uuid(collection_index, tenant_index, shard_index, object_index))
+			start_index = 0
+		return uuids
+
+	# Look up an object, on one node's replica if given. Reading with consistency_level=ALL repairs
+	# replicas that miss it.
+	def get_object(self, collection_index, object_uuid, consistency_level=None, node=None):
+		parsed = self.parse_uuid(object_uuid)
+		if parsed is None or parsed[0] != collection_index:
+			return None
+		_, tenant_index, shard_index, object_index = parsed
+		collection = self.collections[collection_index]
+		shards = collection["shards"]
+		position = tenant_index if collection["multi_tenant"] else shard_index
+		shard = shards[position] if position < len(shards) else None
+		if shard is None or object_index >= shard["count"]:
+			return None
+		if node is not None and (node not in shard["replicas"] or object_index >= shard["replica_counts"][shard["replicas"].index(node)]):
+			return None
+		if consistency_level == "ALL":
+			with self.lock:
+				# Replicas miss the objects from their count on. Repaired objects are remembered until a
+				# replica's count reaches them, so reads in any order (e.g. concurrent ones) repair it.
+				replica_counts = shard["replica_counts"]
+				if min(replica_counts) <= object_index:
+					repaired = shard.setdefault("repaired", set())
+					repaired.add(object_index)
+					for replica, replica_count in enumerate(replica_counts):
+						while replica_count in repaired:
+							replica_count += 1
+						if replica_count != replica_counts[replica]:
+							replica_counts[replica] = replica_count
+							self.state_version += 1
+					lowest = min(replica_counts)
+					shard["repaired"] = {repaired_index for repaired_index in repaired if repaired_index >= lowest}
+		return {
+			"class": collection["name"],
+			"id": object_uuid,
+			"properties": {"name": f"object {object_index}", "position": object_index},
+			"creationTimeUnix": int(self.started_at * 1000),
+			"lastUpdateTimeUnix": int(self.started_at * 1000),
+			**({"tenant": shard["name"]} if collection["multi_tenant"] else {}),
+		}
+
+	# Set the status of a shard (all its replicas). Returns False if the shard does not exist.
+	def set_shard_status(self, collection_index, shard_name, status):
+		position = self.shard_positions[collection_index].get(shard_name)
+		if position is None:
+			return False
+		with self.lock:
+			self.collections[collection_index]["shards"][position]["status"] = status
+			self.state_version += 1
+		return True
+
+	# ---------------------------------------------------------------- cluster endpoints
+	def meta(self):
+		return {"hostname": "http://[::]:8080", "version": FAKE_VERSION, "modules": {"text2vec-openai": {"name": "OpenAI Module", "documentationHref": "https://platform.openai.com/docs/guides/embeddings"}}, "grpcMaxMessageSize": 104858000}
+
+	def nodes_body(self, collection_name=None, output="minimal"):
+		key = (collection_name, output, self.state_version)
+		cached = self._nodes_cache.get(key)
+		if cached is not None:
+			return cached
+
+		collection_index = self.collection_index(collection_name) if collection_name else None
+		node_shards = {node: [] for node in self.nodes}
+		node_objects = {node: 0 for node in self.nodes}
+		for index, collection in enumerate(self.collections):
+			if collection_index is not None and index != collection_index:
+				continue
+			for shard in collection["shards"]:
+				for node, replica_count in zip(shard["replicas"], shard["replica_counts"]):
+					node_objects[node] += replica_count
+					node_shards[node].append({
+						"name": shard["name"],
+						"class": collection["name"],
+						"objectCount": replica_count,
+						"vectorIndexingStatus": shard["status"],
+						"vectorQueueLength": 0,
+						"compressed": False,
+						"loaded": True,
+					})
+		nodes = []
+		for node in self.nodes:
+			entry = {
+				"name": node,
+				"status": "HEALTHY",
+				"version": FAKE_VERSION,
+				"gitHash": "fake000",
+				"stats": {"objectCount": node_objects[node], "shardCount": len(node_shards[node])},
+				"batchStats": {"queueLength": 0, "ratePerSecond": 0},
+			}
+			if output == "verbose":
+				entry["shards"] = node_shards[node]
+			nodes.append(entry)
+		body = json.dumps({"nodes": nodes}).encode()
+		self._nodes_cache = {key: body}
+		return body
+
+	def statistics(self):
+		# Raft indexes advance with time, followers trail the leader by a few entries. With raft_lag the last
+		# node falls behind by that many entries per second more, with leader_change the leader moves to the
+		# next node every that many seconds and the term goes up.
+		elapsed = time.time() - self.started_at
+		commit_index = 1000 + int(elapsed) * 10
+		term = 3
+		leader = 0
+		if self.leader_change:
+			changes = int(elapsed // self.leader_change)
+			term += changes
+			leader = changes % len(self.nodes)
+		configuration = [{"address": f"10.0.0.{i + 1}:8300", "id": node, "suffrage": 0} for i, node in enumerate(self.nodes)]
+		statistics = []
+		for i, node in enumerate(self.nodes):
+			behind = (i - leader) % len(self.nodes)
+			applied_index = commit_index - behind
+			fsm_pending = behind
+			if self.raft_lag and i == len(self.nodes) - 1 and i != leader:
+				applied_index -= int(elapsed * self.raft_lag)
+				fsm_pending += int(elapsed * self.raft_lag)
+			statistics.append({
+				"name": node,
+				"leaderId": self.nodes[leader],
+				"leaderAddress": configuration[leader]["address"],
+				"status": "HEALTHY",
+				"ready": True,
+				"dbLoaded": True,
+				"open": True,
+				"isVoter": True,
+				"initialLastAppliedIndex": 1000,
+				"raft": {
+					"appliedIndex": str(applied_index),
+					"commitIndex": str(commit_index),
+					"lastContact": "0" if i == leader else "12.5ms",
+					"lastLogIndex": str(commit_index),
+					"lastLogTerm": str(term),
+					"numPeers": str(len(self.nodes) - 1),
+					"state": "Leader" if i == leader else "Follower",
+					"term": str(term),
+					"fsmPending": str(fsm_pending),
+					"lastSnapshotIndex": str(commit_index - commit_index % 8192),
+					"lastSnapshotTerm": str(term),
+					"protocolVersion": "3",
+					"protocolVersionMax": "3",
+					"protocolVersionMin": "0",
+					"snapshotVersionMax": "1",
+					"snapshotVersionMin": "0",
+					"latestConfiguration": configuration,
+				},
+			})
+		return {"statistics": statistics, "synchronized": True}
+
+	def class_schema(self, collection):
+		shard_count = 1 if collection["multi_tenant"] else len(collection["shards"])
+		return {
+			"class": collection["name"],
+			"description": "Synthetic collection",
+			"properties": [
+				{"name": "name", "dataType": ["text"], "indexFilterable": True, "indexSearchable": True, "tokenization": "word", "moduleConfig": {}},
+				{"name": "position", "dataType": ["int"], "indexFilterable": True, "indexSearchable": False, "indexRangeFilters": False, "moduleConfig": {}},
+			],
+			"vectorizer": "none",
+			"moduleConfig": {},
+			"vectorIndexType": "hnsw",
+			"vectorIndexConfig": {
+				"skip": False, "cleanupIntervalSeconds": 300, "maxConnections": 32, "efConstruction": 128, "ef": -1,
+				"dynamicEfMin": 100, "dynamicEfMax": 500, "dynamicEfFactor": 8, "vectorCacheMaxObjects": 1000000000000,
+				"flatSearchCutoff": 40000, "distance": "cosine",
+				"pq": {"enabled": False, "bitCompression": False, "segments": 0, "centroids": 256, "trainingLimit": 100000, "encoder": {"type": "kmeans", "distribution": "log-normal"}},
+				"bq": {"enabled": False}, "sq": {"enabled": False, "trainingLimit": 100000, "rescoreLimit": 20},
+				"filterStrategy": "sweeping",
+			},
+			"invertedIndexConfig": {
+				"bm25": {"b": 0.75, "k1": 1.2}, "cleanupIntervalSeconds": 60,
+				"stopwords": {"preset": "en", "additions": None, "removals": None},
+				"indexTimestamps": False, "indexPropertyLength": False, "indexNullState": False,
+			},
+			"replicationConfig": {"factor": self.replication, "asyncEnabled": False, "deletionStrategy": "NoAutomatedResolution"},
+			"shardingConfig": {
+				"virtualPerPhysical": 128, "desiredCount": shard_count, "actualCount": shard_count, "desiredVirtualCount": shard_count * 128,
+				"actualVirtualCount": shard_count * 128, "key": "_id", "strategy": "hash", "function": "murmur3",
+			},
+			"multiTenancyConfig": {"enabled": collection["multi_tenant"], "autoTenantCreation": False, "autoTenantActivation": False},
+		}
+
+	def count_request(self, kind):
+		with self.lock:
+			self.requests[kind] = self.requests.get(kind, 0) + 1
+
+	def wait(self):
+		if self.latency:
+			time.sleep(self.latency)
+
+# Request counters are grouped by endpoint, with collection names and UUIDs replaced
+def _request_kind(method, path):
+	segments = [segment for segment in path.split("/") if segment]
+	known = {"v1", "meta", "nodes", "schema", "tenants", "shards", "objects", "cluster", "statistics", "graphql", ".well-known", "ready", "live", "openid-configuration"}
+	return f"{method} /" + "/".join(segment if segment in known else "{param}" for segment in segments)
+
+class FakeWeaviateHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+	# Headers and body are written separately; without TCP_NODELAY every keep-alive response waits
+	# for the client's delayed ACK (~40ms)
+	disable_nagle_algorithm = True
+	cluster = None
+
+	def log_message(self, *args):
+		pass
+
+	def send_json(self, payload, status=200):
+		body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def not_found(self):
+		self.send_json({"error": [{"message": "not found"}]}, status=404)
+
+	def do_GET(self):
+		parsed = urlparse(self.path)
+		path = unquote(parsed.path).rstrip("/")
+		query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+		cluster = self.cluster
+
+		# Control endpoints of the stand-in itself, not counted
+		if path == "/_fake/stats":
+			with cluster.lock:
+				self.send_json({"requests": dict(cluster.requests), "total": sum(cluster.requests.values())})
+			return
+
+		cluster.count_request(_request_kind("GET", path))
+		cluster.wait()
+		segments = path.split("/")[2:] if path.startswith("/v1") else []
+
+		if path in ("/v1/.well-known/ready", "/v1/.well-known/live"):
+			self.send_json({})
+		elif path == "/v1/meta":
+			self.send_json(cluster.meta())
+		elif segments[:1] == ["nodes"]:
+			self.send_json(cluster.nodes_body(segments[1] if len(segments) > 1 else None, query.get("output", "minimal")))
+		elif path == "/v1/cluster/statistics":
+			self.send_json(cluster.statistics())
+		elif path == "/v1/schema":
+			self.send_json({"classes": [cluster.class_schema(collection) for collection in cluster.collections]})
+		elif segments[:1] == ["schema"] and len(segments) in (2, 3):
+			index = cluster.collection_index(segments[1])
+			if index is None:
+				self.not_found()
+			elif len(segments) == 2:
+				self.send_json(cluster.class_schema(cluster.collections[index]))
+			elif segments[2] == "tenants" and cluster.collections[index]["multi_tenant"]:
+				self.send_json([{"name": shard["name"], "activityStatus": "HOT"} for shard in cluster.collections[index]["shards"]])
+			else:
+				self.send_json({"error": [{"message": f"multi-tenancy is not enabled for class {segments[1]}"}]}, status=422)
+		elif path == "/v1/objects":
+			index = cluster.collection_index(query.get("class"))
+			if index is None:
+				self.send_json({"objects": [], "totalResults": 0})
+				return
+			uuids = cluster.list_uuids(index, query.get("tenant"), int(query.get("limit", 25)), int(query.get("offset", 0)), query.get("after"))
+			objects = [cluster.get_object(index, object_uuid) for object_uuid in uuids]
+			self.send_json({"objects": objects, "totalResults": len(objects)})
+		elif segments[:1] == ["objects"] and len(segments) == 3:
+			if cluster.error_rate and random.random() < cluster.error_rate:
+				self.send_json({"error": [{"message": "injected error"}]}, status=500)
+				return
+			index = cluster.collection_index(segments[1])
+			obj = cluster.get_object(index, segments[2], query.get("consistency_level"), query.get("node_name")) if index is not None else None
+			self.send_json(obj) if obj else self.not_found()
+		else:
+			self.not_found()
+
+	def do_POST(self):
+		path = urlparse(self.path).path.rstrip("/")
+		body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+		cluster = self.cluster
+		if path == "/_fake/reset":
+			with cluster.lock:
+				cluster.requests.clear()
+			self.send_json({})
+			return
+
+		cluster.count_request(_request_kind("POST", path))
+		cluster.wait()
+		if path != "/v1/graphql":
+			self.not_found()
+			return
+		# Only Aggregate { Collection(tenant: "...") { meta { count } } } is supported
+		query = json.loads(body or b"{}").get("query", "")
+		match = re.search(r"Aggregate\s*\{\s*(\w+)", query)
+		tenant = re.search(r'tenant\s*:\s*"([^"]*)"', query)
+		index = cluster.collection_index(match.group(1)) if match else None
+		if index is None:
+			self.send_json({"errors": [{"message": "unsupported query"}]})
+			return
+		count = cluster.count(index, tenant.group(1) if tenant else None)
+		self.send_json({"data": {"Aggregate": {match.group(1): [{"meta": {"count": count}}]}}})
+
+	def do_PUT(self):
+		path = unquote(urlparse(self.path).path).rstrip("/")
+		body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+		cluster = self.cluster
+		cluster.count_request(_request_kind("PUT", path))
+		cluster.wait()
+		# Only the shard status update: /v1/schema/{class}/shards/{shard}
+		segments = path.split("/")[2:] if path.startswith("/v1") else []
+		if len(segments) != 4 or segments[0] != "schema" or segments[2] != "shards":
+			self.not_found()
+			return
+		status = json.loads(body or b"{}").get("status")
+		index = cluster.collection_index(segments[1])
+		if status not in ("READY", "READONLY"):
+			self.send_json({"error": [{"message": f"invalid status {status}"}]}, status=422)
+		elif index is None or not cluster.set_shard_status(index, segments[3], status):
+			self.not_found()
+		else:
+			self.send_json({"status": status})
+
+class FakeWeaviateServicer(weaviate_pb2_grpc.WeaviateServicer):
+	def __init__(self, cluster):
+		self.cluster = cluster
+
+	def TenantsGet(self, request, context):
+		self.cluster.count_request("gRPC TenantsGet")
+		self.cluster.wait()
+		index = self.cluster.collection_index(request.collection)
+		if index is None:
+			context.abort(grpc.StatusCode.NOT_FOUND, f"class {request.collection} not found")
+		collection = self.cluster.collections[index]
+		if not collection["multi_tenant"]:
+			context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"multi-tenancy is not enabled for class \"{collection['name']}\"")
+		names = set(request.names.values) if request.HasField("names") else None
+		return tenants_pb2.TenantsGetReply(
+			took=0.0,
+			tenants=[
+				tenants_pb2.Tenant(name=shard["name"], activity_status=tenants_pb2.TENANT_ACTIVITY_STATUS_HOT)
+				for shard in collection["shards"]
+				if names is None or shard["name"] in names
+			],
+		)
+
+	# IDs of an "_id" Equal / ContainsAny filter, None without one. Other filters are not supported.
+	@staticmethod
+	def _id_filter(request):
+		if not request.HasField("filters") or request.filters.target.property != "_id":
+			return None
+		if request.filters.operator == base_pb2.Filters.OPERATOR_EQUAL:
+			return [request.filters.value_text]
+		return list(request.filters.value_text_array.values)
+
+	def Search(self, request, context):
+		self.cluster.count_request("gRPC Search")
+		self.cluster.wait()
+		index = self.cluster.collection_index(request.collection)
+		if index is None:
+			context.abort(grpc.StatusCode.NOT_FOUND, f"class {request.collection} not found")
+		object_ids = self._id_filter(request)
+		if object_ids is None:
+			uuids = self.cluster.list_uuids(index, request.tenant or None, request.limit or 25, request.offset, request.after or None)
+		else:
+			# Objects by ID, e.g. batched read repairs. Reading at consistency level ALL repairs them.
+			consistency_level = "ALL" if request.consistency_level == base_pb2.CONSISTENCY_LEVEL_ALL else None
+			uuids = [object_id for object_id in object_ids if self.cluster.get_object(index, object_id, consistency_level)][:request.limit or 25]
+		vector = struct.pack(f"<{VECTOR_DIMENSIONS}f", *([0.1] * VECTOR_DIMENSIONS)) if request.metadata.vector else b""
+		created = int(self.cluster.started_at * 1000)
+		results = []
+		for object_uuid in uuids:
+			position = self.cluster.parse_uuid(object_uuid)[3]
+			results.append(search_get_pb2.SearchResult(
+				properties=search_get_pb2.PropertiesResult(
+					target_collection=self.cluster.collections[index]["name"],
+					non_ref_props=properties_pb2.Properties(fields={
+						"name": properties_pb2.Value(text_value=f"object {position}"),
+						"position": properties_pb2.Value(int_value=position),
+					}),
+				),
+				metadata=search_get_pb2.MetadataResult(
+					id=object_uuid,
+					id_as_bytes=uuid.UUID(object_uuid).bytes,
+					vector_bytes=vector,
+					creation_time_unix=created,
+					creation_time_unix_present=True,
+					last_update_time_unix=created,
+					last_update_time_unix_present=True,
+				),
+			))
+		return search_get_pb2.SearchReply(took=0.0, results=results)
+
+def _health_check(request, context):
+	return health_weaviate_pb2.WeaviateHealthCheckResponse(status=health_weaviate_pb2.WeaviateHealthCheckResponse.SERVING)
+
+# Running stand-in, returned by start_fake_weaviate()
+class FakeWeaviate:
+	def __init__(self, cluster, http_server, grpc_server):
+		self.cluster = cluster
+		self.http_server = http_server
+		self.grpc_server = grpc_server
+		self.http_port = http_server.server_address[1]
+		self.grpc_port = grpc_server.port
+
+	def stop(self):
+		self.http_server.shutdown()
+		self.http_server.server_close()
+		self.grpc_server.stop(grace=None)
+
+# The default listen backlog (5) drops connections when clients open many at once
+class FakeHTTPServer(ThreadingHTTPServer):
+	request_queue_size = 1024
+	daemon_threads = True
+
+# Start the REST and gRPC servers in background threads. Port 0 picks a free port.
+def start_fake_weaviate(cluster, host="127.0.0.1", http_port=0, grpc_port=0, workers=32):
+	handler = type("Handler", (FakeWeaviateHandler,), {"cluster": cluster})
+	http_server = FakeHTTPServer((host, http_port), handler)
+	threading.Thread(target=http_server.serve_forever, name="fake-weaviate-http", daemon=True).start()
+
+	grpc_server = grpc.server(ThreadPoolExecutor(max_workers=workers), options=[
+		("grpc.max_send_message_length", 104858000),
+		("grpc.max_receive_message_length", 104858000),
+	])
+	weaviate_pb2_grpc.add_WeaviateServicer_to_server(FakeWeaviateServicer(cluster), grpc_server)
+	grpc_server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler("grpc.health.v1.Health", {
+		"Check": grpc.unary_unary_rpc_method_handler(
+			_health_check,
+			request_deserializer=health_weaviate_pb2.WeaviateHealthCheckRequest.FromString,
+			response_serializer=health_weaviate_pb2.WeaviateHealthCheckResponse.SerializeToString,
+		),
+	}),))
+	grpc_server.port = grpc_server.add_insecure_port(f"{host}:{grpc_port}")
+	grpc_server.start()
+	return FakeWeaviate(cluster, http_server, grpc_server)
+
+def add_cluster_arguments(parser):
+	parser.add_argument("--collections", type=int, default=20, help="collections without multi-tenancy")
+	parser.add_argument("--mt-collections", type=int, default=5, help="multi-tenant collections")
+	parser.add_argument("--tenants", type=int, default=100, help="tenants per multi-tenant collection")
+	parser.add_argument("--nodes", type=int, default=3)
+	parser.add_argument("--shards", type=int, default=3, help="shards per collection without multi-tenancy")
+	parser.add_argument("--replication", type=int, default=3, help="replication factor")
+	parser.add_argument("--objects", type=int, default=1000, help="mean objects per shard / tenant")
+	parser.add_argument("--drift", type=float, default=0.0, help="fraction of shards with a replica missing objects")
+	parser.add_argument("--latency", type=float, default=0.0, help="added latency per request in milliseconds")
+	parser.add_argument("--readonly", type=float, default=0.0, help="fraction of shards that start READONLY")
+	parser.add_argument("--raft-lag", type=float, default=0.0, help="Raft entries per second the last node falls further behind")
+	parser.add_argument("--leader-change", type=float, default=0.0, help="seconds between Raft leader changes, 0 for a fixed leader")
+	parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of single object reads answered with 500")
+	parser.add_argument("--seed", type=int, default=42)
+
+def cluster_from_arguments(args):
+	return FakeCluster(
+		collections=args.collections,
+		mt_collections=args.mt_collections,
+		tenants=args.tenants,
+		nodes=args.nodes,
+		shards=args.shards,
+		replication=args.replication,
+		objects=args.objects,
+		drift=args.drift,
+		latency=args.latency,
+		seed=args.seed,
+		readonly=args.readonly,
+		raft_lag=args.raft_lag,
+		leader_change=args.leader_change,
+		error_rate=args.error_rate,
+	)
+
+def main():
+	parser = argparse.ArgumentParser(description="Local Weaviate stand-in with a synthetic cluster")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8080, help="REST port")
+	parser.add_argument("--grpc-port", type=int, default=50051)
+	add_cluster_arguments(parser)
+	args = parser.parse_args()
+
+	start = time.perf_counter()
+	cluster = cluster_from_arguments(args)
+	server = start_fake_weaviate(cluster, args.host, args.port, args.grpc_port)
+	shards = sum(len(collection["shards"]) for collection in cluster.collections)
+	objects = sum(collection["total"] for collection in cluster.collections)
+	print(f"Fake Weaviate {FAKE_VERSION}: {len(cluster.collections)} collections, {shards} shards, {objects} objects "
+		f"on {len(cluster.nodes)} nodes (built in {time.perf_counter() - start:.1f}s)")
+	print(f"REST http://{args.host}:{server.http_port}  gRPC {args.host}:{server.grpc_port}", flush=True)
+	try:
+		while True:
+			time.sleep(3600)
+	except KeyboardInterrupt:
+		server.stop()
+
+if __name__ == "__main__":
+	main()
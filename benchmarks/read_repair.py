@@ -0,0 +1,99 @@
+"""Read repair throughput benchmark, against the local Weaviate stand-in.
+
+Starts benchmarks/fake_weaviate.py with one collection whose shards drift, lists its UUIDs, then runs the
+repair engine (utils/cluster/read_repair.py) in each mode (REST, one object per request, and gRPC, a
+batch of objects per query) at each concurrency level and reports objects read per second, the error
+rate and the requests the server received. Every run gets a fresh server, so each one repairs the same
+drift. Use --latency to model the round trip to a real cluster and --error-rate to inject failures (REST
+reads only).
+
+Run from the repository root:
+
+	python benchmarks/read_repair.py
+	python benchmarks/read_repair.py --objects 20000 --latency 5 --levels 1,8,16,32 --error-rate 0.01
+	python benchmarks/read_repair.py --levels 16 --rate-limit 500
+	python benchmarks/read_repair.py --modes grpc --batch-size 500 --levels 1,4
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+
+from fake_weaviate import add_cluster_arguments
+from scale_benchmark import start_server, server_requests, reset_server_requests
+
+COLLECTION = "Collection00000"
+
+# One engine run on a fresh server: result row
+def run_level(args, mode, concurrency):
+	from utils.cluster.cluster_operations import iter_object_uuid_pages
+	from utils.cluster.read_repair import repair_objects, repair_rates
+	from utils.connection.weaviate_connection import acquire_weaviate_client, release_weaviate_client
+	process, url, grpc_port = start_server(args)
+	try:
+		with contextlib.redirect_stdout(io.StringIO()):
+			host, port = url.rsplit("/", 1)[1].rsplit(":", 1)
+			client_key, client = acquire_weaviate_client(
+				use_custom=True,
+				http_host_endpoint=host,
+				http_port_endpoint=int(port),
+				grpc_host_endpoint=host,
+				grpc_port_endpoint=grpc_port,
+				custom_secure=False,
+			)
+			uuids = [uuid for page in iter_object_uuid_pages(url, "", COLLECTION, limit=1000) for uuid in page]
+			reset_server_requests(url)
+			stats = repair_objects(url, "", COLLECTION, uuids, concurrency=concurrency, rate_limit=args.rate_limit, mode=mode, client=client, batch_size=args.batch_size)
+			release_weaviate_client(client_key)
+		requests_made = server_requests(url)
+	finally:
+		process.terminate()
+		process.wait()
+		process.stdout.close()
+	rates = repair_rates(stats)
+	return {
+		"mode": mode,
+		"concurrency": concurrency,
+		"objects": len(uuids),
+		"wall_seconds": round(stats["elapsed"], 3),
+		"reads_per_second": round(rates["rate"], 1),
+		"error_rate": round(rates["error_rate"], 4),
+		"found": stats["found"],
+		"not_found": stats["not_found"],
+		"errors": stats["errors"],
+		"requests": requests_made,
+	}
+
+def main():
+	parser = argparse.ArgumentParser(description="Read repair throughput per concurrency level")
+	add_cluster_arguments(parser)
+	parser.add_argument("--modes", default="rest,grpc", help="comma separated repair modes (rest, grpc)")
+	parser.add_argument("--levels", default="1,4,16,32", help="comma separated concurrency levels")
+	parser.add_argument("--batch-size", type=int, default=200, help="objects per gRPC query")
+	parser.add_argument("--rate-limit", type=float, default=0, help="most objects read per second, 0 for no limit")
+	parser.add_argument("--json", help="also write the results to this file")
+	# One collection of drifting shards, 2 ms per request unless given
+	parser.set_defaults(collections=1, mt_collections=0, objects=5000, drift=0.05, latency=2.0)
+	args = parser.parse_args()
+
+	results = []
+	print(f"{'Mode':>5} {'Concurrency':>11} {'Objects':>8} {'Wall (s)':>9} {'Objects/s':>10} {'Errors':>7} {'Error %':>8} {'Requests':>9}")
+	for mode in [mode for mode in args.modes.split(",") if mode]:
+		for concurrency in [int(level) for level in args.levels.split(",") if level]:
+			print(f"Running {mode} at concurrency {concurrency}...", file=sys.stderr)
+			result = run_level(args, mode, concurrency)
+			results.append(result)
+			print(f"{mode:>5} {concurrency:>11} {result['objects']:>8} {result['wall_seconds']:>9.2f} {result['reads_per_second']:>10.1f} {result['errors']:>7} {result['error_rate']:>8.2%} {result['requests']:>9}", flush=True)
+
+	baseline = results[0] if results else None
+	if baseline and baseline["reads_per_second"]:
+		print()
+		for result in results[1:]:
+			print(f"{result['mode']} at concurrency {result['concurrency']}: {result['reads_per_second'] / baseline['reads_per_second']:.1f}x {baseline['mode']} at concurrency {baseline['concurrency']}")
+	if args.json:
+		with open(args.json, "w") as f:
+			json.dump({"cluster": vars(args), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,193 @@
+"""Scale benchmarks for the cluster utilities, against the local Weaviate stand-in.
+
+Starts benchmarks/fake_weaviate.py in a separate process with a synthetic cluster, then runs each
+utility against it and reports wall time, the number of requests the server received and the peak
+Python memory of the utility (tracemalloc, measured in a second run so it does not slow the timed one).
+Runs fully offline.
+
+Run from the repository root:
+
+	python benchmarks/scale_benchmark.py
+	python benchmarks/scale_benchmark.py --preset large --only get_shards_info,process_shards_data
+	python benchmarks/scale_benchmark.py --collections 10000 --mt-collections 0 --latency 2 --json results.json
+
+action_read_repairs is a Streamlit handler, so the read repair benchmark runs read_repairs(), which
+makes the same requests (enumerate all UUIDs, then one GET per UUID at consistency level ALL).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_weaviate import add_cluster_arguments
+
+# Cluster sizes. "large" is 10k collections, 1M tenants and about 100M objects.
+PRESETS = {
+	"small": {"collections": 50, "mt_collections": 5, "tenants": 200, "objects": 1000, "drift": 0.05},
+	"medium": {"collections": 1000, "mt_collections": 10, "tenants": 10000, "objects": 1000, "drift": 0.05},
+	"large": {"collections": 9900, "mt_collections": 100, "tenants": 10000, "objects": 100, "drift": 0.05},
+}
+
+# Start the stand-in in its own process, so its memory is not counted. Returns (process, REST url, gRPC port).
+def start_server(args):
+	command = [sys.executable, os.path.join(REPO_ROOT, "benchmarks", "fake_weaviate.py"), "--port", "0", "--grpc-port", "0"]
+	for name in ("collections", "mt_collections", "tenants", "nodes", "shards", "replication", "objects", "drift", "latency", "seed", "readonly", "raft_lag", "leader_change", "error_rate"):
+		command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+	process = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+	summary = process.stdout.readline().strip()
+	endpoints = process.stdout.readline().split()
+	if not endpoints:
+		process.kill()
+		raise RuntimeError("The fake Weaviate server did not start.")
+	print(summary, file=sys.stderr)
+	return process, endpoints[1], int(endpoints[3].rsplit(":", 1)[1])
+
+def server_requests(url):
+	return requests.get(f"{url}/_fake/stats", timeout=10).json()["total"]
+
+def reset_server_requests(url):
+	requests.post(f"{url}/_fake/reset", timeout=10)
+
+# Benchmarks in run order. Each takes the shared context and may store results for later ones.
+def bench_get_shards_info(context):
+	from utils.cluster.cluster_operations import get_shards_info
+	context["node_info"] = get_shards_info(context["client"])
+
+def bench_process_shards_data(context):
+	from utils.cluster.cluster_operations import process_shards_data
+	process_shards_data(context["node_info"])
+
+def bench_check_shard_consistency(context):
+	from utils.cluster.cluster_operations import check_shard_consistency
+	context["inconsistent"] = check_shard_consistency(context["node_info"])
+
+def bench_rank_shard_drift(context):
+	from utils.cluster.cluster_operations import rank_shard_drift
+	rank_shard_drift(context["inconsistent"])
+
+def bench_aggregate_collections(context):
+	from utils.cluster.collection import aggregate_collections
+	aggregate_collections.clear()
+	result = aggregate_collections(context["client"], client_key=context["client_key"])
+	if "error" in result:
+		raise RuntimeError(result["error"])
+
+def bench_aggregate_collections_async(context):
+	from utils.cluster.collection import aggregate_collections_async
+	from utils.connection.weaviate_connection import get_weaviate_async_client
+	aggregate_collections_async.clear()
+	async_client = get_weaviate_async_client(context["client_key"])
+	result = aggregate_collections_async(async_client, client_key=context["client_key"], concurrency=context["concurrency"])
+	if "error" in result:
+		raise RuntimeError(result["error"])
+
+def bench_fetch_collection_data(context):
+	from utils.collections.read_all_objects import fetch_collection_data
+	fetch_collection_data.clear()
+	fetch_collection_data(context["client"], "Collection00000", page=1, items_per_page=1000, client_key=context["client_key"])
+
+def bench_read_repairs(context):
+	from utils.cluster.cluster_operations import read_repairs
+	read_repairs(context["url"], "", "Collection00000")
+
+BENCHMARKS = [
+	("get_shards_info", bench_get_shards_info),
+	("process_shards_data", bench_process_shards_data),
+	("check_shard_consistency", bench_check_shard_consistency),
+	("rank_shard_drift", bench_rank_shard_drift),
+	("aggregate_collections", bench_aggregate_collections),
+	("aggregate_collections_async", bench_aggregate_collections_async),
+	("fetch_collection_data", bench_fetch_collection_data),
+	("read_repairs", bench_read_repairs),
+]
+
+# Run one benchmark: wall time and server requests, then peak memory in a second run.
+# The utilities print progress for every item, which is discarded here.
+def run_benchmark(name, func, context, measure_memory):
+	reset_server_requests(context["url"])
+	start = time.perf_counter()
+	with contextlib.redirect_stdout(io.StringIO()):
+		func(context)
+	wall = time.perf_counter() - start
+	calls = server_requests(context["url"])
+
+	peak = None
+	if measure_memory:
+		tracemalloc.start()
+		with contextlib.redirect_stdout(io.StringIO()):
+			func(context)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	return {"benchmark": name, "wall_seconds": round(wall, 3), "requests": calls, "peak_mb": round(peak / 2**20, 1) if peak is not None else None}
+
+def main():
+	parser = argparse.ArgumentParser(description="Scale benchmarks against a local Weaviate stand-in")
+	parser.add_argument("--preset", choices=sorted(PRESETS), default="small", help="cluster size, individual options below override it")
+	add_cluster_arguments(parser)
+	parser.add_argument("--only", default="", help="comma separated benchmark names, dependencies are run too")
+	parser.add_argument("--concurrency", type=int, default=16, help="concurrency of the async benchmarks")
+	parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+	parser.add_argument("--json", help="also write the results to this file")
+	parser.set_defaults(**{name: None for name in PRESETS["small"]})
+	args = parser.parse_args()
+	for name, value in PRESETS[args.preset].items():
+		if getattr(args, name) is None:
+			setattr(args, name, value)
+
+	selected = [name for name in args.only.split(",") if name]
+	unknown = set(selected) - {name for name, _ in BENCHMARKS}
+	if unknown:
+		parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+	# The shard benchmarks work on the node info fetched by get_shards_info
+	if selected and {"process_shards_data", "check_shard_consistency", "rank_shard_drift"} & set(selected):
+		selected.append("get_shards_info")
+	if "rank_shard_drift" in selected:
+		selected.append("check_shard_consistency")
+
+	process, url, grpc_port = start_server(args)
+	try:
+		from utils.connection.weaviate_connection import acquire_weaviate_client, release_weaviate_client
+		host, port = url.rsplit("/", 1)[1].rsplit(":", 1)
+		client_key, client = acquire_weaviate_client(
+			use_custom=True,
+			http_host_endpoint=host,
+			http_port_endpoint=int(port),
+			grpc_host_endpoint=host,
+			grpc_port_endpoint=grpc_port,
+			custom_secure=False,
+		)
+		context = {"client": client, "client_key": client_key, "url": url, "concurrency": args.concurrency}
+
+		results = []
+		print(f"{'Benchmark':<30} {'Wall (s)':>10} {'Requests':>10} {'Peak (MB)':>10}")
+		for name, func in BENCHMARKS:
+			if selected and name not in selected:
+				continue
+			print(f"Running {name}...", file=sys.stderr)
+			result = run_benchmark(name, func, context, measure_memory=not args.no_memory)
+			results.append(result)
+			peak = "-" if result["peak_mb"] is None else f"{result['peak_mb']:.1f}"
+			print(f"{name:<30} {result['wall_seconds']:>10.3f} {result['requests']:>10} {peak:>10}", flush=True)
+		release_weaviate_client(client_key)
+	finally:
+		process.terminate()
+		process.wait()
+		process.stdout.close()
+
+	if args.json:
+		with open(args.json, "w") as f:
+			json.dump({"cluster": {name: getattr(args, name) for name in PRESETS["small"]}, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,134 @@
+"""Benchmark of process_shards_data on a very large verbose nodes response.
+
+Builds the nodes payload of a synthetic multi-tenant cluster in memory (no server), converts it with the
+client's own parser and then compares the previous row by row builder (one dict per shard) with the
+columnar one in utils/cluster/cluster_operations.py: wall time, peak Python memory (tracemalloc) and
+the memory of the resulting shard table. Both results are checked to hold the same rows.
+
+Run from the repository root:
+
+	python benchmarks/shard_processing.py                   # 500k shards on 3 nodes
+	python benchmarks/shard_processing.py --shards 100000 --nodes 6
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_weaviate import FakeCluster
+
+# The previous implementation, kept as the baseline
+def process_shards_data_rows(node_info):
+	node_data = []
+	shard_data = []
+	collection_shard_counts = []
+	readonly_shards = []
+	for node in node_info:
+		node_data.append({
+			"Node Name": node.name,
+			"Git Hash": node.git_hash,
+			"Version": node.version,
+			"Status": node.status,
+			"Object Count (Stats)": node.stats.object_count,
+			"Shard Count (Stats)": node.stats.shard_count,
+		})
+		collection_counts = {}
+		for shard in node.shards:
+			shard_info = {
+				"Node Name": node.name,
+				"Class": shard.collection,
+				"Shard Name": shard.name,
+				"Object Count": shard.object_count,
+				"Index Status": shard.vector_indexing_status,
+				"Vector Queue Length": shard.vector_queue_length,
+				"Compressed": shard.compressed,
+				"Loaded": shard.loaded
+			}
+			shard_data.append(shard_info)
+			if hasattr(shard, 'vector_indexing_status') and shard.vector_indexing_status == "READONLY":
+				readonly_shards.append(shard_info)
+			collection_counts[shard.collection] = collection_counts.get(shard.collection, 0) + 1
+		for collection, count in collection_counts.items():
+			collection_shard_counts.append({"Node Name": node.name, "Collection": collection, "Shard Count": count})
+	return {
+		"node_data": pd.DataFrame(node_data),
+		"shard_data": pd.DataFrame(shard_data),
+		"collection_shard_data": pd.DataFrame(collection_shard_counts),
+		"readonly_shards": pd.DataFrame(readonly_shards) if readonly_shards else pd.DataFrame()
+	}
+
+# Verbose node objects of a multi-tenant cluster with about `shards` shards in total (replicas included).
+# Every 100th shard is READONLY so the READONLY path has work to do.
+def build_node_info(shards, nodes, replication, collections):
+	from weaviate.collections.classes.cluster import _ConvertFromREST
+	tenants = max(shards // (replication * collections), 1)
+	cluster = FakeCluster(collections=0, mt_collections=collections, tenants=tenants, nodes=nodes, replication=replication, objects=100)
+	body = json.loads(cluster.nodes_body(output="verbose"))
+	for node in body["nodes"]:
+		for index, shard in enumerate(node["shards"]):
+			if index % 100 == 0:
+				shard["vectorIndexingStatus"] = "READONLY"
+	return _ConvertFromREST.nodes_verbose(body["nodes"])
+
+def measure(func, node_info, repeat):
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		with contextlib.redirect_stdout(io.StringIO()):
+			result = func(node_info)
+		timings.append(time.perf_counter() - start)
+	tracemalloc.start()
+	with contextlib.redirect_stdout(io.StringIO()):
+		func(node_info)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return result, min(timings), peak
+
+# Same shards, counts and READONLY rows, compared as strings so dtypes do not matter
+def check_same(rows_result, columnar_result):
+	for key in ("shard_data", "collection_shard_data", "readonly_shards"):
+		left = rows_result[key].astype(str).sort_values(list(rows_result[key].columns)).reset_index(drop=True)
+		right = columnar_result[key].astype(str).sort_values(list(rows_result[key].columns)).reset_index(drop=True)
+		right = right[list(left.columns)]
+		if not left.equals(right):
+			raise AssertionError(f"{key} differs between the implementations")
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark process_shards_data on a large verbose nodes response")
+	parser.add_argument("--shards", type=int, default=500000, help="shards in the response, replicas included")
+	parser.add_argument("--nodes", type=int, default=3)
+	parser.add_argument("--replication", type=int, default=3)
+	parser.add_argument("--collections", type=int, default=100, help="multi-tenant collections the shards are spread over")
+	parser.add_argument("--repeat", type=int, default=3, help="timed runs, the fastest is reported")
+	args = parser.parse_args()
+
+	from utils.cluster.cluster_operations import process_shards_data
+
+	start = time.perf_counter()
+	node_info = build_node_info(args.shards, args.nodes, args.replication, args.collections)
+	total = sum(len(node.shards) for node in node_info)
+	print(f"Built {total:,} shards on {len(node_info)} nodes in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+	results = {}
+	print(f"{'Implementation':<16} {'Wall (s)':>10} {'Peak (MB)':>10} {'Table (MB)':>11}")
+	for name, func in (("row by row", process_shards_data_rows), ("columnar", process_shards_data)):
+		result, wall, peak = measure(func, node_info, args.repeat)
+		results[name] = result
+		table = result["shard_data"].memory_usage(deep=True).sum()
+		print(f"{name:<16} {wall:>10.3f} {peak / 2**20:>10.1f} {table / 2**20:>11.1f}", flush=True)
+
+	check_same(results["row by row"], results["columnar"])
+	print("Results match.", file=sys.stderr)
+
+if __name__ == "__main__":
+	main()
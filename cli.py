@@ -0,0 +1,441 @@
+"""Headless command line for long running cluster jobs, without the Streamlit rerun loop.
+
+Results are written to stdout as JSON (export writes JSON lines), progress and log output go to stderr,
+so the commands can be scheduled from cron and piped into other tools. The exit code is 1 when the
+job failed or hit errors.
+
+	python cli.py --endpoint https://my-cluster.weaviate.cloud aggregate --async --concurrency 32
+	python cli.py --endpoint http://10.0.0.5:8080 consistency
+	python cli.py --endpoint http://10.0.0.5:8080 repair --inconsistent
+	python cli.py --endpoint http://10.0.0.5:8080 repair --inconsistent --targeted
+	python cli.py --endpoint http://10.0.0.5:8080 repair --resume
+	python cli.py repair-jobs
+	python cli.py --endpoint http://10.0.0.5:8080 export MyCollection --output my_collection.jsonl
+	python cli.py --endpoint http://10.0.0.5:8080 ingest MyCollection data.csv --batch-size 500
+	python cli.py --endpoint http://10.0.0.5:8080 snapshot --format parquet --output-dir snapshots
+	python cli.py snapshot-diff snapshots/20250101T000000Z_old snapshots/20250101T010000Z_new
+
+The API key is read from --api-key or the WEAVIATE_API_KEY environment variable. Endpoints with an
+explicit port or plain http are custom deployments (gRPC port 50051 unless --grpc-port is given).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Utility functions print their progress to stdout; only results go to the real stdout
+_stdout = sys.stdout
+_stderr = sys.stderr
+
+# Progress on stderr, at most one line per interval
+class Progress:
+	def __init__(self, label, interval=1.0):
+		self.label = label
+		self.interval = interval
+		self.start = time.monotonic()
+		self.last = 0.0
+
+	def update(self, done, total=None, force=False):
+		now = time.monotonic()
+		if not force and now - self.last < self.interval:
+			return
+		self.last = now
+		elapsed = now - self.start
+		rate = done / elapsed if elapsed > 0 else 0.0
+		if total:
+			_stderr.write(f"{self.label}: {done}/{total} ({done / total:.1%}) {rate:.1f}/s {elapsed:.0f}s\n")
+		else:
+			_stderr.write(f"{self.label}: {done} {rate:.1f}/s {elapsed:.0f}s\n")
+		_stderr.flush()
+
+	def elapsed(self):
+		return time.monotonic() - self.start
+
+def log(message):
+	_stderr.write(f"{message}\n")
+	_stderr.flush()
+
+def emit(result):
+	json.dump(result, _stdout, default=str)
+	_stdout.write("\n")
+	_stdout.flush()
+
+def connect(args):
+	from utils.cluster.fleet import fleet_connection_args
+	from utils.connection.weaviate_connection import acquire_weaviate_client
+	connection_args = fleet_connection_args(args.endpoint, args.api_key)
+	if args.grpc_port and connection_args.get("use_custom"):
+		connection_args["grpc_port_endpoint"] = args.grpc_port
+	return acquire_weaviate_client(**connection_args)
+
+def run_aggregate(args, client_key, client):
+	from utils.connection.deadlines import Deadline
+	progress = Progress("aggregate")
+	deadline = Deadline("aggregate", seconds=args.deadline)
+	if args.use_async:
+		from utils.cluster.collection import aggregate_collections_async
+		from utils.connection.weaviate_connection import get_weaviate_async_client
+		result = aggregate_collections_async(get_weaviate_async_client(client_key), client_key=client_key, concurrency=args.concurrency, _deadline=deadline, _progress=progress.update)
+	else:
+		from utils.cluster.collection import aggregate_collections
+		result = aggregate_collections(client, client_key=client_key, _deadline=deadline, _progress=progress.update)
+	if "error" in result:
+		emit({"error": result["error"]})
+		return 1
+
+	output = {key: value for key, value in result.items() if key != "result_df"}
+	output["collections"] = result["result_df"].to_dict(orient="records")
+	output["elapsed_seconds"] = round(progress.elapsed(), 3)
+	emit(output)
+	return 0
+
+def run_consistency(args, client_key, client):
+	from utils.cluster.cluster_operations import get_shards_info, check_shard_consistency, rank_shard_drift
+	start = time.monotonic()
+	df_inconsistent = check_shard_consistency(get_shards_info(client))
+	rows = df_inconsistent.to_dict(orient="records") if df_inconsistent is not None else []
+	drift = rank_shard_drift(df_inconsistent).to_dict(orient="records") if rows else []
+	emit({
+		"consistent": not rows,
+		"inconsistent_collections": sorted({str(row["Collection"]) for row in rows}),
+		"drift": drift[:args.top] if args.top else drift,
+		"inconsistent_shards": rows,
+		"elapsed_seconds": round(time.monotonic() - start, 3),
+	})
+	return 0
+
+# Repair jobs, (collection, tenant) pairs: the named collections (with --tenant) and, with --inconsistent,
+# every inconsistent collection in drift order, worst first. Tenants of multi-tenant collections are
+# separate jobs, so only the inconsistent ones are repaired. With --resume the interrupted jobs of the
+# endpoint come first.
+def repair_jobs(args, client):
+	from utils.cluster.cluster_operations import get_shards_info, check_shard_consistency, rank_shard_drift, get_multi_tenant_collections, drift_repair_targets
+	from utils.cluster.repair_checkpoints import resumable_jobs
+	jobs = [(collection_name, args.tenant) for collection_name in args.collection]
+	if args.inconsistent:
+		df_ranked = rank_shard_drift(check_shard_consistency(get_shards_info(client)))
+		if not df_ranked.empty:
+			named = set(args.collection)
+			collection_names = [name for name in df_ranked["Collection"].astype(str).unique() if name not in named]
+			multi_tenant = get_multi_tenant_collections(client, collection_names)
+			df_targets = drift_repair_targets(df_ranked, multi_tenant)
+			jobs += [target for target in zip(df_targets["Collection"], df_targets["Tenant"]) if target[0] not in named]
+	if args.resume:
+		interrupted = [(job["collection"], job["tenant"]) for job in resumable_jobs(args.endpoint, path=args.checkpoint_db)]
+		jobs = list(dict.fromkeys(interrupted + jobs))
+	return jobs
+
+# Read every object with consistency level ALL, --concurrency requests at a time. Every target is a job in
+# the checkpoint store: its cursor is saved while it runs, so an interrupted run (Ctrl-C, a restart) is
+# continued with --resume, here or on the page.
+def run_repair(args, client_key, client):
+	from utils.cluster.cluster_operations import get_shards_info, iter_object_uuid_pages_grpc, iter_uuids, count_objects
+	from utils.cluster.read_repair import new_repair_stats, repair_objects, repair_rates
+	from utils.cluster.replica_diff import replica_groups, iter_divergent_uuids, new_diff_stats, targeted_cursor
+	from utils.cluster.repair_checkpoints import new_owner, create_job, find_resumable_job, claim_job, release_job, stats_from_job, checkpoint_poll, start_batch, record_batch, finish_job
+
+	jobs = repair_jobs(args, client)
+	if not jobs:
+		log("Nothing to repair.")
+		emit({"collections": []})
+		return 0
+
+	# This process owns the jobs it starts or resumes, see repair_checkpoints
+	owner = new_owner()
+	summaries = []
+	failed = False
+	for collection_name, tenant in jobs:
+		label = f"repair {collection_name}" + (f" (tenant {tenant})" if tenant else "")
+		summary = {"collection": collection_name, "tenant": tenant, "objects": 0, "found": 0, "not_found": 0, "errors": 0}
+		progress = Progress(label)
+		job_id = None
+		try:
+			job = find_resumable_job(args.endpoint, collection_name, tenant, path=args.checkpoint_db) if args.resume else None
+			if job and not claim_job(job, owner, path=args.checkpoint_db):
+				raise RuntimeError(f"job #{job['id']} was resumed or discarded by another session or process")
+			if job:
+				# Continue after the checkpointed cursor, with the node groups and the mode the job started with
+				job_id, groups, stats = job["id"], job["groups"], stats_from_job(job)
+				mode = job["mode"] or args.mode
+				total = stats["total"]
+				log(f"Resuming job #{job_id} after {stats['next_index']} objects: {label}")
+			else:
+				# The UUIDs are listed (IDs only, over gRPC) while the objects are read. --targeted checks each
+				# listed object on the replica nodes and reads only the objects they disagree on.
+				groups = replica_groups(get_shards_info(client, collection_name), collection_name, tenant) if args.targeted else None
+				if args.targeted and not groups:
+					log(f"No nodes hold the same shards, repairing all objects: {label}")
+				total = None if groups else count_objects(client, collection_name, tenant)
+				stats = new_repair_stats(total)
+				mode = args.mode
+				job_id = create_job(args.endpoint, collection_name, tenant, mode, groups, total, owner=owner, path=args.checkpoint_db)
+				if job_id is None:
+					raise RuntimeError("another session or process is repairing it")
+			summary["job"] = job_id
+
+			start = start_batch(stats)
+			poll = checkpoint_poll(job_id, owner, lambda stats: progress.update(stats["next_index"], total), path=args.checkpoint_db)
+			uuids = iter_uuids(iter_object_uuid_pages_grpc(client, collection_name, limit=args.page_size, tenant=tenant, after=stats["cursor"]))
+			if groups:
+				diff_stats = new_diff_stats()
+				uuids = iter_divergent_uuids(args.endpoint, args.api_key, collection_name, groups, uuids, tenant=tenant, stats=diff_stats, poll=lambda: poll(stats), concurrency=args.concurrency)
+			try:
+				repair_objects(
+					args.endpoint, args.api_key, collection_name, uuids, tenant=tenant,
+					concurrency=args.concurrency, rate_limit=args.rate_limit, mode=mode, client=client, batch_size=args.batch_size,
+					poll=poll, poll_interval=1.0, stats=stats
+				)
+			except KeyboardInterrupt:
+				# Reads in flight have finished, everything up to the cursor was read. The job is released, so
+				# --resume continues it at once.
+				if groups:
+					targeted_cursor(stats, diff_stats, stats["next_index"] - start["next_index"])
+				record_batch(job_id, owner, stats, start, f"Interrupted after {stats['next_index'] - start['next_index']} objects read from the CLI", path=args.checkpoint_db)
+				release_job(job_id, owner, path=args.checkpoint_db)
+				log(f"Interrupted, job #{job_id} checkpointed after {stats['next_index']} objects. Continue with --resume.")
+				raise
+			for error in stats["error_samples"]:
+				log(error)
+			rates = repair_rates(stats)
+			summary.update(objects=stats["next_index"], found=stats["found"], not_found=stats["not_found"], errors=stats["errors"])
+			summary.update(reads_per_second=round(rates["rate"], 1), error_rate=round(rates["error_rate"], 4))
+			if groups:
+				targeted_cursor(stats, diff_stats, stats["next_index"] - start["next_index"])
+				summary.update(compared=diff_stats["compared"], divergent=diff_stats["divergent"], missing=dict(diff_stats["missing"]), outdated=dict(diff_stats["stale"]))
+			if record_batch(job_id, owner, stats, start, f"{stats['next_index'] - start['next_index']} objects read from the CLI", path=args.checkpoint_db) is None:
+				# This process stopped checkpointing long enough for another one to take the job over
+				summary["error"] = f"job #{job_id} was taken over by another session or process, or discarded"
+			elif stats["listing_error"]:
+				summary["error"] = stats["listing_error"]
+				finish_job(job_id, owner, "failed", stats["listing_error"], path=args.checkpoint_db)
+			else:
+				finish_job(job_id, owner, "completed", path=args.checkpoint_db)
+			progress.update(stats["next_index"], stats["total"], force=True)
+		except KeyboardInterrupt:
+			raise
+		except Exception as e:
+			summary["error"] = str(e)
+			log(f"Failed: {label}: {e}")
+			# The job stays resumable from its last checkpoint
+			if job_id:
+				release_job(job_id, owner, path=args.checkpoint_db)
+		summary["elapsed_seconds"] = round(progress.elapsed(), 3)
+		failed = failed or summary["errors"] > 0 or "error" in summary
+		summaries.append(summary)
+
+	emit({"collections": summaries})
+	return 1 if failed else 0
+
+# Repair jobs of the checkpoint store, of --endpoint if given
+def run_repair_jobs(args):
+	from utils.cluster.repair_checkpoints import list_jobs
+	df = list_jobs(args.endpoint, limit=args.limit, path=args.checkpoint_db)
+	for column in ("created_at", "updated_at"):
+		df[column] = df[column].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+	emit({"jobs": df.astype(object).where(df.notna(), None).to_dict(orient="records")})
+	return 0
+
+# Write all objects as JSON lines to --output or stdout
+def run_export(args, client_key, client):
+	from utils.collections.read_all_objects import iter_collection_objects
+	target = open(args.output, "w") if args.output else _stdout
+	progress = Progress(f"export {args.collection}")
+	count = 0
+	try:
+		for row in iter_collection_objects(client, args.collection, tenant_name=args.tenant, include_vector=args.include_vector):
+			target.write(json.dumps(row, default=str))
+			target.write("\n")
+			count += 1
+			progress.update(count)
+	finally:
+		if args.output:
+			target.close()
+	progress.update(count, force=True)
+	summary = {"collection": args.collection, "tenant": args.tenant, "objects": count, "elapsed_seconds": round(progress.elapsed(), 3)}
+	if args.output:
+		emit({**summary, "output": args.output})
+	else:
+		log(json.dumps(summary))
+	return 0
+
+# Upload a CSV or JSON file into an existing collection
+def run_ingest(args, client_key, client):
+	from utils.collections.create import validate_file_format, batch_upload
+	file_type = args.format or os.path.splitext(args.file)[1].lstrip(".").lower()
+	with open(args.file, encoding="utf-8") as f:
+		valid, message, data = validate_file_format(f.read(), file_type)
+	if not valid:
+		emit({"error": message})
+		return 1
+
+	progress = Progress(f"ingest {args.collection}")
+	queued = 0
+	errors = []
+	for success, message, _ in batch_upload(client, args.collection, data, batch_size=args.batch_size):
+		if success:
+			queued += 1
+		else:
+			errors.append(message)
+			log(message)
+		progress.update(queued, len(data))
+	failed_objects = [str(failed.message) for failed in client.batch.failed_objects]
+	progress.update(queued, len(data), force=True)
+	emit({
+		"collection": args.collection,
+		"objects": len(data),
+		"queued": queued,
+		"failed": len(failed_objects),
+		"errors": (errors + failed_objects)[:100],
+		"elapsed_seconds": round(progress.elapsed(), 3),
+	})
+	return 1 if errors or failed_objects else 0
+
+def run_snapshot(args, client_key, client):
+	from utils.cluster.snapshot import collect_snapshot, write_snapshot
+	snapshot = collect_snapshot(client, args.endpoint, args.api_key, client_key)
+	path = write_snapshot(snapshot, args.output_dir, args.format)
+	for part, error in snapshot["manifest"]["errors"].items():
+		log(f"{part} left out of the snapshot: {error}")
+	emit(dict(snapshot["manifest"], path=path, format=args.format))
+	return 1 if snapshot["manifest"]["errors"] else 0
+
+# Compares two snapshot directories, no cluster connection needed
+def run_snapshot_diff(args, client_key=None, client=None):
+	from utils.cluster.snapshot import read_snapshot, diff_snapshots
+	start = time.monotonic()
+	diff = diff_snapshots(read_snapshot(args.old), read_snapshot(args.new))
+	emit({
+		"old": args.old,
+		"new": args.new,
+		"summary": diff["summary"].to_dict(orient="records"),
+		"diffs": {
+			table: (df.head(args.limit) if args.limit else df).astype(object).where(df.notna(), None).to_dict(orient="records")
+			for table, df in diff["diffs"].items() if not df.empty
+		},
+		"elapsed_seconds": round(time.monotonic() - start, 3),
+	})
+	return 0
+
+def build_parser():
+	parser = argparse.ArgumentParser(description="Headless cluster jobs: aggregation, consistency check, read repair, export, ingest and snapshots")
+	parser.add_argument("--endpoint", default=os.environ.get("WEAVIATE_URL"), help="cluster URL (default: WEAVIATE_URL)")
+	parser.add_argument("--api-key", default=os.environ.get("WEAVIATE_API_KEY", ""), help="API key (default: WEAVIATE_API_KEY)")
+	parser.add_argument("--grpc-port", type=int, help="gRPC port of a custom deployment (default: 50051)")
+	parser.add_argument("--verbose", action="store_true", help="also write the utilities' log output to stderr")
+	commands = parser.add_subparsers(dest="command", required=True)
+
+	aggregate = commands.add_parser("aggregate", help="count objects of every collection and tenant")
+	aggregate.add_argument("--async", dest="use_async", action="store_true", help="run the queries concurrently")
+	aggregate.add_argument("--concurrency", type=int, default=16)
+	aggregate.add_argument("--deadline", type=float, help="time budget in seconds (default: WEAVIATE_DEADLINE_AGGREGATE)")
+	aggregate.set_defaults(func=run_aggregate)
+
+	consistency = commands.add_parser("consistency", help="compare shard object counts across replicas")
+	consistency.add_argument("--top", type=int, help="only report the N shards with the most drift")
+	consistency.set_defaults(func=run_consistency)
+
+	repair = commands.add_parser("repair", help="read every object with consistency level ALL")
+	repair.add_argument("collection", nargs="*", help="collections to repair")
+	repair.add_argument("--tenant", help="tenant of the named collections")
+	repair.add_argument("--inconsistent", action="store_true", help="also repair every collection with inconsistent shards, worst drift first")
+	repair.add_argument("--page-size", type=int, default=1000, help="UUIDs listed per request")
+	repair.add_argument("--targeted", action="store_true", help="read every object on each replica node and only repair the ones missing or outdated on a node")
+	repair.add_argument("--mode", choices=["rest", "grpc"], default=os.environ.get("WEAVIATE_REPAIR_MODE", "rest"), help="rest reads one object per request, grpc a batch of objects per query")
+	repair.add_argument("--batch-size", type=int, default=int(os.environ.get("WEAVIATE_REPAIR_GRPC_BATCH", 200)), help="objects per gRPC query")
+	repair.add_argument("--concurrency", type=int, default=int(os.environ.get("WEAVIATE_REPAIR_CONCURRENCY", 16)), help="requests in flight at once")
+	repair.add_argument("--rate-limit", type=float, default=float(os.environ.get("WEAVIATE_REPAIR_RATE_LIMIT", 0)), help="most object reads per second, 0 for no limit")
+	repair.add_argument("--resume", action="store_true", help="continue interrupted jobs from their last checkpoint, they run first")
+	repair.add_argument("--checkpoint-db", default=os.environ.get("WEAVIATE_REPAIR_DB", "repair_checkpoints.db"), help="SQLite file of the repair jobs and checkpoints")
+	repair.set_defaults(func=run_repair)
+
+	repair_jobs_command = commands.add_parser("repair-jobs", help="list the repair jobs of the checkpoint store (no connection)")
+	repair_jobs_command.add_argument("--limit", type=int, default=100, help="most recent jobs listed")
+	repair_jobs_command.add_argument("--checkpoint-db", default=os.environ.get("WEAVIATE_REPAIR_DB", "repair_checkpoints.db"), help="SQLite file of the repair jobs and checkpoints")
+	repair_jobs_command.set_defaults(func=run_repair_jobs, needs_client=False)
+
+	export = commands.add_parser("export", help="write all objects of a collection as JSON lines")
+	export.add_argument("collection")
+	export.add_argument("--tenant")
+	export.add_argument("--include-vector", action="store_true")
+	export.add_argument("--output", help="file to write (default: stdout)")
+	export.set_defaults(func=run_export)
+
+	ingest = commands.add_parser("ingest", help="batch upload a CSV or JSON file into an existing collection")
+	ingest.add_argument("collection")
+	ingest.add_argument("file")
+	ingest.add_argument("--format", choices=["csv", "json"], help="default: from the file extension")
+	ingest.add_argument("--batch-size", type=int, default=1000)
+	ingest.set_defaults(func=run_ingest)
+
+	snapshot = commands.add_parser("snapshot", help="write node, shard, Raft, schema and tenant tables to Parquet / Arrow files")
+	snapshot.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+	snapshot.add_argument("--output-dir", default=os.environ.get("WEAVIATE_SNAPSHOT_DIR", "snapshots"))
+	snapshot.set_defaults(func=run_snapshot)
+
+	snapshot_diff = commands.add_parser("snapshot-diff", help="compare two snapshot directories (no connection)")
+	snapshot_diff.add_argument("old")
+	snapshot_diff.add_argument("new")
+	snapshot_diff.add_argument("--limit", type=int, help="rows per table in the output (default: all)")
+	snapshot_diff.set_defaults(func=run_snapshot_diff, needs_client=False)
+	return parser
+
+def main():
+	from utils.connection.rest_session import normalize_endpoint
+	args = build_parser().parse_args()
+	# Repair jobs are kept per normalized endpoint, the same key as on the page
+	if args.endpoint:
+		args.endpoint = normalize_endpoint(args.endpoint)
+	if not getattr(args, "needs_client", True):
+		sys.stdout = _stderr if args.verbose else open(os.devnull, "w")
+		try:
+			return args.func(args)
+		except BrokenPipeError:
+			return 1
+		except Exception as e:
+			log(f"{args.command} failed: {e}")
+			emit({"error": str(e)})
+			return 1
+		finally:
+			if sys.stdout is not _stderr:
+				sys.stdout.close()
+				sys.stdout = _stderr
+	if not args.endpoint:
+		log("No endpoint given, use --endpoint or WEAVIATE_URL.")
+		return 1
+
+	# Keep stdout for results only: the utilities' own prints go to stderr with --verbose, otherwise nowhere
+	sys.stdout = _stderr if args.verbose else open(os.devnull, "w")
+	# Cached utilities warn that no Streamlit runtime is running, which is expected here
+	import streamlit.logger
+	streamlit.logger.set_log_level("error")
+
+	from utils.connection.weaviate_connection import release_weaviate_client, weaviate_client_in_use
+	try:
+		client_key, client = connect(args)
+	except Exception as e:
+		log(f"Connection failed: {e}")
+		return 1
+	try:
+		# A single command can run longer than the pool's idle timeout without touching the client
+		with weaviate_client_in_use(client_key):
+			return args.func(args, client_key, client)
+	except BrokenPipeError:
+		# The reader of stdout went away (e.g. `| head`)
+		return 1
+	except KeyboardInterrupt:
+		# Interrupted jobs were checkpointed where they support it
+		return 130
+	except Exception as e:
+		log(f"{args.command} failed: {e}")
+		emit({"error": str(e)})
+		return 1
+	finally:
+		release_weaviate_client(client_key)
+		if sys.stdout is not _stderr:
+			sys.stdout.close()
+			# Prints of the pool's exit handler must not end up in the results
+			sys.stdout = _stderr
+
+if __name__ == "__main__":
+	sys.exit(main())
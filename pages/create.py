@@ -1,6 +1,6 @@
 import streamlit as st
 from utils.collections.create import (
-	get_supported_vectorizers,
+	get_available_vectorizers,
 	validate_file_format,
 	create_collection,
 	batch_upload,
@@ -18,14 +18,14 @@ def initialize_session_state():
 		st.session_state.collection_info = None
 
 # Create a form for collection creation
-def create_collection_form():
+def create_collection_form(client):
 	print("create_collection_form() called")
 	with st.form("create_collection_form"):
 		# Collection name input
 		collection_name = st.text_input("Collection Name", placeholder="Enter collection name").strip()
 
-		# Vectorizer selection
-		vectorizers = get_supported_vectorizers()
+		# Vectorizer selection, only vectorizers whose module is enabled on the cluster
+		vectorizers = get_available_vectorizers(client)
 		selected_vectorizer = st.selectbox(
 			"Select Vectorizer",
 			options=vectorizers,
@@ -143,9 +143,12 @@ def main():
 		update_side_bar_labels()
 		initialize_session_state()
 		client = st.session_state.client
-		submit_button, collection_name, selected_vectorizer, uploaded_file = create_collection_form()
+		submit_button, collection_name, selected_vectorizer, uploaded_file = create_collection_form(client)
 		if submit_button:
-			handle_form_submission(client, collection_name, selected_vectorizer, uploaded_file)
+			# The upload can outlast the pool's idle timeout
+			from utils.connection.weaviate_client import client_in_use
+			with client_in_use():
+				handle_form_submission(client, collection_name, selected_vectorizer, uploaded_file)
 		display_collection_info(client)
 
 	else:
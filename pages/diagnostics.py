@@ -0,0 +1,46 @@
+import pandas as pd
+import streamlit as st
+from utils.sidebar.navigation import navigate
+from utils.sidebar.helper import update_side_bar_labels
+from utils.diagnostics.metrics import get_metrics_summary, render_prometheus, reset_metrics
+from utils.connection.weaviate_connection import get_pool_stats, POOL_MAX_SIZE, POOL_IDLE_TIMEOUT
+from utils.page_config import set_custom_page_config
+
+def main():
+	set_custom_page_config(page_title="Diagnostics")
+	navigate()
+	update_side_bar_labels()
+
+	st.markdown("###### Latency, call count, error rate and response size of every call this app makes to Weaviate, recorded since the app started (all sessions).")
+
+	st.markdown("#### Operations")
+	summary = get_metrics_summary()
+	if summary:
+		st.dataframe(pd.DataFrame(summary), use_container_width=True)
+	else:
+		st.info("No calls recorded yet.")
+
+	col1, col2 = st.columns(2)
+	with col1:
+		st.download_button(
+			"Download Prometheus Metrics",
+			data=render_prometheus(),
+			file_name="metrics.prom",
+			mime="text/plain",
+			use_container_width=True
+		)
+	with col2:
+		if st.button("Reset Metrics", use_container_width=True):
+			reset_metrics()
+			st.rerun()
+
+	st.markdown("#### Client Pool")
+	st.markdown(f"Max size: **{POOL_MAX_SIZE}**, idle timeout: **{POOL_IDLE_TIMEOUT}s**")
+	pool_stats = get_pool_stats()
+	if pool_stats:
+		st.dataframe(pd.DataFrame(pool_stats), use_container_width=True)
+	else:
+		st.info("No pooled connections.")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,62 @@
+import streamlit as st
+from utils.sidebar.navigation import navigate
+from utils.sidebar.helper import update_side_bar_labels
+from utils.cluster.fleet import parse_fleet, collect_fleet, process_fleet
+from utils.page_config import set_custom_page_config
+
+# Display the combined fleet tables
+def display_fleet(processed):
+	print("display_fleet() called")
+	st.markdown("#### Fleet Overview")
+	st.dataframe(processed["summary"].astype(str), use_container_width=True)
+
+	st.markdown("#### Node Details")
+	if not processed["node_data"].empty:
+		st.dataframe(processed["node_data"].astype(str), use_container_width=True)
+	else:
+		st.warning("No node details available.")
+
+	st.markdown("#### Shard Details")
+	if not processed["shard_data"].empty:
+		st.dataframe(processed["shard_data"].astype(str), use_container_width=True)
+	else:
+		st.warning("No shard details available.")
+
+	st.markdown("#### Raft Statistics")
+	if not processed["statistics"].empty:
+		st.dataframe(processed["statistics"].astype(str), use_container_width=True)
+	else:
+		st.warning("No Raft statistics available.")
+
+def main():
+	set_custom_page_config(page_title="Fleet")
+	navigate()
+	update_side_bar_labels()
+
+	st.markdown("###### Collect nodes, shards, Raft statistics and metadata from several clusters at once. Clusters are queried concurrently and slow clusters are reported as timed out instead of blocking the others.")
+
+	if "fleet_definition" not in st.session_state:
+		st.session_state.fleet_definition = ""
+
+	st.text_area(
+		"Clusters (one per line: endpoint, API key)",
+		placeholder="https://cluster-a.weaviate.cloud, <API key>\nhttp://10.0.0.5:8080, <API key>",
+		height=200,
+		key="fleet_definition"
+	)
+	deadline = st.number_input("Per-cluster deadline (seconds)", min_value=1, max_value=600, value=30)
+
+	if st.button("Collect Fleet", use_container_width=True):
+		clusters = parse_fleet(st.session_state.fleet_definition)
+		if not clusters:
+			st.error("Please insert at least one cluster endpoint.")
+			return
+		with st.spinner(f"Collecting {len(clusters)} clusters..."):
+			results = collect_fleet(clusters, deadline=deadline)
+			st.session_state.fleet_results = process_fleet(results)
+
+	if st.session_state.get("fleet_results") is not None:
+		display_fleet(st.session_state.fleet_results)
+
+if __name__ == "__main__":
+	main()
@@ -108,7 +108,8 @@ def main():
 							selected_collection, 
 							selected_tenant, 
 							page=st.session_state.current_page,
-							items_per_page=st.session_state.items_per_page
+							items_per_page=st.session_state.items_per_page,
+							client_key=st.session_state.get("client_key")
 						)
 						st.session_state.query_results = result
 						st.session_state.current_collection = selected_collection
@@ -135,7 +136,8 @@ def main():
 							st.session_state.current_page = 1
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=1, items_per_page=st.session_state.items_per_page
+								page=1, items_per_page=st.session_state.items_per_page,
+								client_key=st.session_state.get("client_key")
 							)
 							st.rerun()
 
@@ -144,7 +146,8 @@ def main():
 							st.session_state.current_page -= 1
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page
+								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page,
+								client_key=st.session_state.get("client_key")
 							)
 							st.rerun()
 
@@ -153,7 +156,8 @@ def main():
 							st.session_state.current_page += 1
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page
+								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page,
+								client_key=st.session_state.get("client_key")
 							)
 							st.rerun()
 
@@ -162,7 +166,8 @@ def main():
 							st.session_state.current_page = result["total_pages"]
 							st.session_state.query_results = fetch_collection_data(
 								client, selected_collection, selected_tenant,
-								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page
+								page=st.session_state.current_page, items_per_page=st.session_state.items_per_page,
+								client_key=st.session_state.get("client_key")
 							)
 							st.rerun()
 
@@ -178,7 +183,8 @@ def main():
 						st.session_state.current_page = page_number
 						st.session_state.query_results = fetch_collection_data(
 							client, selected_collection, selected_tenant,
-							page=page_number, items_per_page=st.session_state.items_per_page
+							page=page_number, items_per_page=st.session_state.items_per_page,
+							client_key=st.session_state.get("client_key")
 						)
 						st.rerun()
 	else:
@@ -7,6 +7,7 @@ from utils.sidebar.navigation import navigate
 from utils.sidebar.helper import update_side_bar_labels
 from utils.cluster.collection import fetch_collection_config, list_collections
 from utils.page_config import set_custom_page_config
+from utils.connection.health import get_health_snapshot
 from weaviate.classes.config import PQEncoderType, PQEncoderDistribution, VectorFilterStrategy, StopwordsPreset
 
 # Function to map schema properties to their types
@@ -315,13 +316,21 @@ def get_object_details():
 			# Fetch node data and display table
 			active_endpoint = st.session_state.active_endpoint
 			active_api_key = st.session_state.active_api_key
+			# Probe the nodes concurrently in async mode
+			concurrency = st.session_state.get("async_concurrency", 16) if st.session_state.get("use_async") else 1
+			# Probe the nodes known from the latest health check, or the hardcoded names before the first one
+			snapshot = get_health_snapshot(st.session_state.get("client_key"))
+			node_names = [node["name"] for node in snapshot["nodes"]] if snapshot else None
 			if with_tenant and tenant_name:
-				data_object = find_object_in_tenant_on_nodes(active_endpoint, active_api_key, collection_name, object_uuid, tenant_name)
+				data_object = find_object_in_tenant_on_nodes(active_endpoint, active_api_key, collection_name, object_uuid, tenant_name, concurrency=concurrency, node_names=node_names)
 			else:
-				data_object = find_object_in_collection_on_nodes(active_endpoint, active_api_key, collection_name, object_uuid)
+				data_object = find_object_in_collection_on_nodes(active_endpoint, active_api_key, collection_name, object_uuid, concurrency=concurrency, node_names=node_names)
 			node_df = data_object
 			st.dataframe(node_df, use_container_width=True)
-			st.text("✔ Found | ✖ Not Found | N/A The node does not exist (Hardcoded 11 nodes as maximum for now)")
+			if node_names:
+				st.text("✔ Found | ✖ Not Found | N/A The node does not exist")
+			else:
+				st.text("✔ Found | ✖ Not Found | N/A The node does not exist (Hardcoded 11 nodes as maximum for now)")
 		except Exception as e:
 			st.error(f"An error occurred while checking the object on nodes: {e}")
 
@@ -1,11 +1,17 @@
+import time
+script_start = time.perf_counter()
 import streamlit as st
-from utils.connection.weaviate_client import initialize_client
-from utils.cluster.cluster_operations_handlers import action_check_shard_consistency, action_aggregate_collections_tenants, action_collections_configuration, action_metadata, action_nodes_and_shards, action_collection_schema, action_statistics, action_read_repairs
+from utils.diagnostics.startup import timed_import, mark_first_paint, get_startup_report
 from utils.sidebar.navigation import navigate
-from utils.connection.weaviate_connection import close_weaviate_client
 from utils.sidebar.helper import update_side_bar_labels, clear_session_state
 from utils.page_config import set_custom_page_config
-import time
+from utils.diagnostics.metrics import start_metrics_server_from_env
+
+# Action handlers and the Weaviate client (pandas, requests, weaviate) are imported on first use,
+# so the sidebar is painted before the heavy modules are loaded.
+def run_action(action_name, *args):
+	handlers = timed_import("utils.cluster.cluster_operations_handlers")
+	getattr(handlers, action_name)(*args)
 
 # --------------------------------------------------------------------------
 # Initialize session state
@@ -55,6 +61,12 @@ if "jinaai_key" not in st.session_state:
 if "huggingface_key" not in st.session_state:
 	st.session_state.huggingface_key = ""
 	
+# Async execution state
+if "use_async" not in st.session_state:
+	st.session_state.use_async = False
+if "async_concurrency" not in st.session_state:
+	st.session_state.async_concurrency = 16
+
 # Active connection state
 if "active_endpoint" not in st.session_state:
 	st.session_state.active_endpoint = ""
@@ -182,8 +194,7 @@ if not st.session_state.client_ready:
 	# Connect/Disconnect Buttons
 	# --------------------------------------------------------------------------
 	if st.sidebar.button("Connect", use_container_width=True, type="secondary"):
-		
-		close_weaviate_client()
+		initialize_client = timed_import("utils.connection.weaviate_client").initialize_client
 
 		# Vectorizers Integration API Keys
 		vectorizer_integration_keys = {}
@@ -266,14 +277,43 @@ else:
 		st.toast('Session, states and cache cleared! Weaviate client disconnected successfully!', icon='🔴')
 		time.sleep(1)
 		if st.session_state.get("client_ready"):
-			message = close_weaviate_client()
+			timed_import("utils.connection.weaviate_client").release_client()
 			clear_session_state()
 			# print("DEBUG session_state (On Disconnect):", dict(st.session_state)) # uncomment during development to debug session state
 	st.sidebar.info("Disconnect Button does clear all session states and cache, and disconnect the Weaviate client to server if connected.")
 
+# --------------------------------------------------------------------------
+# Async execution (concurrent fan-out through the async Weaviate client)
+# --------------------------------------------------------------------------
+st.sidebar.checkbox(
+	"Async Mode",
+	key="use_async",
+	help="Run fan-out operations (per-tenant aggregates, tenant listings, node probes) concurrently."
+)
+if st.session_state.use_async:
+	st.sidebar.number_input(
+		"Concurrency Limit",
+		min_value=1,
+		max_value=128,
+		key="async_concurrency"
+	)
+
 # Essential run for the first time
 update_side_bar_labels()
 
+# --------------------------------------------------------------------------
+# Startup timings (cold start of this server process)
+# --------------------------------------------------------------------------
+mark_first_paint(script_start)
+start_metrics_server_from_env()
+startup_report = get_startup_report()
+with st.sidebar.expander("⏱️ Startup Timings", expanded=startup_report["over_budget"]):
+	if startup_report["over_budget"]:
+		st.warning(f"Cold start took {startup_report['first_paint']:.2f}s, over the {startup_report['budget']:.2f}s budget.")
+	st.markdown(f"First paint: **{startup_report['first_paint']:.2f}s** (budget {startup_report['budget']:.2f}s)")
+	for module_name, elapsed in startup_report["imports"]:
+		st.markdown(f"`{module_name}`: {elapsed:.2f}s")
+
 # --------------------------------------------------------------------------
 # Main Page Content (Cluster Operations)
 # --------------------------------------------------------------------------
@@ -284,23 +324,31 @@ st.markdown("###### Any function with (APIs) means it is run using RESTful endpo
 # --------------------------------------------------------------------------
 col1, col2, col3 = st.columns([1, 1, 1])
 col4, col5, col6 = st.columns([1, 1, 1])
-col7, col8 = st.columns([1,1])
+col7, col8, col9 = st.columns([1, 1, 1])
+col10, col11, col12 = st.columns([1, 1, 1])
 
 # Dictionary: button name => action function
 button_actions = {
-	"nodes": action_nodes_and_shards,
-	"aggregate_collections_tenants": action_aggregate_collections_tenants,
-	"collection_properties": action_collection_schema,
-	"collections_configuration": lambda: action_collections_configuration(st.session_state.active_endpoint, st.session_state.active_api_key),
-	"statistics": lambda: action_statistics(st.session_state.active_endpoint, st.session_state.active_api_key),
-	"metadata": lambda: action_metadata(st.session_state.active_endpoint, st.session_state.active_api_key),
-	"check_shard_consistency": action_check_shard_consistency,
-	"read_repairs": lambda: action_read_repairs(st.session_state.active_endpoint, st.session_state.active_api_key),
+	"nodes": lambda: run_action("action_nodes_and_shards"),
+	"aggregate_collections_tenants": lambda: run_action("action_aggregate_collections_tenants"),
+	"collection_properties": lambda: run_action("action_collection_schema"),
+	"collections_configuration": lambda: run_action("action_collections_configuration", st.session_state.active_endpoint, st.session_state.active_api_key),
+	"statistics": lambda: run_action("action_statistics", st.session_state.active_endpoint, st.session_state.active_api_key),
+	"metadata": lambda: run_action("action_metadata", st.session_state.active_endpoint, st.session_state.active_api_key),
+	"check_shard_consistency": lambda: run_action("action_check_shard_consistency"),
+	"read_repairs": lambda: run_action("action_read_repairs", st.session_state.active_endpoint, st.session_state.active_api_key),
+	"shard_monitor": lambda: run_action("action_shard_monitor"),
+	"raft_watcher": lambda: run_action("action_raft_watcher", st.session_state.active_endpoint, st.session_state.active_api_key),
+	"skew_analysis": lambda: run_action("action_skew_analysis"),
+	"snapshots": lambda: run_action("action_snapshots", st.session_state.active_endpoint, st.session_state.active_api_key),
 }
 
 with col1:
 	if st.button("Aggregate Collections & Tenants", use_container_width=True):
 		st.session_state["active_button"] = "aggregate_collections_tenants"
+		# A new run, a cancel of the previous one no longer applies
+		from utils.connection.deadlines import reset_cancel_event
+		reset_cancel_event(st.session_state, "aggregate")
 
 with col2:
 	if st.button("Collection Properties", use_container_width=True):
@@ -330,14 +378,37 @@ with col8:
 	if st.button("Read Repair (APIs)", use_container_width=True):
 		st.session_state["active_button"] = "read_repairs"
 
+with col9:
+	if st.button("Live Shard Monitor", use_container_width=True):
+		st.session_state["active_button"] = "shard_monitor"
+
+with col10:
+	if st.button("Raft Lag Watcher (APIs)", use_container_width=True):
+		st.session_state["active_button"] = "raft_watcher"
+
+with col11:
+	if st.button("Data Distribution Skew", use_container_width=True):
+		st.session_state["active_button"] = "skew_analysis"
+
+with col12:
+	if st.button("Cluster Snapshots (APIs)", use_container_width=True):
+		st.session_state["active_button"] = "snapshots"
+
 # --------------------------------------------------------------------------
 # Execute the active button's action
 # --------------------------------------------------------------------------
 active_button = st.session_state.get("active_button")
 if active_button and st.session_state.get("client_ready"):
+	# Warn from the cached health snapshot instead of checking the cluster before every action
+	health = timed_import("utils.connection.health")
+	snapshot = health.get_health_snapshot(st.session_state.get("client_key"))
+	if snapshot and not snapshot["ready"]:
+		st.warning(f"The cluster was not ready at the last health check ({health.format_age(health.snapshot_age(snapshot))}). Results may be incomplete.")
 	action_fn = button_actions.get(active_button)
 	if action_fn:
-		action_fn()
+		# Sync actions can run longer than the pool's idle timeout without touching the client
+		with timed_import("utils.connection.weaviate_client").client_in_use():
+			action_fn()
 	else:
 		st.warning("No action mapped for this button. Please report this issue to Mohamed Shahin in Weaviate Community Slack.")
 elif not st.session_state.get("client_ready"):
@@ -1,25 +1,67 @@
 import requests
+import os
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 import streamlit as st
-
-# Get shards information
-def get_shards_info(client):
+from utils.connection.rest_session import rest_get, REST_TIMEOUT
+from utils.connection.metadata_cache import get_parsed_metadata
+from utils.diagnostics.metrics import instrument
+
+# Seconds the shards of a single collection are cached for the Nodes & Shards drill-down.
+# Feel free to change it through the environment variable.
+COLLECTION_SHARDS_TTL = float(os.environ.get("WEAVIATE_SHARDS_CACHE_TTL", 60))
+
+# Get shards information. With a collection name only the shards of that collection are returned,
+# which keeps the verbose payload small on clusters with many (multi-tenant) collections.
+@instrument("get_shards_info")
+def get_shards_info(client, collection_name=None):
     print("get_shards_info() called")
-    node_info = client.cluster.nodes(output="verbose")
+    node_info = client.cluster.nodes(collection=collection_name, output="verbose")
     return node_info
 
-# Process shards data from node information
+# Get node status without any shard data, the cheapest nodes request
+@instrument("get_nodes_minimal")
+def get_nodes_minimal(client):
+    print("get_nodes_minimal() called")
+    return client.cluster.nodes(output="minimal")
+
+# Node status as a table, from the minimal nodes output
+def process_nodes_minimal(node_info):
+    print("process_nodes_minimal() called")
+    return pd.DataFrame([
+        {"Node Name": node.name, "Git Hash": node.git_hash, "Version": node.version, "Status": node.status}
+        for node in node_info
+    ])
+
+# Processed shard tables (see process_shards_data) of a single collection. Cached per collection for
+# COLLECTION_SHARDS_TTL seconds; the client_key (pooled client key) keeps clusters apart.
+@st.cache_data(ttl=COLLECTION_SHARDS_TTL, show_spinner=False)
+def get_collection_shards(_client, collection_name, client_key=None):
+    print(f"get_collection_shards() called for: {collection_name}")
+    return process_shards_data(get_shards_info(_client, collection_name))
+
+# Process shards data from node information.
+# Shards are gathered column by column into typed arrays (categoricals for node, collection and index
+# status, nullable integers for the counts) instead of one dict per shard, and the per collection
+# shard counts and READONLY shards are derived with vectorized group-bys. Verbose responses of
+# multi-tenant clusters can hold hundreds of thousands of shards.
 def process_shards_data(node_info):
     print("process_shards_data() called")
     node_data = []
-    shard_data = []
-    collection_shard_counts = []
-    readonly_shards = []
+    node_names = []
+    shards_per_node = []
+    collections = []
+    shard_names = []
+    object_counts = []
+    index_statuses = []
+    queue_lengths = []
+    compressed = []
+    loaded = []
 
     for node in node_info:
         print(f"Processing node: {node.name}")
-        
+
         # Node-level data
         node_data.append({
             "Node Name": node.name,
@@ -30,43 +72,50 @@ def process_shards_data(node_info):
             "Shard Count (Stats)": node.stats.shard_count,
         })
 
-        # Dictionary to count shards per collection for this node
-        collection_counts = {}
-
-        # Shard-level data for each node
-        for shard in node.shards:            
-            shard_info = {
-                "Node Name": node.name,
-                "Class": shard.collection,
-                "Shard Name": shard.name,
-                "Object Count": shard.object_count,
-                "Index Status": shard.vector_indexing_status,
-                "Vector Queue Length": shard.vector_queue_length,
-                "Compressed": shard.compressed,
-                "Loaded": shard.loaded
-            }
-            shard_data.append(shard_info)
-
-            # Check specifically for READONLY status
-            if hasattr(shard, 'vector_indexing_status') and shard.vector_indexing_status == "READONLY":
-                readonly_shards.append(shard_info)
-
-            # Increment count for this collection on the current node
-            collection_counts[shard.collection] = collection_counts.get(shard.collection, 0) + 1
-
-        # Append shard collection counts for the current node
-        for collection, count in collection_counts.items():
-            collection_shard_counts.append({
-                "Node Name": node.name,
-                "Collection": collection,
-                "Shard Count": count
-            })
+        # Shard-level data for each node, one column at a time
+        shards = node.shards
+        node_names.append(node.name)
+        shards_per_node.append(len(shards))
+        collections += [shard.collection for shard in shards]
+        shard_names += [shard.name for shard in shards]
+        object_counts += [shard.object_count for shard in shards]
+        index_statuses += [shard.vector_indexing_status for shard in shards]
+        queue_lengths += [shard.vector_queue_length for shard in shards]
+        compressed += [shard.compressed for shard in shards]
+        loaded += [shard.loaded for shard in shards]
+
+    # Each node's name repeated for its shards, as codes into the node names
+    node_codes, node_categories = pd.factorize(np.array(node_names, dtype=object))
+    shard_df = pd.DataFrame({
+        "Node Name": pd.Categorical.from_codes(np.repeat(node_codes, shards_per_node), categories=node_categories),
+        "Class": pd.Categorical(collections),
+        "Shard Name": np.array(shard_names, dtype=object),
+        "Object Count": pd.array(object_counts, dtype="Int64"),
+        "Index Status": pd.Categorical(index_statuses),
+        "Vector Queue Length": pd.array(queue_lengths, dtype="Int64"),
+        "Compressed": pd.array(compressed, dtype="boolean"),
+        "Loaded": pd.array(loaded, dtype="boolean"),
+    })
+    if shard_df.empty:
+        shard_df = collection_shard_df = readonly_df = pd.DataFrame()
+    else:
+        # Number of shards per collection on each node
+        collection_shard_df = (
+            shard_df.groupby(["Node Name", "Class"], observed=True, sort=False)
+            .size()
+            .reset_index(name="Shard Count")
+            .rename(columns={"Class": "Collection"})
+        )
+        # Check specifically for READONLY status
+        readonly_df = shard_df[shard_df["Index Status"] == "READONLY"].reset_index(drop=True)
+        for column in ("Node Name", "Class", "Index Status"):
+            readonly_df[column] = readonly_df[column].cat.remove_unused_categories()
 
     return {
         "node_data": pd.DataFrame(node_data),
-        "shard_data": pd.DataFrame(shard_data), 
-        "collection_shard_data": pd.DataFrame(collection_shard_counts),
-        "readonly_shards": pd.DataFrame(readonly_shards) if readonly_shards else pd.DataFrame()
+        "shard_data": shard_df,
+        "collection_shard_data": collection_shard_df,
+        "readonly_shards": readonly_df if not readonly_df.empty else pd.DataFrame()
     }
 
 # Display shards information
@@ -75,47 +124,118 @@ def display_shards_table(processed_data):
     return processed_data["node_data"], processed_data["shard_data"]
 
 # Check consistency of shard object counts across nodes. Returns a DataFrame of inconsistencies, or None if consistent.
+# Replica counts are gathered into columns and compared per (collection, shard) with vectorized group-bys,
+# which keeps million-tenant collections (one shard per tenant) manageable. Besides the replica's count,
+# each row has the shard's min/max/spread over its replicas and how far this replica is behind the max.
 def check_shard_consistency(node_info):
     print("check_shard_consistency() called")
-    shard_data = defaultdict(list)
+    collections = []
+    shard_names = []
+    node_names = []
+    object_counts = []
     for node in node_info:
         # node.shards is a list of shards for this node
-        for shard in node.shards:
-            shard_key = (shard.collection, shard.name)
-            shard_data[shard_key].append((node.name, shard.object_count))
-
-    inconsistent_shards = []
-    for (collection, shard_name), details in shard_data.items():
-        object_counts = [obj_count for _, obj_count in details]
-        # Inconsistent if not all object counts are identical
-        if len(set(object_counts)) > 1:
-            for node_name, object_count in details:
-                inconsistent_shards.append({
-                    "Collection": collection,
-                    "Shard": shard_name,
-                    "Node": node_name,
-                    "Object Count": object_count,
-                })
-
-    if inconsistent_shards:
-        df_inconsistent_shards = pd.DataFrame(inconsistent_shards)
-        return df_inconsistent_shards
-
-    return None
+        shards = node.shards
+        collections += [shard.collection for shard in shards]
+        shard_names += [shard.name for shard in shards]
+        node_names += [node.name] * len(shards)
+        object_counts += [shard.object_count for shard in shards]
+
+    if not object_counts:
+        return None
+
+    df = pd.DataFrame({
+        "Collection": pd.Categorical(collections),
+        "Shard": np.array(shard_names, dtype=object),
+        "Node": pd.Categorical(node_names),
+        "Object Count": pd.array(object_counts, dtype="Int64").fillna(0).to_numpy(dtype=np.int64),
+    })
+    groups = df.groupby(["Collection", "Shard"], observed=True, sort=False)["Object Count"]
+    df["Min"] = groups.transform("min")
+    df["Max"] = groups.transform("max")
+
+    # Inconsistent if not all object counts of a shard are identical
+    df = df[df["Min"] != df["Max"]].reset_index(drop=True)
+    if df.empty:
+        return None
+
+    df["Spread"] = df["Max"] - df["Min"]
+    df["Replica Drift"] = df["Max"] - df["Object Count"]
+    df["Relative Drift"] = df["Replica Drift"] / df["Max"]
+    df["Collection"] = df["Collection"].cat.remove_unused_categories()
+    df["Node"] = df["Node"].cat.remove_unused_categories()
+    return df
+
+# One row per inconsistent shard, worst first: ranked by absolute drift (spread between the replicas)
+# and then by relative drift (spread / max). Lagging Nodes are the replicas below the max.
+def rank_shard_drift(df_inconsistent):
+    print("rank_shard_drift() called")
+    if df_inconsistent is None or df_inconsistent.empty:
+        return pd.DataFrame()
+    groups = df_inconsistent.groupby(["Collection", "Shard"], observed=True, sort=False)
+    df_ranked = groups.agg(
+        Replicas=("Node", "size"),
+        Min=("Min", "first"),
+        Max=("Max", "first"),
+        Spread=("Spread", "first"),
+        Missing=("Replica Drift", "sum"),
+    ).reset_index()
+    df_ranked["Relative Drift"] = df_ranked["Spread"] / df_ranked["Max"]
+    # Joined in plain Python, a per-group lambda is far slower with hundreds of thousands of shards
+    lagging = df_inconsistent[df_inconsistent["Replica Drift"] > 0]
+    lagging_nodes = defaultdict(list)
+    for collection, shard, node in zip(lagging["Collection"].tolist(), lagging["Shard"].tolist(), lagging["Node"].tolist()):
+        lagging_nodes[(collection, shard)].append(node)
+    df_ranked["Lagging Nodes"] = [", ".join(lagging_nodes[key]) for key in zip(df_ranked["Collection"].tolist(), df_ranked["Shard"].tolist())]
+    df_ranked = df_ranked.sort_values(["Spread", "Relative Drift"], ascending=False, kind="stable").reset_index(drop=True)
+    df_ranked.insert(0, "Rank", np.arange(1, len(df_ranked) + 1))
+    return df_ranked
+
+# Collections of the given names that have multi-tenancy enabled. Their shards are tenants.
+@instrument("get_multi_tenant_collections")
+def get_multi_tenant_collections(client, collection_names):
+    print("get_multi_tenant_collections() called")
+    multi_tenant = set()
+    for collection_name in collection_names:
+        config = client.collections.get(collection_name).config.get()
+        if config.multi_tenancy_config.enabled:
+            multi_tenant.add(collection_name)
+    return multi_tenant
+
+# Read repair targets in drift order, worst first. Tenants of multi-tenant collections are repaired one
+# by one, other collections as a whole (objects can not be listed per shard), ranked by their worst shard.
+def drift_repair_targets(df_ranked, multi_tenant_collections):
+    print("drift_repair_targets() called")
+    if df_ranked is None or df_ranked.empty:
+        return pd.DataFrame(columns=["Collection", "Tenant", "Shards", "Spread", "Relative Drift", "Missing"])
+    df = df_ranked.copy()
+    df["Collection"] = df["Collection"].astype(str)
+    is_tenant = df["Collection"].isin(multi_tenant_collections)
+    df["Tenant"] = df["Shard"].where(is_tenant, None)
+    # Ranked rows come worst first, so the first row of a target is its worst shard
+    df_targets = df.groupby(["Collection", "Tenant"], dropna=False, sort=False).agg(
+        Rank=("Rank", "first"),
+        Shards=("Shard", "size"),
+        Spread=("Spread", "first"),
+        **{"Relative Drift": ("Relative Drift", "first")},
+        Missing=("Missing", "sum"),
+    ).reset_index().sort_values("Rank", kind="stable")
+    df_targets["Tenant"] = df_targets["Tenant"].astype(object).where(df_targets["Tenant"].notna(), None)
+    return df_targets.drop(columns="Rank").reset_index(drop=True)
 
 # Get cluster Schema
+@instrument("get_schema")
 def get_schema(cluster_url, api_key):
     print("get_schema() called with cluster_url:", cluster_url)
     try:
-        url = f"{cluster_url}/v1/schema"
-        headers = {"Authorization": f"Bearer {api_key}"}
-        response = requests.get(url, headers=headers)
+        response = rest_get(cluster_url, api_key, "/v1/schema")
         response.raise_for_status()
         return response.json() 
     except requests.exceptions.RequestException as e:
         return {"error": f"Failed to fetch cluster Schema: {e}"}
     
 # Get cluster Schema
+@instrument("get_schema")
 def get_schema(client):
     print("get_schema() called")
     try:
@@ -125,12 +245,11 @@ def get_schema(client):
         return {"error": f"Failed to fetch cluster Schema: {e}"}
 
 # Get cluster statistics
-def fetch_cluster_statistics(cluster_url, api_key):
+@instrument("fetch_cluster_statistics")
+def fetch_cluster_statistics(cluster_url, api_key, timeout=REST_TIMEOUT):
     print("fetch_cluster_statistics() called with cluster_url:", cluster_url)
     try:
-        url = f"{cluster_url}/v1/cluster/statistics"
-        headers = {"Authorization": f"Bearer {api_key}"}
-        response = requests.get(url, headers=headers)
+        response = rest_get(cluster_url, api_key, "/v1/cluster/statistics", timeout=timeout)
         response.raise_for_status() 
 
         return response.json() 
@@ -212,107 +331,99 @@ def process_statistics(stats):
         "network_info": df_network
     }
 
-# Get cluster metadata
+# Get cluster metadata. Reads the shared metadata cache, /v1/meta is only fetched when the cluster's
+# version or nodes changed since, see utils/connection/metadata_cache.py.
+@instrument("get_metadata")
 def get_metadata():
     print("get_metadata() called")
     try:
-        metadata = st.session_state.client.get_meta()
-
-        # Process general metadata (excluding modules)
-        general_metadata = {
-            key: str(value) for key, value in metadata.items() if key != "modules"
-        }
-        general_metadata_df = pd.DataFrame(general_metadata.items(), columns=["Key", "Value"])
-
-        # Process modules
-        modules_data = metadata.get("modules", {})
-        standard_modules = []  # For modules with standard structure (name + documentationHref)
-        other_modules = []     # For modules with different structure
-
-        for module_name, module_details in modules_data.items():
-            if isinstance(module_details, dict):
-                if "name" in module_details and "documentationHref" in module_details:
-                    standard_modules.append({
-                        "Module": str(module_name),
-                        "Name": str(module_details.get("name", "N/A")),
-                        "Documentation": str(module_details.get("documentationHref", "N/A"))
-                    })
-                else:
-                    # Other module format
-                    other_module = {"Module": str(module_name)}
-                    other_module.update({k: str(v) if v is not None else "N/A" 
-                                       for k, v in module_details.items()})
-                    other_modules.append(other_module)
-
-        standard_modules_df = pd.DataFrame(standard_modules) if standard_modules else pd.DataFrame()
-        other_modules_df = pd.DataFrame(other_modules) if other_modules else pd.DataFrame()
-
-        return {
-            "general_metadata_df": general_metadata_df,
-            "standard_modules_df": standard_modules_df,
-            "other_modules_df": other_modules_df
-        }
-
+        return get_parsed_metadata(st.session_state.client, st.session_state.get("client_key"))
     except Exception as e:
         return {"error": f"Failed to fetch cluster metadata: {e}"}
 
-# Trigger read repairs for a collection to force consistency
-def read_repairs(cluster_url, api_key, collection_name):
-    print("read_repairs() called")
-    base_url = cluster_url
-    class_name = collection_name
-    bearer_token = api_key
-
-    headers = {
-        "Authorization": f"Bearer {bearer_token}"
-    }
-
-    # Step 1: Fetch all UUIDs for a class
-    limit = 500
-    offset = 0
-    all_uuids = []
-
-    print(f"=== Fetching all objects for class '{class_name}' ===")
+# List all object UUIDs of a collection (or one tenant of it) through the REST API, yielding one page
+# (list of UUIDs) at a time. Pages follow the `after` cursor, so every page costs the same and listing is
+# not capped by the server's QUERY_MAXIMUM_RESULTS like offset paging. Starts after the `after` UUID if
+# given. REST returns full objects, iter_object_uuid_pages_grpc() only reads the UUIDs.
+# Raises RuntimeError if a page cannot be listed.
+def iter_object_uuid_pages(cluster_url, api_key, collection_name, limit=1000, timeout=REST_TIMEOUT, tenant=None, after=None):
     while True:
         params_list = {
             "limit": limit,
-            "offset": offset,
-            "class": class_name 
+            "class": collection_name
         }
-        resp = requests.get(f"{base_url}/v1/objects", params=params_list, headers=headers)
-
+        if after:
+            params_list["after"] = after
+        if tenant:
+            params_list["tenant"] = tenant
+        resp = rest_get(cluster_url, api_key, "/v1/objects", params=params_list, timeout=timeout)
         if resp.status_code != 200:
-            print(f"Error listing objects for '{class_name}': {resp.status_code} {resp.text}")
-            break
+            raise RuntimeError(f"Error listing objects for '{collection_name}': {resp.status_code} {resp.text}")
 
-        data = resp.json()
-        objects_batch = data.get("objects", [])
+        objects_batch = resp.json().get("objects", [])
         if not objects_batch:
-            break
-
-        for i, obj in enumerate(objects_batch, start=offset):
-            uuid = obj.get("id")
-            all_uuids.append(uuid)
-            print(f"Found object #{i}: {uuid}")
-
-        offset += limit
+            return
+        page = [obj.get("id") for obj in objects_batch]
+        yield page
+        after = page[-1]
+
+# Same as iter_object_uuid_pages() through the client's gRPC query path, with the `after` cursor and no
+# properties, so only the UUIDs are transferred
+def iter_object_uuid_pages_grpc(client, collection_name, limit=1000, tenant=None, after=None):
+    collection = client.collections.get(collection_name)
+    if tenant:
+        collection = collection.with_tenant(tenant)
+    while True:
+        try:
+            response = collection.query.fetch_objects(limit=limit, after=after, return_properties=[])
+        except Exception as e:
+            raise RuntimeError(f"Error listing objects for '{collection_name}': {e}") from e
+        if not response.objects:
+            return
+        page = [str(obj.uuid) for obj in response.objects]
+        yield page
+        after = page[-1]
+
+# Number of objects of a collection (or one tenant of it) from an aggregate query, None if it fails
+def count_objects(client, collection_name, tenant=None):
+    collection = client.collections.get(collection_name)
+    if tenant:
+        collection = collection.with_tenant(tenant)
+    try:
+        return collection.aggregate.over_all(total_count=True).total_count
+    except Exception as e:
+        print(f"Error counting objects of '{collection_name}': {e}")
+        return None
+
+# Flatten UUID pages into single UUIDs, pages are fetched as the UUIDs are consumed
+def iter_uuids(pages):
+    for page in pages:
+        yield from page
+
+# Read one object with consistency level ALL, which makes Weaviate repair replicas that miss it or hold
+# an outdated copy. Returns the response (200 found, 404 not found, anything else is an error).
+def read_object_consistent(cluster_url, api_key, collection_name, uuid, timeout=REST_TIMEOUT, tenant=None):
+    params_single = {
+        "consistency_level": "ALL"
+    }
+    if tenant:
+        params_single["tenant"] = tenant
+    return rest_get(cluster_url, api_key, f"/v1/objects/{collection_name}/{uuid}", params=params_single, timeout=timeout)
 
-    print(f"\nFetched {len(all_uuids)} total objects in class '{class_name}'.\n")
+# Trigger read repairs for a collection to force consistency
+@instrument("read_repairs")
+def read_repairs(cluster_url, api_key, collection_name):
+    print("read_repairs() called")
+    class_name = collection_name
 
-    # Step 2: Fetch each UUID with consistency_level=ALL
+    # Fetch the UUIDs page by page and read each with consistency_level=ALL, concurrently, while listing
+    # Imported here, the repair engine itself builds on this module
+    from utils.cluster.read_repair import repair_objects, repair_rates
     print(f"=== Checking objects for class '{class_name}' ===")
-    for index, uuid in enumerate(all_uuids):
-        url = f"{base_url}/v1/objects/{class_name}/{uuid}"
-        params_single = {
-            "consistency_level": "ALL"
-        }
-        resp_single = requests.get(url, params=params_single, headers=headers)
-
-        if resp_single.status_code == 200:
-            obj_data = resp_single.json()
-            name_val = obj_data.get("properties", {}).get("name")
-            print(f"[{index}] UUID={uuid} => name={name_val}")
-        elif resp_single.status_code == 404:
-            print(f"[{index}] UUID={uuid} => Not found.")
-        else:
-            print(f"[{index}] UUID={uuid} => Error {resp_single.status_code}: {resp_single.text}")
+    stats = repair_objects(cluster_url, api_key, class_name, iter_uuids(iter_object_uuid_pages(cluster_url, api_key, class_name, limit=500)))
+    if stats["stopped"]:
+        print(stats["stopped"])
+    rates = repair_rates(stats)
+    for error in stats["error_samples"]:
+        print(error)
+    print(f"Found: {stats['found']}, not found: {stats['not_found']}, errors: {stats['errors']} ({rates['rate']:.1f} reads/s)")
@@ -1,65 +1,281 @@
+import os
+import sqlite3
 import pandas as pd
 import streamlit as st
-import requests
 import time
-from utils.cluster.collection import aggregate_collections, get_schema, list_collections, process_collection_config, fetch_collection_config, get_collectios_count
-from utils.cluster.cluster_operations import fetch_cluster_statistics, process_statistics, get_shards_info, process_shards_data, get_metadata, check_shard_consistency, read_repairs
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils.cluster.collection import aggregate_collections, aggregate_collections_async, get_schema, list_collections, process_collection_config, fetch_collection_config, get_collectios_count
+from utils.cluster.cluster_operations import fetch_cluster_statistics, process_statistics, get_shards_info, get_nodes_minimal, process_nodes_minimal, get_collection_shards, process_shards_data, get_metadata, check_shard_consistency, rank_shard_drift, get_multi_tenant_collections, drift_repair_targets, read_repairs, iter_object_uuid_pages_grpc, iter_uuids, count_objects
+from utils.connection.weaviate_connection import get_weaviate_async_client
+from utils.connection.rest_session import normalize_endpoint
+from utils.connection.deadlines import Deadline, DeadlineExceeded, OperationCancelled, cancel_operation, get_cancel_event, reset_cancel_event
+from utils.cluster.read_repair import REPAIR_CONCURRENCY, REPAIR_RATE_LIMIT, REPAIR_MODES, REPAIR_MODE, REPAIR_GRPC_BATCH, REPAIR_LIST_PAGE, new_repair_stats, repair_objects, repair_rates
+from utils.cluster.repair_checkpoints import REPAIR_CHECKPOINT_DB, new_owner, create_job, resumable_jobs, claim_job, discard_job, list_batches, checkpoint_poll, start_batch, record_batch, finish_job, stats_from_job
+from utils.cluster.replica_diff import replica_groups, iter_divergent_uuids, new_diff_stats, targeted_cursor
+from utils.cluster.indexing_tracker import format_duration
+from utils.diagnostics.metrics import record
+
+# Rows of a snapshot diff table shown on the page
+SNAPSHOT_DIFF_DISPLAY_ROWS = 5000
+
+# Worker threads for aggregations, so the script thread stays free to show progress and to be stopped
+_aggregate_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aggregate")
 
 # --------------------------------------------------------------------------
 # Action Handlers (one function per button) for Cluster Operations
 # --------------------------------------------------------------------------
 
-# Fetch node info and display node and shard details.
+# Display node status from the minimal nodes output, then the shards of one selected collection, fetched
+# on demand and cached per collection. Loading the shards of all collections is still possible, but the
+# verbose output of a whole cluster with many multi-tenant collections can be tens of MB.
 def action_nodes_and_shards():
 	print("action_nodes_and_shards called")
-	node_info = get_shards_info(st.session_state.client)
-	if node_info:
+	client = st.session_state.client
+	try:
+		node_table = process_nodes_minimal(get_nodes_minimal(client))
+	except Exception as e:
+		st.error(f"Failed to retrieve node details: {e}")
+		return
+
+	st.markdown("#### Node Details")
+	if not node_table.empty:
+		st.dataframe(node_table.astype(str), use_container_width=True)
+	else:
+		st.warning("No node details available.")
+
+	collections = list_collections(client)
+	if isinstance(collections, dict):
+		st.error(collections["error"])
+		return
+
+	col_collection, col_all = st.columns([3, 1])
+	with col_collection:
+		collection_name = st.selectbox(
+			"Collection",
+			[None] + sorted(collections),
+			format_func=lambda name: "Select a collection..." if name is None else name,
+			key="nodes_shards_collection"
+		)
+	with col_all:
+		load_all = st.checkbox("All collections", key="nodes_shards_all", help="Load the shards of every collection at once. The response can be very large on clusters with many tenants.")
+	if st.button("Refresh Shards", use_container_width=True):
+		get_collection_shards.clear()
+
+	if load_all:
+		node_info = get_shards_info(client)
+		if not node_info:
+			st.error("Failed to retrieve node and shard details.")
+			return
 		processed_data = process_shards_data(node_info)
-		node_table = processed_data["node_data"]
-		shard_table = processed_data["shard_data"]
-		collection_shard_table = processed_data["collection_shard_data"]
-		readonly_shards_table = processed_data["readonly_shards"]
-
-		st.markdown("#### Node Details")
-		if not node_table.empty:
-			st.dataframe(node_table.astype(str), use_container_width=True)
-		else:
-			st.warning("No node details available.")
+		st.markdown("#### Node Statistics")
+		st.dataframe(processed_data["node_data"].astype(str), use_container_width=True)
+	elif collection_name:
+		try:
+			processed_data = get_collection_shards(client, collection_name, client_key=st.session_state.get("client_key"))
+		except Exception as e:
+			st.error(f"Failed to retrieve shard details of '{collection_name}': {e}")
+			return
+	else:
+		st.info("Select a collection to load its shards.")
+		return
 
-		st.markdown("#### Shard Count")
-		if not collection_shard_table.empty:
-			st.dataframe(collection_shard_table, use_container_width=True)
-		else:
-			st.warning("No shard collection details available.")
+	display_shard_tables(processed_data)
 
-		st.markdown("#### Shard Details")
-		if not shard_table.empty:
-			st.dataframe(shard_table.astype(str), use_container_width=True)
-		else:
-			st.warning("No shard details available.")
-
-		# Readonly shards section
-		st.markdown("#### Read-only Shards")
-		if not readonly_shards_table.empty:
-			st.dataframe(readonly_shards_table[["Node Name", "Class", "Shard Name", "Object Count"]].astype(str), use_container_width=True)
-			st.warning("⬇️ This operation requires administrator privileges. Please ensure you are connected with an admin API key.")
-			if st.button("Set all Read-only Shards to READY", type="primary"):
-				readonly_groups = readonly_shards_table.groupby("Class")["Shard Name"].apply(list).to_dict()
-				for collection_name, shard_names in readonly_groups.items():
-					try:
-						coll = st.session_state.client.collections.get(collection_name)
-						result = coll.config.update_shards(
-							status="READY",
-							shard_names=shard_names
-						)
-						st.success(f"Updated {len(shard_names)} shard(s) in '{collection_name}' to READY.")
-						st.success(result)
-					except Exception as e:
-						st.error(f"Failed to update shards in '{collection_name}': {e}")
-		else:
-			st.info("No read-only shards found in the cluster.")
+# Shard count, shard details and read-only shards of processed shard data
+def display_shard_tables(processed_data):
+	shard_table = processed_data["shard_data"]
+	collection_shard_table = processed_data["collection_shard_data"]
+	readonly_shards_table = processed_data["readonly_shards"]
+
+	st.markdown("#### Shard Count")
+	if not collection_shard_table.empty:
+		st.dataframe(collection_shard_table, use_container_width=True)
 	else:
-		st.error("Failed to retrieve node and shard details.")
+		st.warning("No shard collection details available.")
+
+	st.markdown("#### Shard Details")
+	if not shard_table.empty:
+		# Typed columns render as they are, converting every cell of a large table to str is slow
+		st.dataframe(shard_table, use_container_width=True)
+	else:
+		st.warning("No shard details available.")
+
+	# Readonly shards section
+	st.markdown("#### Read-only Shards")
+	if not readonly_shards_table.empty:
+		st.dataframe(readonly_shards_table[["Node Name", "Class", "Shard Name", "Object Count"]], use_container_width=True)
+		st.warning("⬇️ This operation requires administrator privileges. Please ensure you are connected with an admin API key.")
+		if st.button("Set all Read-only Shards to READY", type="primary"):
+			# Replicas of a shard share its name, each shard is updated once
+			readonly_groups = readonly_shards_table.groupby("Class", observed=True)["Shard Name"].agg(lambda names: sorted(set(names))).to_dict()
+			bulk_update_shards(readonly_groups, "READY")
+			# The cached shard status is outdated now
+			get_collection_shards.clear()
+	else:
+		st.info("No read-only shards found in the cluster.")
+
+# Set the status of many shards ({collection: [shard names]}) concurrently, with per collection progress,
+# then re-poll the node status to confirm the shards really have the new status.
+def bulk_update_shards(shard_groups, status):
+	from utils.cluster.shard_status import update_shards_status, verify_shards_status
+	total = sum(len(shard_names) for shard_names in shard_groups.values())
+	concurrency = st.session_state.get("async_concurrency", 16)
+	st.markdown(f"###### Updating {total} shard(s) in {len(shard_groups)} collection(s) to {status}, up to **{concurrency}** concurrent requests.")
+	progress_bar = st.progress(0.0)
+	table_placeholder = st.empty()
+
+	def progress_table(progress):
+		return pd.DataFrame([
+			{"Collection": collection_name, "Shards": entry["requested"], "Updated": entry["updated"], "Failed": entry["failed"], "Error": entry["errors"][-1] if entry["errors"] else ""}
+			for collection_name, entry in progress.items()
+		])
+
+	def show_progress(progress):
+		done = sum(entry["updated"] + entry["failed"] for entry in progress.values())
+		progress_bar.progress(min(done / total, 1.0) if total else 1.0, text=f"{done}/{total} shard(s)")
+		table_placeholder.dataframe(progress_table(progress), use_container_width=True, hide_index=True)
+
+	try:
+		async_client = get_weaviate_async_client(st.session_state.client_key)
+		progress = update_shards_status(async_client, shard_groups, status, concurrency=concurrency, poll=show_progress)
+	except Exception as e:
+		st.error(f"Failed to update shards: {e}")
+		return
+	show_progress(progress)
+	failed = sum(entry["failed"] for entry in progress.values())
+	if failed:
+		st.warning(f"{failed} shard update(s) failed, checking the node status anyway.")
+
+	with st.spinner(f"Verifying that the shards are {status}..."):
+		verify_placeholder = st.empty()
+		unchanged = verify_shards_status(
+			st.session_state.client, shard_groups, status,
+			poll=lambda attempt, unchanged: verify_placeholder.caption(f"Check {attempt}: {sum(len(names) for names in unchanged.values())} shard(s) not {status} yet")
+		)
+	if unchanged:
+		st.error(f"{sum(len(names) for names in unchanged.values())} shard(s) are still not {status}:")
+		st.dataframe(pd.DataFrame([{"Collection": collection_name, "Shard Name": shard_name} for collection_name, shard_names in unchanged.items() for shard_name in shard_names]), use_container_width=True, hide_index=True)
+	else:
+		st.success(f"All {total} shard(s) are {status}.")
+
+# Live shard monitor: polls the nodes on an interval and shows what changed since the last poll,
+# with a bounded history per shard. State is kept per session and connection.
+def action_shard_monitor():
+	print("action_shard_monitor called")
+	from utils.cluster.shard_monitor import SHARD_MONITOR_INTERVAL, new_shard_monitor
+	client_key = st.session_state.get("client_key")
+	monitor = st.session_state.get("shard_monitor")
+	if monitor is None or monitor["client_key"] != client_key:
+		monitor = st.session_state.shard_monitor = new_shard_monitor(client_key)
+
+	st.markdown("###### Polls the nodes on an interval. Tables show only the shards that changed since the last poll, the full tables only on request.")
+	col_live, col_interval, col_reset = st.columns([1, 1, 1])
+	with col_live:
+		live = st.toggle("Live", value=True, key="shard_monitor_live")
+	with col_interval:
+		interval = st.number_input("Interval (seconds)", min_value=2.0, max_value=600.0, value=SHARD_MONITOR_INTERVAL, step=1.0, key="shard_monitor_interval")
+	with col_reset:
+		if st.button("Reset History", use_container_width=True):
+			monitor = st.session_state.shard_monitor = new_shard_monitor(client_key)
+
+	st.fragment(run_every=interval if live else None)(_render_shard_monitor)(monitor, interval)
+
+def _render_shard_monitor(monitor, interval):
+	from utils.cluster.shard_monitor import poll_shard_monitor, changed_rows, shard_history, totals_history
+	if monitor["polled_at"] is None or time.time() - monitor["polled_at"] >= interval - 0.5:
+		poll_shard_monitor(monitor, st.session_state.client)
+	if monitor["error"]:
+		st.error(f"Last poll failed: {monitor['error']}")
+	if monitor["polled_at"] is None:
+		return
+
+	totals = monitor["totals"][-1]
+	diff = monitor["last_diff"]
+	col1, col2, col3, col4, col5 = st.columns(5)
+	col1.metric("Shards", len(monitor["rows"]))
+	col2.metric("Objects", f"{totals['Object Count']:,}")
+	col3.metric("Vector Queue", f"{totals['Vector Queue Length']:,}")
+	col4.metric("Indexing Shards", totals["Indexing Shards"])
+	col5.metric("Changed (last poll)", len(diff["added"]) + len(diff["changed"]) + len(diff["removed"]))
+	st.caption(f"Poll #{monitor['polls']} at {time.strftime('%H:%M:%S', time.localtime(monitor['polled_at']))}")
+
+	history = totals_history(monitor)
+	if len(history) > 1:
+		st.markdown("#### Cluster Totals")
+		st.line_chart(history[["Object Count"]])
+		st.line_chart(history[["Vector Queue Length", "Indexing Shards"]])
+
+	_render_indexing_queue(monitor)
+
+	st.markdown("#### Changed Shards (last poll)")
+	df_changed = changed_rows(monitor)
+	if monitor["polls"] == 1:
+		st.info("First poll, changes are shown from the next poll on.")
+	elif not df_changed.empty:
+		st.dataframe(df_changed.astype(str), use_container_width=True)
+	else:
+		st.info("No shard changed since the last poll.")
+	if diff["removed"] and monitor["polls"] > 1:
+		st.warning(f"{len(diff['removed'])} shard(s) disappeared since the last poll.")
+
+	if monitor["changes"]:
+		st.markdown("#### Recent Changes")
+		df_changes = pd.DataFrame(list(monitor["changes"])[::-1])
+		df_changes["Time"] = pd.to_datetime(df_changes["Time"], unit="s")
+		st.dataframe(df_changes.astype(str), use_container_width=True)
+
+	if monitor["history"]:
+		st.markdown("#### Shard History")
+		keys = sorted(monitor["history"])
+		key = st.selectbox("Shard (only shards that changed have a history)", keys, format_func=lambda key: f"{key[1]} / {key[2]} on {key[0]}", key="shard_monitor_shard")
+		df_history = shard_history(monitor, key)
+		if not df_history.empty:
+			st.line_chart(df_history[["Object Count", "Vector Queue Length"]])
+			st.dataframe(df_history.astype(str), use_container_width=True)
+
+	# The full tables are sent on every poll while shown (an expander would still send them), so they are
+	# only rendered when asked for
+	if st.toggle(f"Show all nodes and shards ({len(monitor['nodes'])} nodes, {len(monitor['table'])} shards)", key="shard_monitor_all"):
+		st.markdown("#### Nodes")
+		st.dataframe(monitor["nodes"], use_container_width=True, hide_index=True)
+		st.markdown("#### All Shards")
+		st.dataframe(monitor["table"], use_container_width=True)
+
+# Vector indexing throughput and time to an empty queue per node, collection and shard, from the queue
+# samples of the monitor polls. The node with the longest ETA is the bottleneck of the import.
+def _render_indexing_queue(monitor):
+	from utils.cluster.indexing_tracker import indexing_rates, summarize_indexing, format_duration
+	st.markdown("#### Vector Indexing Queue")
+	df_rates = indexing_rates(monitor["indexing"])
+	if df_rates.empty:
+		if monitor["indexing"]["samples"]:
+			st.info("Vector queues found, throughput is shown from the next poll on.")
+		else:
+			st.info("No shard has a vector indexing queue.")
+		return
+
+	df_nodes = summarize_indexing(df_rates, "Node Name")
+	df_collections = summarize_indexing(df_rates, "Class")
+	eta_values = df_rates["ETA (s)"]
+	cluster_eta = None if eta_values.isna().any() else eta_values.max()
+	col1, col2, col3, col4 = st.columns(4)
+	col1.metric("Queued Vectors", f"{int(df_rates['Vector Queue Length'].sum()):,}")
+	col2.metric("Indexing Rate (vectors/s)", f"{df_rates['Indexing Rate'].sum():,.1f}")
+	col3.metric("Import Rate (objects/s)", f"{df_rates['Import Rate'].sum():,.1f}")
+	col4.metric("All Queues Empty In", format_duration(cluster_eta))
+	st.caption(f"Rates over the last {df_rates['Window (s)'].max():.0f}s. Indexing rate = new objects minus queue growth, approximate for collections with several named vectors.")
+
+	bottleneck = df_nodes.iloc[0]
+	if bottleneck["Vector Queue Length"] and len(df_nodes) > 1:
+		st.warning(f"Bottleneck: {bottleneck['Node Name']} with {int(bottleneck['Vector Queue Length']):,} queued vectors, ETA: {format_duration(bottleneck['ETA (s)'])}.")
+
+	for title, df in (("Nodes", df_nodes), ("Collections", df_collections), ("Shards", df_rates)):
+		df = df.copy()
+		for column in ("ETA (s)", "Slowest Shard ETA (s)"):
+			if column in df:
+				df[column.replace(" (s)", "")] = df.pop(column).map(format_duration)
+		st.markdown(f"###### {title}, slowest first")
+		st.dataframe(df.round(1), use_container_width=True, hide_index=True)
 
 # Check for shard consistency.
 def action_check_shard_consistency():
@@ -68,20 +284,161 @@ def action_check_shard_consistency():
 	if node_info:
 		df_inconsistent_shards = check_shard_consistency(node_info)
 		if df_inconsistent_shards is not None:
-			inconsistent_collections = list(df_inconsistent_shards["Collection"].unique())
-			total = len(inconsistent_collections)
-			st.markdown(f"#### Inconsistent Shards Table with {total} Inconsistent collections")
-			st.dataframe(df_inconsistent_shards.astype(str), use_container_width=True)
+			df_ranked = rank_shard_drift(df_inconsistent_shards)
+			total = df_inconsistent_shards["Collection"].nunique()
+			st.markdown(f"#### {len(df_ranked)} Inconsistent Shards in {total} Inconsistent collections, worst drift first")
+			st.dataframe(df_ranked, use_container_width=True, hide_index=True)
+			st.markdown("#### Replica Object Counts")
+			st.dataframe(df_inconsistent_shards, use_container_width=True, hide_index=True)
 		else:
 			st.success("All shards are consistent.")
 	else:
 		st.error("Failed to retrieve node and shard details.")
 
+# Data distribution skew: how evenly objects and shards are spread over the nodes, per collection, and the
+# largest shards. Skewed nodes serve more of the queries and show up as latency spikes.
+def action_skew_analysis():
+	print("action_skew_analysis called")
+	from utils.cluster.skew import SKEW_THRESHOLD, analyze_skew
+	node_info = get_shards_info(st.session_state.client)
+	if not node_info:
+		st.error("Failed to retrieve node and shard details.")
+		return
+	threshold = st.number_input("Imbalance threshold (coefficient of variation / deviation from an even share)", min_value=0.01, max_value=5.0, value=SKEW_THRESHOLD, step=0.05, key="skew_threshold")
+	skew = analyze_skew(process_shards_data(node_info), threshold)
+	if skew is None:
+		st.warning("No shard details available.")
+		return
+
+	df_nodes = skew["nodes"]
+	df_collections = skew["collections"]
+	col1, col2, col3 = st.columns(3)
+	col1.metric("Node Object CV", f"{skew['object_cv']:.2f}")
+	col2.metric("Node Shard CV", f"{skew['shard_cv']:.2f}")
+	col3.metric("Imbalanced Collections", f"{int(df_collections['Imbalanced'].sum())} / {len(df_collections)}")
+
+	imbalanced_nodes = df_nodes[df_nodes["Imbalanced"]]
+	if skew["object_cv"] > threshold or not imbalanced_nodes.empty:
+		for _, row in imbalanced_nodes.iterrows():
+			st.warning(f"{row['Node Name']} holds {row['Object Share']:.1%} of the objects and {row['Shard Share']:.1%} of the shards ({row['Object Ratio']:.2f}x / {row['Shard Ratio']:.2f}x an even share).")
+	else:
+		st.success("Objects and shards are evenly spread over the nodes.")
+
+	st.markdown("#### Nodes")
+	st.dataframe(df_nodes.style.format({"Object Share": "{:.1%}", "Shard Share": "{:.1%}", "Object Ratio": "{:.2f}", "Shard Ratio": "{:.2f}"}), use_container_width=True, hide_index=True)
+	st.bar_chart(df_nodes.set_index("Node Name")[["Object Share", "Shard Share"]], stack=False)
+
+	st.markdown("#### Collections, most imbalanced first")
+	only_imbalanced = st.checkbox("Only imbalanced collections", value=False, key="skew_only_imbalanced")
+	if only_imbalanced:
+		df_collections = df_collections[df_collections["Imbalanced"]]
+	st.dataframe(df_collections.round(3), use_container_width=True, hide_index=True)
+
+	st.markdown("#### Hottest Shards")
+	st.dataframe(skew["hottest_shards"].style.format({"Collection Share": "{:.1%}", "Size vs Mean": "{:.2f}"}), use_container_width=True, hide_index=True)
+
+# Cluster snapshots: write node, shard, Raft, schema and tenant tables to Parquet / Arrow files for offline
+# analysis, and diff two snapshots without querying the cluster again.
+def action_snapshots(cluster_endpoint, api_key):
+	print("action_snapshots called")
+	from utils.cluster.snapshot import SNAPSHOT_DIR, SNAPSHOT_FORMATS, collect_snapshot, write_snapshot, list_snapshots, snapshot_zip
+	st.markdown(f"###### Snapshots are written to `{os.path.abspath(SNAPSHOT_DIR)}`, one directory per snapshot. `python cli.py snapshot` writes the same files.")
+	col_format, col_take = st.columns([1, 2])
+	with col_format:
+		fmt = st.selectbox("Format", list(SNAPSHOT_FORMATS), key="snapshot_format")
+	with col_take:
+		st.write("")
+		take = st.button("Take Snapshot", type="primary", use_container_width=True)
+	if take:
+		with st.spinner("Reading nodes, shards, Raft statistics and schema..."):
+			snapshot = collect_snapshot(st.session_state.client, cluster_endpoint, api_key, st.session_state.get("client_key"))
+			path = write_snapshot(snapshot, SNAPSHOT_DIR, fmt)
+		manifest = snapshot["manifest"]
+		for part, error in manifest["errors"].items():
+			st.warning(f"{part} left out of the snapshot: {error}")
+		st.success(f"Snapshot written to {path} in {manifest['elapsed_seconds']:.1f}s: " + ", ".join(f"{table} ({rows} rows)" for table, rows in manifest["tables"].items()))
+		st.download_button("Download Snapshot (.zip)", snapshot_zip(path), file_name=f"{os.path.basename(path)}.zip", mime="application/zip")
+
+	snapshots = list_snapshots(SNAPSHOT_DIR)
+	st.markdown("#### Compare Snapshots")
+	if len(snapshots) < 2:
+		st.info("Take at least two snapshots to compare them.")
+		return
+	labels = {manifest["path"]: f"{manifest.get('taken_at')} - {manifest.get('endpoint')} ({manifest.get('format', 'parquet')})" for manifest in snapshots}
+	paths = list(labels)
+	col_old, col_new = st.columns(2)
+	with col_old:
+		old_path = st.selectbox("Old snapshot", paths, index=1, format_func=labels.get, key="snapshot_old")
+	with col_new:
+		new_path = st.selectbox("New snapshot", paths, index=0, format_func=labels.get, key="snapshot_new")
+	if st.button("Compare", use_container_width=True):
+		_render_snapshot_diff(old_path, new_path)
+
+def _render_snapshot_diff(old_path, new_path):
+	from utils.cluster.snapshot import read_snapshot, diff_snapshots
+	start = time.monotonic()
+	diff = diff_snapshots(read_snapshot(old_path), read_snapshot(new_path))
+	st.caption(f"Compared in {time.monotonic() - start:.2f}s")
+	if diff["summary"].empty:
+		st.warning("The snapshots have no table in common.")
+		return
+	st.dataframe(diff["summary"], use_container_width=True, hide_index=True)
+	for table, df in diff["diffs"].items():
+		if df.empty:
+			continue
+		with st.expander(f"{table}: {len(df)} row(s) differ"):
+			# Large diffs (e.g. every shard of a busy cluster) are cut for display
+			st.dataframe(df.head(SNAPSHOT_DIFF_DISPLAY_ROWS), use_container_width=True, hide_index=True)
+			if len(df) > SNAPSHOT_DIFF_DISPLAY_ROWS:
+				st.caption(f"First {SNAPSHOT_DIFF_DISPLAY_ROWS} of {len(df)} rows, `python cli.py snapshot-diff` returns all of them.")
+
 # Aggregate collections and tenants.
 def action_aggregate_collections_tenants():
 	print("action_aggregate_collections_tenants called")
 	st.markdown("###### Collections & Tenants aggregation time may vary depending on the dataset size, as it iterates through all collections and tenants. Check below for tables with statistics.")
-	result = aggregate_collections(st.session_state.client)
+	# The Cancel click reruns the script with its callback run first: this is that rerun, the event is
+	# only reset when the aggregation is started again (see streamlit_app.py)
+	cancel_event = get_cancel_event(st.session_state, "aggregate")
+	if cancel_event.is_set():
+		st.warning("Aggregation cancelled.")
+		st.session_state.pop("active_button", None)
+		return
+	deadline = Deadline("aggregate", cancel_event=cancel_event)
+	cancel_placeholder = st.empty()
+	cancel_placeholder.button("Cancel Aggregation", on_click=cancel_operation, args=(st.session_state, "aggregate"), use_container_width=True)
+	# The aggregation runs on a worker thread while this script run shows its progress. Updating the
+	# progress gives control back to Streamlit, so a Cancel click stops this run at once and the worker
+	# stops at its next deadline check, once the callback has set the event.
+	progress_bar = st.progress(0.0)
+	counts = {"done": 0, "total": 0, "unit": "collections"}
+
+	def count_progress(done, total):
+		counts.update(done=done, total=total)
+
+	if st.session_state.get("use_async"):
+		concurrency = st.session_state.get("async_concurrency", 16)
+		st.markdown(f"###### Async mode: up to **{concurrency}** concurrent requests.")
+		try:
+			async_client = get_weaviate_async_client(st.session_state.client_key)
+		except Exception as e:
+			st.error(f"Error connecting the async client: {e}")
+			return
+		counts["unit"] = "count queries"
+		future = _aggregate_executor.submit(aggregate_collections_async, async_client, st.session_state.client_key, concurrency, _deadline=deadline, _progress=count_progress)
+	else:
+		future = _aggregate_executor.submit(aggregate_collections, st.session_state.client, st.session_state.get("client_key"), _deadline=deadline, _progress=count_progress)
+	while not future.done():
+		wait([future], timeout=0.25)
+		progress_bar.progress(min(counts["done"] / counts["total"], 1.0) if counts["total"] else 0.0, text=f"{counts['done']}/{counts['total']} {counts['unit']}")
+	try:
+		result = future.result()
+	except (DeadlineExceeded, OperationCancelled) as e:
+		cancel_placeholder.empty()
+		progress_bar.empty()
+		st.error(f"Aggregation stopped: {e}")
+		return
+	cancel_placeholder.empty()
+	progress_bar.empty()
 	if "error" in result:
 		st.error(f"Error retrieving collections: {result['error']}")
 		return
@@ -222,11 +579,81 @@ def action_statistics(cluster_endpoint, api_key):
 	except Exception as e:
 		st.error(f"Error fetching cluster statistics: {e}")
 
+# Raft lag watcher: polls /v1/cluster/statistics on an interval and keeps the lag of every node behind
+# the leader, fsmPending and leader changes over time. Schema operations stall while a follower lags.
+def action_raft_watcher(cluster_endpoint, api_key):
+	print("action_raft_watcher called")
+	from utils.cluster.raft_watcher import RAFT_WATCH_INTERVAL, RAFT_LAG_THRESHOLD, new_raft_watcher
+	watcher = st.session_state.get("raft_watcher")
+	if watcher is None or watcher["endpoint"] != cluster_endpoint:
+		watcher = st.session_state.raft_watcher = new_raft_watcher(cluster_endpoint)
+
+	st.markdown("###### Polls the Raft statistics on an interval. Lags are in log entries behind the leader.")
+	col_live, col_interval, col_threshold, col_reset = st.columns([1, 1, 1, 1])
+	with col_live:
+		live = st.toggle("Live", value=True, key="raft_watcher_live")
+	with col_interval:
+		interval = st.number_input("Interval (seconds)", min_value=1.0, max_value=600.0, value=RAFT_WATCH_INTERVAL, step=1.0, key="raft_watcher_interval")
+	with col_threshold:
+		threshold = st.number_input("Lag threshold (entries)", min_value=1, value=RAFT_LAG_THRESHOLD, step=10, key="raft_watcher_threshold")
+	with col_reset:
+		if st.button("Reset History", use_container_width=True, key="raft_watcher_reset"):
+			watcher = st.session_state.raft_watcher = new_raft_watcher(cluster_endpoint)
+
+	st.fragment(run_every=interval if live else None)(_render_raft_watcher)(watcher, interval, api_key, threshold)
+
+def _render_raft_watcher(watcher, interval, api_key, threshold):
+	from utils.cluster.raft_watcher import poll_raft_watcher, raft_lag_status, raft_field_history, leader_changes
+	if watcher["polled_at"] is None or time.time() - watcher["polled_at"] >= interval - 0.5:
+		poll_raft_watcher(watcher, watcher["endpoint"], api_key)
+	if watcher["error"]:
+		st.error(f"Last poll failed: {watcher['error']}")
+	if watcher["polled_at"] is None:
+		return
+
+	df_status = raft_lag_status(watcher, threshold)
+	behind = df_status[df_status["Health"] != "ok"] if not df_status.empty else df_status
+	col1, col2, col3, col4 = st.columns(4)
+	col1.metric("Leader", watcher["leader"] or "none")
+	col2.metric("Term", watcher["term"] if watcher["term"] is not None else "N/A")
+	col3.metric("Max Leader Lag", int(df_status["Leader Lag"].max()) if not df_status.empty and df_status["Leader Lag"].notna().any() else "N/A")
+	col4.metric("Leader Changes", len(watcher["leader_changes"]))
+	st.caption(f"Poll #{watcher['polls']} at {time.strftime('%H:%M:%S', time.localtime(watcher['polled_at']))}")
+
+	if not watcher["synchronized"]:
+		st.error("Cluster is Synchronized: ❌")
+	if watcher["leader"] is None:
+		st.error("No node reports a leader.")
+	for _, row in behind.iterrows():
+		message = f"{row['Node Name']} is {row['Health']}: {row['Leader Lag']} entries behind the leader, {row['FSM Pending']} pending in the FSM."
+		(st.error if row["Health"] == "lagging" else st.warning)(message)
+
+	st.markdown("#### Nodes")
+	st.dataframe(df_status, use_container_width=True, hide_index=True)
+
+	if watcher["polls"] > 1:
+		st.markdown("#### Leader Lag (entries)")
+		st.line_chart(raft_field_history(watcher, "Leader Lag"))
+		st.markdown("#### FSM Pending")
+		st.line_chart(raft_field_history(watcher, "FSM Pending"))
+
+	df_changes = leader_changes(watcher)
+	if not df_changes.empty:
+		st.markdown("#### Leader Changes")
+		st.dataframe(df_changes.astype(str), use_container_width=True, hide_index=True)
+
 # Fetch and display cluster metadata.
 def action_metadata(cluster_endpoint, api_key):
 	print("action_metadata called")
 	st.markdown("#### Cluster Metadata Details")
+	from utils.connection.metadata_cache import invalidate_metadata, metadata_age
+	client_key = st.session_state.get("client_key")
+	if st.button("Refresh Metadata", key="metadata_refresh"):
+		invalidate_metadata(client_key)
 	metadata_result = get_metadata()
+	age = metadata_age(client_key)
+	if age is not None:
+		st.caption(f"Cached {age:.0f}s ago, fetched again when the server version or nodes change.")
 
 	if "error" in metadata_result:
 		st.error(metadata_result["error"])
@@ -356,9 +783,99 @@ def action_collections_configuration(cluster_endpoint, api_key):
 						st.dataframe(df.astype(str), use_container_width=True)
 					else:
 						st.markdown(f"**{details}**")
+# Clear the read repair progress kept in the session state
+def clear_read_repair_state():
+	for key in ["repair_in_progress", "repair_active_target", "repair_groups", "progress", "repair_stats", "repair_job_id", "repair_job_mode"]:
+		if key in st.session_state:
+			del st.session_state[key]
+
+# Owner token of this session's repair jobs in the checkpoint store
+def repair_owner():
+	if "repair_owner" not in st.session_state:
+		st.session_state.repair_owner = new_owner()
+	return st.session_state.repair_owner
+
+# Cancel button callback: stop in-flight repair work and clear its state
+def cancel_read_repairs():
+	print("Stopping read repairs...")
+	cancel_operation(st.session_state, "read_repairs")
+	if st.session_state.get("repair_job_id"):
+		try:
+			finish_job(st.session_state.repair_job_id, repair_owner(), "cancelled")
+		except sqlite3.Error as e:
+			print(f"Could not mark the repair job cancelled: {e}")
+	clear_read_repair_state()
+
+# Initialize the repair state of a target (collection, tenant). The UUIDs are listed while they are read,
+# the object count only estimates the total for the progress bar. A targeted repair checks every listed
+# object on each replica node and reads only the objects they disagree on, if the target has nodes that
+# can be compared.
+def start_read_repair(target):
+	collection_name, tenant = target
+	label = f"`{collection_name}`" + (f" tenant `{tenant}`" if tenant else "")
+	st.markdown(f"**Starting read repairs for collection** (1 iteration only, {REPAIR_MODES.get(st.session_state.get('repair_mode', REPAIR_MODE))}, {st.session_state.get('repair_concurrency', REPAIR_CONCURRENCY)} concurrent requests): {label}")
+
+	groups = None
+	if st.session_state.get("repair_targeted"):
+		try:
+			groups = replica_groups(get_shards_info(st.session_state.client, collection_name), collection_name, tenant) or None
+		except Exception as e:
+			st.warning(f"Could not read the replicas of {collection_name}: {e}")
+		if groups is None:
+			st.warning("No nodes hold the same shards of this target, so their replicas cannot be compared. Repairing all objects.")
+	if groups:
+		total = None
+		st.session_state["repair_logs"] = f"Comparing the replicas of {collection_name}" + (f" (tenant {tenant})" if tenant else "") + f" on {', '.join(' / '.join(nodes) for nodes in groups)}...\n=== Starting Iteration 1 ===\n"
+	else:
+		total = count_objects(st.session_state.client, collection_name, tenant)
+		st.session_state["repair_logs"] = f"Reading objects of {collection_name}" + (f" (tenant {tenant})" if tenant else "") + (f", about {total} objects" if total is not None else "") + "...\n=== Starting Iteration 1 ===\n"
+
+	# Record the job, so it can be resumed after a refresh, a restart or a disconnect
+	mode = st.session_state.get("repair_mode", REPAIR_MODE)
+	try:
+		job_id = create_job(st.session_state.repair_base_url, collection_name, tenant, mode, groups, total, owner=repair_owner())
+		if job_id is None:
+			st.warning(f"Another session or process is repairing {label}. Resume it from here once it is interrupted.")
+			return False
+		st.session_state["repair_logs"] += f"Repair job #{job_id}, checkpointed to {REPAIR_CHECKPOINT_DB}\n"
+	except sqlite3.Error as e:
+		st.warning(f"Could not record the repair job in {REPAIR_CHECKPOINT_DB}, it cannot be resumed: {e}")
+		job_id = None
+
+	# Initialize repair state.
+	st.session_state.repair_in_progress = True
+	st.session_state.repair_active_target = target
+	st.session_state.repair_groups = groups
+	st.session_state.progress = 0.0
+	st.session_state.repair_stats = new_repair_stats(total)
+	st.session_state.repair_job_id = job_id
+	st.session_state.repair_job_mode = mode
+	return True
+
+# Continue an interrupted job from its last checkpoint, listing after its cursor, in the mode it was
+# started with. The job is claimed first, so only one session or process resumes it.
+def resume_read_repair(job):
+	if not claim_job(job, repair_owner()):
+		st.warning(f"Repair job #{job['id']} was resumed or discarded by another session or process.")
+		return False
+	st.session_state.repair_in_progress = True
+	st.session_state.repair_active_target = (job["collection"], job["tenant"])
+	st.session_state.repair_groups = job["groups"]
+	stats = stats_from_job(job)
+	st.session_state.progress = min(stats["next_index"] / stats["total"], 1.0) if stats["total"] else 0.0
+	st.session_state.repair_stats = stats
+	st.session_state.repair_job_id = job["id"]
+	st.session_state.repair_job_mode = job["mode"] or REPAIR_MODE
+	batches = list_batches(job["id"])
+	st.session_state["repair_logs"] = "".join(f"{log}\n" for log in batches["log"].dropna().tail(20))
+	st.session_state["repair_logs"] += f"=== Resuming job #{job['id']} after {stats['next_index']} objects (cursor {stats['cursor']}) ===\n"
+	return True
+
 # Read repairs handler
 def action_read_repairs(cluster_endpoint, api_key):
 	print("action_read_repairs called")
+	# Repair jobs are kept per normalized endpoint, the same key as in the CLI
+	cluster_endpoint = normalize_endpoint(cluster_endpoint)
     # Step 1: Run shard consistency check and extract collection names.
 	node_info = get_shards_info(st.session_state.client)
 	if not node_info:
@@ -370,166 +887,222 @@ def action_read_repairs(cluster_endpoint, api_key):
 		st.success("All shards are consistent. No read repairs needed.")
 		return
 
-	inconsistent_collections = list(df_inconsistent["Collection"].unique())
-	total = len(inconsistent_collections)
-
-	# Store the inconsistent collections list in session state if not already set.
-	if "repair_collections" not in st.session_state:
-		st.session_state.repair_collections = inconsistent_collections
+	# Step 2: Repair targets in drift order, worst first. Tenants of multi-tenant collections are separate targets.
+	# Kept in the session so the order stays stable while batches rerun the script, until refreshed.
+	if "repair_targets" not in st.session_state:
+		df_ranked = rank_shard_drift(df_inconsistent)
+		try:
+			multi_tenant = get_multi_tenant_collections(st.session_state.client, df_ranked["Collection"].astype(str).unique())
+		except Exception as e:
+			st.warning(f"Could not read the multi-tenancy configuration, repairing whole collections: {e}")
+			multi_tenant = set()
+		st.session_state.repair_targets = drift_repair_targets(df_ranked, multi_tenant)
+	df_targets = st.session_state.repair_targets
+	targets = list(zip(df_targets["Collection"], df_targets["Tenant"]))
 
-	st.markdown(f"### Inconsistent {total} collections")
-	st.dataframe(df_inconsistent.astype(str), use_container_width=True)
+	st.markdown(f"### {len(targets)} repair targets in {df_inconsistent['Collection'].nunique()} inconsistent collections, worst drift first")
+	st.dataframe(df_targets, use_container_width=True)
+	with st.expander("Replica Object Counts"):
+		st.dataframe(df_inconsistent, use_container_width=True, hide_index=True)
 
-	# Step 2: Synchronize selected_collection with repair_collections.
-	if "selected_collection" not in st.session_state or st.session_state.selected_collection not in st.session_state.repair_collections:
-		st.session_state.selected_collection = st.session_state.repair_collections[0] if st.session_state.repair_collections else None
-
-	# Radio button for selecting the collection to repair, only if there are collections.
-	if st.session_state.repair_collections:
-		selected_collection = st.radio(
-			"Select a collection to repair",
-			st.session_state.repair_collections,
-			index=st.session_state.repair_collections.index(st.session_state.selected_collection) if st.session_state.selected_collection in st.session_state.repair_collections else 0,
-			key="collection_radio"
+	if "repair_target" not in st.session_state or st.session_state.repair_target not in targets:
+		st.session_state.repair_target = targets[0] if targets else None
+	if targets:
+		selected_target = st.selectbox(
+			"Select a target to repair",
+			targets,
+			index=targets.index(st.session_state.repair_target),
+			format_func=lambda target: f"#{targets.index(target) + 1} {target[0]}" + (f" / tenant {target[1]}" if target[1] else ""),
+			key="repair_target_select"
 		)
-		st.session_state.selected_collection = selected_collection
+		st.session_state.repair_target = selected_target
 	else:
 		st.info("No inconsistent collections to repair.")
-		st.session_state.selected_collection = None
-
-	# Stop any ongoing read repairs.
-	if st.button("Stop the process", use_container_width=True):
-		print("Stopping read repairs...")
-		if 'repair_in_progress' in st.session_state:
-			del st.session_state.repair_in_progress
-		if 'all_uuids' in st.session_state:
-			del st.session_state.all_uuids
-		if 'current_batch_index' in st.session_state:
-			del st.session_state.current_batch_index
-		if 'progress' in st.session_state:
-			del st.session_state.progress
-		st.stop()
-		st.success("Read repairs stopped.")
-
-	# Refresh the collections list when the button is clicked.
+		st.session_state.repair_target = None
+		selected_target = None
+	st.checkbox("Continue with the next targets in drift order", key="repair_continue")
+	st.checkbox("Only repair divergent objects", key="repair_targeted", help="Reads every object on each replica node (GET with node_name) and repairs only the ones missing or outdated on a node. Costs more requests than a full repair, but shows and repairs only the drift.")
+	col_mode, col_batch = st.columns(2)
+	with col_mode:
+		st.radio("Repair mode", list(REPAIR_MODES), index=list(REPAIR_MODES).index(REPAIR_MODE) if REPAIR_MODE in REPAIR_MODES else 0, format_func=REPAIR_MODES.get, key="repair_mode", horizontal=True, help="gRPC reads a batch of objects by their IDs in one query, at consistency level ALL.")
+	with col_batch:
+		st.number_input("Objects per gRPC query", min_value=1, max_value=10000, value=REPAIR_GRPC_BATCH, key="repair_grpc_batch", disabled=st.session_state.get("repair_mode", REPAIR_MODE) != "grpc")
+	col_concurrency, col_rate = st.columns(2)
+	with col_concurrency:
+		st.number_input("Concurrent requests", min_value=1, max_value=256, value=REPAIR_CONCURRENCY, key="repair_concurrency", help="Requests in flight at once. Above WEAVIATE_REST_POOL_MAXSIZE REST connections are not reused.")
+	with col_rate:
+		st.number_input("Rate limit (reads/s, 0 = none)", min_value=0.0, value=REPAIR_RATE_LIMIT, step=50.0, key="repair_rate_limit", help="Spreads the reads evenly to limit the load on a busy cluster.")
+
+	# Cancel any ongoing read repairs. The callback runs before the next script run, so the cancel
+	# event stops in-flight work of the interrupted run as well as clearing the repair state.
+	if st.button("Cancel Read Repairs", on_click=cancel_read_repairs, use_container_width=True):
+		st.success("Read repairs cancelled.")
+
+	# Refresh the targets from the next consistency check when the button is clicked.
 	if st.button("Refresh Collections", use_container_width=True):
+		st.session_state.pop("repair_targets", None)
 		st.success("Collections list refreshed.")
-		
+		st.rerun()
+
+	# Interrupted jobs of this cluster, from the checkpoint store
+	try:
+		interrupted = [job for job in resumable_jobs(cluster_endpoint) if job["id"] != st.session_state.get("repair_job_id")]
+	except sqlite3.Error as e:
+		st.warning(f"Could not read the repair checkpoints in {REPAIR_CHECKPOINT_DB}: {e}")
+		interrupted = []
+	if interrupted:
+		st.markdown(f"#### {len(interrupted)} interrupted repairs")
+		st.dataframe(pd.DataFrame([{
+			"Job": job["id"],
+			"Collection": job["collection"],
+			"Tenant": job["tenant"],
+			"Targeted": bool(job["groups"]),
+			"Objects Read": job["next_index"],
+			"Total": job["total"],
+			"Errors": job["errors"],
+			"Last Checkpoint": pd.to_datetime(job["updated_at"], unit="s"),
+		} for job in interrupted]), use_container_width=True, hide_index=True)
+		jobs_by_id = {job["id"]: job for job in interrupted}
+		resume_id = st.selectbox("Interrupted repair", list(jobs_by_id), format_func=lambda job_id: f"#{job_id} {jobs_by_id[job_id]['collection']}" + (f" / tenant {jobs_by_id[job_id]['tenant']}" if jobs_by_id[job_id]["tenant"] else ""), key="repair_resume_select")
+		col_resume, col_discard = st.columns(2)
+		with col_resume:
+			if st.button("Resume From Checkpoint", use_container_width=True):
+				clear_read_repair_state()
+				st.session_state.repair_base_url = cluster_endpoint
+				st.session_state.repair_api_key = api_key
+				resume_read_repair(jobs_by_id[resume_id])
+		with col_discard:
+			if st.button("Discard Checkpoint", use_container_width=True):
+				if discard_job(jobs_by_id[resume_id]):
+					st.rerun()
+				st.warning(f"Repair job #{resume_id} was resumed by another session or process.")
+
 	# Step 3: Trigger read repairs.
 	if st.button("Start Read Repairs", use_container_width=True):
 		print("Starting read repairs...")
-		if 'repair_in_progress' in st.session_state:
-			del st.session_state.repair_in_progress
-		if 'all_uuids' in st.session_state:
-			del st.session_state.all_uuids
-		if 'current_batch_index' in st.session_state:
-			del st.session_state.current_batch_index
-		if 'progress' in st.session_state:
-			del st.session_state.progress
-		# Ensure the selected collection is still valid.
-		if selected_collection not in st.session_state.repair_collections:
+		clear_read_repair_state()
+		# Ensure the selected target is still valid.
+		if selected_target not in targets:
 			st.error("Selected collection no longer exists in repair list")
 			return
 
-		# If repairs are not already in progress, initialize the repair state.
-		if 'repair_in_progress' not in st.session_state:
-			st.markdown(f"**Starting read repairs for collection** (1 iteration only & 500 UUID per batch): `{selected_collection}`")
-			
-			# Store the cluster endpoint and API key for use in subsequent reruns.
-			st.session_state.repair_base_url = cluster_endpoint
-			st.session_state.repair_api_key = api_key
-
-			# Step 3.1: Fetch all object UUIDs for the selected collection.
-			base_url = cluster_endpoint
-			bearer_token = api_key
-			headers = {"Authorization": f"Bearer {bearer_token}"}
-
-			limit = 1000
-			offset = 0
-			all_uuids = []
-			st.session_state["repair_logs"] = "Fetching objects...\n"
-			
-			while True:
-				params_list = {"limit": limit, "offset": offset, "class": selected_collection, "consistency_level": "ALL"}
-				resp = requests.get(f"{base_url}/v1/objects", params=params_list, headers=headers)
-				if resp.status_code != 200:
-					st.error(f"Error fetching objects: {resp.status_code} {resp.text}")
-					return
-				data = resp.json()
-				objects_batch = data.get("objects", [])
-				if not objects_batch:
-					break
-				all_uuids.extend(obj["id"] for obj in objects_batch)
-				offset += limit
-
-			st.session_state.repair_logs += f"Fetched {len(all_uuids)} objects.\n=== Starting Iteration 1 ===\n"
-
-			# Initialize repair state.
-			st.session_state.repair_in_progress = True
-			st.session_state.all_uuids = all_uuids
-			st.session_state.current_batch_index = 0
-			st.session_state.progress = 0.0
-			st.session_state.batch_size = 500  # Process 500 UUIDs per batch
+		# Store the cluster endpoint and API key for use in subsequent reruns.
+		st.session_state.repair_base_url = cluster_endpoint
+		st.session_state.repair_api_key = api_key
+		if not start_read_repair(selected_target):
+			return
 
 	# If a repair is in progress, process the next batch.
 	if st.session_state.get("repair_in_progress"):
 		# Retrieve the stored cluster endpoint and API key.
 		base_url = st.session_state.get("repair_base_url")
 		bearer_token = st.session_state.get("repair_api_key")
-		selected_collection = st.session_state.selected_collection
+		selected_collection, tenant = st.session_state.repair_active_target
 
 		log_container = st.empty()
 		progress_bar = st.progress(st.session_state.progress)
+		metrics_container = st.empty()
+
+		stats = st.session_state.repair_stats
+		current_batch_index = stats["next_index"]
+
+		def show_progress(stats):
+			rates = repair_rates(stats)
+			total = stats["total"]
+			st.session_state.progress = min(stats["next_index"] / total, 1.0) if total else 0.0
+			progress_bar.progress(st.session_state.progress, text=f"{stats['next_index']}/{total if total is not None else '?'} objects")
+			with metrics_container.container():
+				col1, col2, col3, col4, col5 = st.columns(5)
+				col1.metric("Reads/s", f"{rates['rate']:,.1f}")
+				col2.metric("Found", f"{stats['found']:,}")
+				col3.metric("Not Found", f"{stats['not_found']:,}")
+				col4.metric("Errors", f"{stats['errors']:,}", f"{rates['error_rate']:.2%}", delta_color="inverse")
+				col5.metric("ETA", format_duration(rates["eta"]) if rates["eta"] is not None else "-")
+
+		# Run the repair engine until the batch deadline, reading the objects while they are listed (UUIDs only,
+		# over gRPC). A batch that runs out of time stops starting new reads, and the next rerun lists again
+		# after the last UUID read.
+		deadline = Deadline("repair_batch", cancel_event=reset_cancel_event(st.session_state, "read_repairs"))
+		batch_start = time.perf_counter()
+		job_id = st.session_state.get("repair_job_id")
+		owner = repair_owner()
+		checkpoint_start = start_batch(stats)
+		poll = checkpoint_poll(job_id, owner, show_progress) if job_id else show_progress
+		groups = st.session_state.get("repair_groups")
+		diff_stats = new_diff_stats()
+		listed = iter_uuids(iter_object_uuid_pages_grpc(st.session_state.client, selected_collection, limit=REPAIR_LIST_PAGE, tenant=tenant, after=stats["cursor"]))
+		if groups:
+			uuids = iter_divergent_uuids(base_url, bearer_token, selected_collection, groups, listed, tenant=tenant, stats=diff_stats, deadline=deadline, poll=lambda: poll(stats))
+		else:
+			uuids = listed
+		repair_objects(
+			base_url, bearer_token, selected_collection, uuids, tenant=tenant,
+			concurrency=st.session_state.get("repair_concurrency", REPAIR_CONCURRENCY),
+			rate_limit=st.session_state.get("repair_rate_limit", REPAIR_RATE_LIMIT),
+			deadline=deadline, poll=poll, stats=stats,
+			mode=st.session_state.get("repair_job_mode", REPAIR_MODE), client=st.session_state.client,
+			batch_size=st.session_state.get("repair_grpc_batch", REPAIR_GRPC_BATCH)
+		)
+		if groups:
+			targeted_cursor(stats, diff_stats, stats["next_index"] - checkpoint_start["next_index"])
+		if stats["cancelled"]:
+			if job_id:
+				record_batch(job_id, owner, stats, checkpoint_start, "Cancelled.")
+				finish_job(job_id, owner, "cancelled")
+			clear_read_repair_state()
+			st.info("Read repairs cancelled.")
+			return
+		if stats["listing_error"]:
+			st.session_state.repair_logs += f"Stopped after {stats['next_index']} objects: {stats['listing_error']}\n"
+			log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
+			st.error(f"Listing objects failed: {stats['listing_error']}")
+			if job_id:
+				record_batch(job_id, owner, stats, checkpoint_start, stats["stopped"])
+				finish_job(job_id, owner, "failed", stats["listing_error"])
+			clear_read_repair_state()
+			return
+		processed = stats["next_index"] - current_batch_index
+		batch_log = f"[{stats['next_index']}/{stats['total'] if stats['total'] is not None else '?'}] {processed} objects read in {time.perf_counter() - batch_start:.1f}s"
+		if groups:
+			missing = [f"{count} missing on {node}" for node, count in diff_stats["missing"].most_common()]
+			stale = [f"{count} outdated on {node}" for node, count in diff_stats["stale"].most_common()]
+			drift = ", ".join(missing + stale)
+			batch_log += f" ({diff_stats['compared']} compared, {diff_stats['divergent']} divergent" + (f"; {drift}" if drift else "") + ")"
+		batch_log += f", stopped: {stats['stopped']} Continuing in the next batch." if stats["stopped"] else "."
+		for error in stats["error_samples"]:
+			batch_log += f"\n{error}"
+		stats["error_samples"].clear()
+		st.session_state.repair_logs += batch_log + "\n"
+		# Another session took the job over after this one stopped checkpointing (e.g. a long disconnect),
+		# or discarded it: leave it to them
+		if job_id and record_batch(job_id, owner, stats, checkpoint_start, batch_log) is None:
+			log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
+			st.warning(f"Repair job #{job_id} was taken over by another session or discarded, stopped repairing it here.")
+			clear_read_repair_state()
+			return
 
-		all_uuids = st.session_state.all_uuids
-		batch_size = st.session_state.batch_size
-		current_batch_index = st.session_state.current_batch_index
-		total_uuids = len(all_uuids)
-		headers = {"Authorization": f"Bearer {bearer_token}"}
-
-		# Process the current batch.
-		for i in range(current_batch_index, min(current_batch_index + batch_size, total_uuids)):
-			uuid = all_uuids[i]
-			url = f"{base_url}/v1/objects/{selected_collection}/{uuid}"
-			params_single = {"consistency_level": "ALL"}
-			resp_single = requests.get(url, params=params_single, headers=headers)
-			index = i + 1
-
-			if resp_single.status_code == 200:
-				log_entry = f"[Iteration 1] [{index}/{total_uuids}] UUID={uuid}\n"
-				log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
-				print(log_entry)
-			elif resp_single.status_code == 404:
-				log_entry = f"[Iteration 1] [{index}/{total_uuids}] UUID={uuid} => Not found.\n"
-				log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
-				print(log_entry)
-			else:
-				log_entry = f"[Iteration 1] [{index}/{total_uuids}] UUID={uuid} => Error {resp_single.status_code}\n"
-				log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
-				print(log_entry)
-
-			st.session_state.repair_logs += log_entry
-			st.session_state.progress = index / total_uuids
-
-		# Update the current batch index.
-		st.session_state.current_batch_index = min(current_batch_index + batch_size, total_uuids)
+		record("read_repair_batch", time.perf_counter() - batch_start)
 
 		# Update the UI with logs and progress.
 		log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
-		progress_bar.progress(st.session_state.progress)
 
 		# Check if all UUIDs have been processed.
-		if st.session_state.current_batch_index >= total_uuids:
-			st.session_state.repair_logs += "=== Iteration 1 Complete ==="
+		if stats["finished"]:
+			rates = repair_rates(stats)
+			st.session_state.repair_logs += f"=== Iteration 1 Complete: {stats['found']} found, {stats['not_found']} not found, {stats['errors']} errors, {rates['rate']:.1f} reads/s ==="
 			log_container.text_area("Read Repair Logs", st.session_state.repair_logs, height=300)
 			st.success("Read repairs completed!")
+			if job_id:
+				finish_job(job_id, owner, "completed")
 			# Clean up repair state variables.
-			del st.session_state.repair_in_progress
-			del st.session_state.all_uuids
-			del st.session_state.current_batch_index
-			del st.session_state.progress
+			clear_read_repair_state()
+			# Move on to the next worse target, if asked to
+			targets = list(zip(st.session_state.repair_targets["Collection"], st.session_state.repair_targets["Tenant"]))
+			position = targets.index((selected_collection, tenant)) + 1 if (selected_collection, tenant) in targets else len(targets)
+			if st.session_state.get("repair_continue") and position < len(targets):
+				st.session_state.repair_target = targets[position]
+				if start_read_repair(targets[position]):
+					st.rerun()
 		else:
 			# Force a rerun to process the next batch.
-			time.sleep(0.5)
 			st.rerun()
-			
\ No newline at end of file
@@ -1,8 +1,13 @@
+import asyncio
 import pandas as pd
-import requests
 import streamlit as st
+from utils.connection.async_runner import run_async, gather_limited
+from utils.connection.rest_session import rest_get
+from utils.connection.deadlines import DeadlineExceeded, OperationCancelled
+from utils.diagnostics.metrics import instrument
 
 # Get collections count
+@instrument("get_collectios_count")
 def get_collectios_count(client):
 	print("get_collectios_count() called")
 	collections = client.collections.list_all()
@@ -10,8 +15,13 @@ def get_collectios_count(client):
 	return collection_count
 
 # Aggregate collections. Caches the results for 1 hour (Feel free to change).
+# The client_key (pooled client key) keeps cached results of different clusters apart.
+# An optional Deadline stops the aggregation between queries; DeadlineExceeded / OperationCancelled
+# are raised instead of returned so a partial run is never cached.
+# An optional _progress(done, total) callback is called after every collection.
 @st.cache_data(ttl=3600)
-def aggregate_collections(_client):
+@instrument("aggregate_collections")
+def aggregate_collections(_client, client_key=None, _deadline=None, _progress=None):
 	print(f"aggregate_collections() called")
 	try:
 		collections = _client.collections.list_all()
@@ -28,7 +38,11 @@ def aggregate_collections(_client):
 		if collections:
 			# Store the actual number of collections
 			collection_count = len(collections)
-			for collection_name in collections:
+			for index, collection_name in enumerate(collections):
+				if _deadline:
+					_deadline.check()
+				if _progress:
+					_progress(index, collection_count)
 				collection_row = {"Collection": collection_name, "Count": "", "Tenant": "", "Tenant Count": ""}
 				result_data.append(collection_row)
 				collection = _client.collections.get(collection_name)
@@ -42,6 +56,8 @@ def aggregate_collections(_client):
 						collection_tenant_total = 0
 
 						for tenant_name, tenant in tenants.items():
+							if _deadline:
+								_deadline.check()
 							try:
 								tenant_collection = collection.with_tenant(tenant_name)
 								objects_count = tenant_collection.aggregate.over_all(total_count=True).total_count
@@ -72,6 +88,8 @@ def aggregate_collections(_client):
 							})
 						total_objects_regular += objects_count
 
+				except (DeadlineExceeded, OperationCancelled):
+					raise
 				except Exception as e:
 					if "multi-tenancy is not enabled" in str(e):
 						objects_count = collection.aggregate.over_all(total_count=True).total_count
@@ -84,6 +102,8 @@ def aggregate_collections(_client):
 							})
 						total_objects_regular += objects_count
 
+			if _progress:
+				_progress(collection_count, collection_count)
 			result_df = pd.DataFrame(result_data)
 
 			return {
@@ -112,10 +132,155 @@ def aggregate_collections(_client):
 			"empty_tenants_details": []
 		}
 
+	except (DeadlineExceeded, OperationCancelled):
+		raise
 	except Exception as e:
 		return {"error": str(e)}
 
+# Aggregate collections concurrently with the async client. Same result as aggregate_collections,
+# with at most `concurrency` tenant listings / aggregate queries in flight at once.
+# An optional _progress(done, total) callback is called after every count query.
+# Caches the results for 1 hour (Feel free to change).
+@st.cache_data(ttl=3600)
+@instrument("aggregate_collections_async")
+def aggregate_collections_async(_async_client, client_key=None, concurrency=16, _deadline=None, _progress=None):
+	print(f"aggregate_collections_async() called with concurrency: {concurrency}")
+	try:
+		return run_async(_aggregate_collections_async(_async_client, concurrency, _deadline, _progress))
+	except (DeadlineExceeded, OperationCancelled):
+		raise
+	except Exception as e:
+		return {"error": str(e)}
+
+async def _aggregate_collections_async(async_client, concurrency, deadline=None, progress=None):
+	# Every call is bounded by the remaining budget and checks for cancellation before it starts
+	async def bounded(factory):
+		if deadline is None:
+			return await factory()
+		timeout = deadline.timeout()
+		try:
+			return await asyncio.wait_for(factory(), timeout=timeout)
+		except asyncio.TimeoutError:
+			deadline.check()
+			raise
+
+	collections = await bounded(lambda: async_client.collections.list_all())
+	if not collections:
+		return {
+			"collection_count": 0,
+			"total_tenants_count": 0,
+			"empty_collections": 0,
+			"empty_tenants": 0,
+			"total_objects_regular": 0,
+			"total_objects_multitenancy": 0,
+			"total_objects_combined": 0,
+			"result_df": pd.DataFrame(),
+			"empty_collections_list": [],
+			"empty_tenants_details": []
+		}
+
+	collection_names = list(collections)
+
+	counted = 0
+
+	async def count_objects(collection_name, tenant_name=None):
+		nonlocal counted
+		collection = async_client.collections.get(collection_name)
+		if tenant_name:
+			collection = collection.with_tenant(tenant_name)
+		try:
+			result = await bounded(lambda: collection.aggregate.over_all(total_count=True))
+		finally:
+			counted += 1
+			if progress:
+				progress(counted, len(count_jobs))
+		return result.total_count
+
+	def tenants_of(collection_name):
+		return lambda: bounded(lambda: async_client.collections.get(collection_name).tenants.get())
+
+	def count_of(collection_name, tenant_name=None):
+		return lambda: count_objects(collection_name, tenant_name)
+
+	# Step 1: list tenants of every collection concurrently
+	tenant_results = await gather_limited([tenants_of(name) for name in collection_names], concurrency)
+	if deadline:
+		deadline.check()
+
+	# Step 2: count objects of every tenant / non multi-tenant collection concurrently
+	count_jobs = []
+	for collection_name, tenants in zip(collection_names, tenant_results):
+		if isinstance(tenants, Exception):
+			if "multi-tenancy is not enabled" in str(tenants):
+				count_jobs.append((collection_name, None))
+		elif tenants:
+			count_jobs.extend((collection_name, tenant_name) for tenant_name in tenants)
+		else:
+			count_jobs.append((collection_name, None))
+	count_results = await gather_limited([count_of(c, t) for c, t in count_jobs], concurrency)
+	if deadline:
+		deadline.check()
+	counts = dict(zip(count_jobs, count_results))
+
+	# Step 3: assemble the same tables as aggregate_collections
+	total_tenants_count = 0
+	result_data = []
+	empty_collections = 0
+	empty_tenants = 0
+	total_objects_regular = 0
+	total_objects_multitenancy = 0
+	empty_collections_list = []
+	empty_tenants_details = []
+
+	for collection_name, tenants in zip(collection_names, tenant_results):
+		collection_row = {"Collection": collection_name, "Count": "", "Tenant": "", "Tenant Count": ""}
+		result_data.append(collection_row)
+
+		if not isinstance(tenants, Exception) and tenants:
+			total_tenants_count += len(tenants)
+			for tenant_name in tenants:
+				objects_count = counts[(collection_name, tenant_name)]
+				if isinstance(objects_count, Exception):
+					result_data.append({"Collection": "", "Count": "", "Tenant": tenant_name, "Tenant Count": f"ERROR: {objects_count}"})
+					continue
+				total_objects_multitenancy += objects_count
+				if objects_count == 0:
+					empty_tenants += 1
+					empty_tenants_details.append({
+						"Collection": collection_name,
+						"Tenant": tenant_name,
+						"Count": 0
+					})
+				result_data.append({"Collection": "", "Count": "", "Tenant": tenant_name, "Tenant Count": objects_count})
+		elif (collection_name, None) in counts:
+			objects_count = counts[(collection_name, None)]
+			if isinstance(objects_count, Exception):
+				collection_row["Count"] = f"ERROR: {objects_count}"
+				continue
+			collection_row["Count"] = objects_count
+			if objects_count == 0:
+				empty_collections += 1
+				empty_collections_list.append({
+					"Collection": collection_name,
+					"Count": 0
+				})
+			total_objects_regular += objects_count
+
+	return {
+		"collection_count": len(collection_names),
+		"total_tenants_count": total_tenants_count,
+		"empty_collections": empty_collections,
+		"empty_tenants": empty_tenants,
+		"total_objects_regular": total_objects_regular,
+		"total_objects_multitenancy": total_objects_multitenancy,
+		"total_objects_combined": total_objects_regular + total_objects_multitenancy,
+		"result_df": pd.DataFrame(result_data),
+		"empty_collections_list": empty_collections_list,
+		"empty_tenants_details": empty_tenants_details
+	}
+
 # Get the schema of the Weaviate instance.
+@instrument("get_schema")
 def get_schema(client):
 	print("get_schema() called")
 	try:
@@ -125,6 +290,7 @@ def get_schema(client):
 		return {"error": f"Error retrieving schema: {str(e)}"}
 
 # List all collections in the Weaviate instance.
+@instrument("list_collections")
 def list_collections(client):
 	print("list_collections() called")
 	try:
@@ -134,11 +300,10 @@ def list_collections(client):
 		return {"error": f"Error retrieving collections: {str(e)}"}
 
 # Get the configuration of a collection from the Weaviate instance.
+@instrument("fetch_collection_config")
 def fetch_collection_config(cluster_url, api_key, collection_name):
 	print(f"fetch_collection_config() called for collection: {collection_name}")
-	headers = {"Authorization": f"Bearer {api_key}"}
-	endpoint = f"{cluster_url}/v1/schema/"
-	response = requests.get(endpoint, headers=headers)
+	response = rest_get(cluster_url, api_key, "/v1/schema/")
 
 	if response.status_code == 200:
 		schema = response.json().get("classes", [])
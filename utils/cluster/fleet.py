@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+import pandas as pd
+from utils.cluster.cluster_operations import fetch_cluster_statistics, process_statistics, get_shards_info, process_shards_data
+from utils.connection.weaviate_connection import acquire_weaviate_client, release_weaviate_client, weaviate_client_in_use
+from utils.connection.metadata_cache import get_cluster_metadata
+from utils.connection.deadlines import Deadline, OPERATION_DEADLINES
+from utils.connection.rest_session import normalize_endpoint
+from utils.diagnostics.metrics import instrument
+
+# Shared worker pool for fleet collection. It is module level so a slow cluster that outlives its
+# deadline finishes in the background instead of blocking the page, see collect_cluster().
+FLEET_MAX_WORKERS = 32
+_fleet_executor = ThreadPoolExecutor(max_workers=FLEET_MAX_WORKERS, thread_name_prefix="fleet")
+
+# Parse the fleet definition, one "endpoint, api_key" per line. Lines starting with # are ignored.
+def parse_fleet(text):
+	print("parse_fleet() called")
+	clusters = []
+	for line in text.splitlines():
+		line = line.strip()
+		if not line or line.startswith("#"):
+			continue
+		endpoint, _, api_key = line.partition(",")
+		clusters.append({"endpoint": normalize_endpoint(endpoint), "api_key": api_key.strip()})
+	return clusters
+
+# Connection arguments for an endpoint: URLs with an explicit port or plain http are custom
+# deployments (gRPC on the same host, port 50051), everything else is a Weaviate Cloud cluster.
+def fleet_connection_args(endpoint, api_key):
+	parsed = urlparse(endpoint)
+	if parsed.port or parsed.scheme == "http":
+		secure = parsed.scheme == "https"
+		return {
+			"use_custom": True,
+			"http_host_endpoint": parsed.hostname,
+			"http_port_endpoint": parsed.port or (443 if secure else 80),
+			"grpc_host_endpoint": parsed.hostname,
+			"grpc_port_endpoint": 50051,
+			"custom_secure": secure,
+			"cluster_api_key": api_key,
+		}
+	return {"cluster_endpoint": endpoint, "cluster_api_key": api_key}
+
+# Collect nodes, Raft statistics and metadata of one cluster. The pool connects outside its lock, so a
+# slow or unreachable cluster only delays its own worker, not the acquire of the other clusters. The
+# per-cluster deadline (seconds) bounds the worker too: the fleet client connects and queries with it as
+# its timeout, the REST call gets what is left of it, and no call starts once it expired. A hung cluster
+# then frees its worker shortly after the page stopped waiting for it.
+@instrument("collect_cluster")
+def collect_cluster(endpoint, api_key, deadline=None):
+	print(f"collect_cluster() called for: {endpoint}")
+	start = time.monotonic()
+	deadline = Deadline("nodes", seconds=deadline)
+	client_key, client = acquire_weaviate_client(query_timeout=deadline.seconds, **fleet_connection_args(endpoint, api_key))
+	try:
+		with weaviate_client_in_use(client_key):
+			deadline.check()
+			node_info = get_shards_info(client)
+			stats = fetch_cluster_statistics(endpoint, api_key, timeout=deadline.timeout(OPERATION_DEADLINES["rest"]))
+			deadline.check()
+			meta = get_cluster_metadata(client, client_key, node_info)
+	finally:
+		release_weaviate_client(client_key)
+	return {
+		"node_info": node_info,
+		"stats": stats,
+		"meta": meta,
+		"elapsed": time.monotonic() - start,
+	}
+
+# Collect all clusters concurrently. Clusters that fail or miss the deadline are reported with their
+# status and left out of the combined tables, the others are returned as partial results.
+def collect_fleet(clusters, deadline=30):
+	print(f"collect_fleet() called for {len(clusters)} clusters with deadline: {deadline}s")
+	futures = {
+		_fleet_executor.submit(collect_cluster, cluster["endpoint"], cluster["api_key"], deadline): cluster["endpoint"]
+		for cluster in clusters
+	}
+	done, _ = wait(futures, timeout=deadline)
+
+	results = {}
+	for future, endpoint in futures.items():
+		if future not in done:
+			future.cancel()
+			results[endpoint] = {"status": f"Timeout after {deadline}s"}
+		elif future.exception() is not None:
+			results[endpoint] = {"status": f"Error: {future.exception()}"}
+		else:
+			results[endpoint] = {"status": "OK", **future.result()}
+	return results
+
+# Build the combined node / shard / sync tables from collect_fleet results
+def process_fleet(results):
+	print("process_fleet() called")
+	summary = []
+	node_frames = []
+	shard_frames = []
+	stats_frames = []
+
+	for endpoint, result in results.items():
+		row = {
+			"Cluster": endpoint,
+			"Status": result["status"],
+			"Version": "N/A",
+			"Nodes": "N/A",
+			"Shards": "N/A",
+			"Objects": "N/A",
+			"Synchronized": "N/A",
+			"Collect Time (s)": round(result["elapsed"], 2) if "elapsed" in result else "N/A",
+		}
+
+		if result["status"] == "OK":
+			row["Version"] = result["meta"].get("version", "N/A")
+
+			processed = process_shards_data(result["node_info"])
+			if not processed["node_data"].empty:
+				row["Nodes"] = len(processed["node_data"])
+				row["Objects"] = int(processed["node_data"]["Object Count (Stats)"].sum())
+				node_frames.append(processed["node_data"].assign(Cluster=endpoint))
+			if not processed["shard_data"].empty:
+				row["Shards"] = len(processed["shard_data"])
+				shard_frames.append(processed["shard_data"].assign(Cluster=endpoint))
+
+			stats = result["stats"]
+			if "error" in stats:
+				row["Synchronized"] = stats["error"]
+			else:
+				processed_stats = process_statistics(stats)
+				if "error" not in processed_stats:
+					row["Synchronized"] = processed_stats["synchronized"]
+					stats_frames.append(processed_stats["data"].assign(Cluster=endpoint))
+
+		summary.append(row)
+
+	def combine(frames):
+		if not frames:
+			return pd.DataFrame()
+		df = pd.concat(frames, ignore_index=True)
+		return df[["Cluster"] + [column for column in df.columns if column != "Cluster"]]
+
+	return {
+		"summary": pd.DataFrame(summary),
+		"node_data": combine(node_frames),
+		"shard_data": combine(shard_frames),
+		"statistics": combine(stats_frames),
+	}
@@ -0,0 +1,101 @@
+import math
+import os
+from collections import deque
+import pandas as pd
+
+# Number of samples per shard the rates are computed over (the first and last sample of the window).
+# Feel free to change it through the environment variable.
+INDEXING_WINDOW = int(os.environ.get("WEAVIATE_INDEXING_WINDOW", 12))
+
+SHARD_KEY = ["Node Name", "Class", "Shard Name"]
+
+# Empty tracker state, fed by record_indexing_sample() on every poll of the shard monitor
+def new_indexing_tracker(window=INDEXING_WINDOW):
+	return {"window": window, "samples": {}}
+
+# Record object counts and vector queue lengths of one poll. rows are shard_rows() results keyed by
+# (node, collection, shard). Only shards that have or recently had a vector queue are tracked, so idle
+# shards of large clusters cost nothing; a shard is dropped once its queue stayed empty for a full window.
+def record_indexing_sample(tracker, rows, sampled_at):
+	samples = tracker["samples"]
+	for key, row in rows.items():
+		queue_length = row[2] or 0
+		series = samples.get(key)
+		if series is None:
+			if not queue_length:
+				continue
+			series = samples[key] = deque(maxlen=tracker["window"])
+		series.append((sampled_at, row[0] or 0, queue_length))
+	for key in list(samples):
+		series = samples[key]
+		if key not in rows or (len(series) == series.maxlen and not any(queue_length for _, _, queue_length in series)):
+			del samples[key]
+
+# Seconds until an empty queue at the drain rate, None while the queue does not shrink
+def _eta(queue_length, drain_rate):
+	if not queue_length:
+		return 0.0
+	if drain_rate <= 0:
+		return None
+	return queue_length / drain_rate
+
+# Rates per tracked shard over its sample window:
+#   Import Rate: new objects per second (each new object adds its vectors to the queue)
+#   Indexing Rate: vectors indexed per second, new objects minus queue growth. Approximate for collections
+#     with several named vectors, where one object queues more than one vector.
+#   Drain Rate: how fast the queue shrinks (negative while it grows), and the ETA to an empty queue from it
+def indexing_rates(tracker):
+	rows = []
+	for key, series in tracker["samples"].items():
+		if len(series) < 2:
+			continue
+		(first_time, first_objects, first_queue), (last_time, last_objects, last_queue) = series[0], series[-1]
+		elapsed = last_time - first_time
+		if elapsed <= 0:
+			continue
+		import_rate = max(last_objects - first_objects, 0) / elapsed
+		drain_rate = (first_queue - last_queue) / elapsed
+		rows.append({
+			"Node Name": key[0],
+			"Class": key[1],
+			"Shard Name": key[2],
+			"Vector Queue Length": last_queue,
+			"Import Rate": import_rate,
+			"Indexing Rate": max(import_rate + drain_rate, 0.0),
+			"Drain Rate": drain_rate,
+			"ETA (s)": _eta(last_queue, drain_rate),
+			"Window (s)": elapsed,
+		})
+	columns = SHARD_KEY + ["Vector Queue Length", "Import Rate", "Indexing Rate", "Drain Rate", "ETA (s)", "Window (s)"]
+	df = pd.DataFrame(rows, columns=columns)
+	return df.sort_values("ETA (s)", ascending=False, na_position="first", kind="stable").reset_index(drop=True)
+
+# Rates summed per node or collection (by="Node Name" / "Class"), slowest first. Shards of a node share its
+# indexing workers, so the node's ETA is its whole queue over its whole drain rate. Slowest Shard ETA is the
+# time until every shard of the group is searchable.
+def summarize_indexing(df_rates, by):
+	if df_rates.empty:
+		return pd.DataFrame()
+	df = df_rates.groupby(by, sort=False).agg(**{
+		"Shards": ("Shard Name", "size"),
+		"Vector Queue Length": ("Vector Queue Length", "sum"),
+		"Import Rate": ("Import Rate", "sum"),
+		"Indexing Rate": ("Indexing Rate", "sum"),
+		"Drain Rate": ("Drain Rate", "sum"),
+	}).reset_index()
+	df["ETA (s)"] = [_eta(queue_length, drain_rate) for queue_length, drain_rate in zip(df["Vector Queue Length"], df["Drain Rate"])]
+	# A shard that never drains makes its whole group wait
+	slowest = df_rates.assign(**{"ETA (s)": df_rates["ETA (s)"].fillna(math.inf)}).groupby(by, sort=False)["ETA (s)"].max()
+	df["Slowest Shard ETA (s)"] = df[by].map(slowest).replace(math.inf, None)
+	return df.sort_values("ETA (s)", ascending=False, na_position="first", kind="stable").reset_index(drop=True)
+
+# Human readable duration, e.g. "45s" / "12m 5s" / "3h 20m"
+def format_duration(seconds):
+	if seconds is None or (isinstance(seconds, float) and math.isnan(seconds)):
+		return "not draining"
+	seconds = int(round(seconds))
+	if seconds < 60:
+		return f"{seconds}s"
+	if seconds < 3600:
+		return f"{seconds // 60}m {seconds % 60}s"
+	return f"{seconds // 3600}h {seconds % 3600 // 60}m"
@@ -0,0 +1,172 @@
+import os
+import time
+from collections import deque
+import pandas as pd
+from utils.cluster.cluster_operations import fetch_cluster_statistics
+
+# Seconds between polls of /v1/cluster/statistics and the number of samples kept per node. Feel free to
+# change them through the environment variables.
+RAFT_WATCH_INTERVAL = float(os.environ.get("WEAVIATE_RAFT_WATCH_INTERVAL", 5))
+RAFT_WATCH_HISTORY = int(os.environ.get("WEAVIATE_RAFT_WATCH_HISTORY", 720))
+# A node is lagging once it is this many log entries behind the leader, or has this many entries pending
+# in its FSM. Feel free to change it through the environment variable.
+RAFT_LAG_THRESHOLD = int(os.environ.get("WEAVIATE_RAFT_LAG_THRESHOLD", 50))
+# A node is falling behind when its lag grew over this many consecutive samples
+RAFT_TREND_SAMPLES = 4
+# Number of leader change events kept
+RAFT_LEADER_CHANGES = 100
+
+LAG_FIELDS = ["Commit Index", "Applied Index", "Last Log Index", "FSM Pending", "Apply Lag", "Commit Lag", "Log Lag", "Leader Lag"]
+
+def _to_int(value):
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		return None
+
+def _difference(left, right):
+	if left is None or right is None:
+		return None
+	return max(left - right, 0)
+
+# Leader of a statistics payload: the node in the Leader state, else the leader most nodes report
+def find_leader(statistics):
+	for node in statistics:
+		if node.get("raft", {}).get("state") == "Leader":
+			return node.get("name")
+	reported = [node.get("leaderId") for node in statistics if node.get("leaderId")]
+	return max(set(reported), key=reported.count) if reported else None
+
+# Per node Raft indexes and lags of one statistics payload. Lags are in log entries:
+#   Apply Lag: own commit index - own applied index (committed but not applied to the FSM yet)
+#   Commit Lag: leader commit index - own commit index
+#   Log Lag: leader last log index - own last log index (entries not replicated to the node yet)
+#   Leader Lag: leader commit index - own applied index, how stale the node's schema is overall
+def raft_lag_rows(stats):
+	statistics = stats.get("statistics", [])
+	leader = find_leader(statistics)
+	leader_raft = next((node.get("raft", {}) for node in statistics if node.get("name") == leader), {})
+	leader_commit = _to_int(leader_raft.get("commitIndex"))
+	leader_last_log = _to_int(leader_raft.get("lastLogIndex"))
+	rows = {}
+	for node in statistics:
+		raft = node.get("raft", {})
+		commit_index = _to_int(raft.get("commitIndex"))
+		applied_index = _to_int(raft.get("appliedIndex"))
+		last_log_index = _to_int(raft.get("lastLogIndex"))
+		rows[node.get("name", "N/A")] = {
+			"State": raft.get("state", "N/A"),
+			"Term": _to_int(raft.get("term")),
+			"Leader ID": node.get("leaderId", "N/A"),
+			"Last Contact": raft.get("lastContact", "N/A"),
+			"Commit Index": commit_index,
+			"Applied Index": applied_index,
+			"Last Log Index": last_log_index,
+			"FSM Pending": _to_int(raft.get("fsmPending")),
+			"Apply Lag": _difference(commit_index, applied_index),
+			"Commit Lag": _difference(leader_commit, commit_index),
+			"Log Lag": _difference(leader_last_log, last_log_index),
+			"Leader Lag": _difference(leader_commit, applied_index),
+		}
+	return leader, rows
+
+# Empty watcher state for one endpoint, kept in the session
+def new_raft_watcher(endpoint, history=RAFT_WATCH_HISTORY):
+	return {
+		"endpoint": endpoint,
+		"history_size": history,
+		# Per node: (time, row) of every poll
+		"history": {},
+		"leader": None,
+		"term": None,
+		"leader_changes": deque(maxlen=RAFT_LEADER_CHANGES),
+		"synchronized": None,
+		"polled_at": None,
+		"polls": 0,
+		"error": None,
+	}
+
+# Apply one statistics payload to the watcher. A leader change is recorded when the leader or the term
+# differs from the previous poll.
+def apply_statistics(watcher, stats, polled_at=None):
+	polled_at = polled_at if polled_at is not None else time.time()
+	leader, rows = raft_lag_rows(stats)
+	term = max((row["Term"] for row in rows.values() if row["Term"] is not None), default=None)
+	if watcher["polls"] and (leader != watcher["leader"] or term != watcher["term"]):
+		watcher["leader_changes"].append({"Time": polled_at, "Old Leader": watcher["leader"], "New Leader": leader, "Old Term": watcher["term"], "New Term": term})
+	for name, row in rows.items():
+		samples = watcher["history"].get(name)
+		if samples is None:
+			samples = watcher["history"][name] = deque(maxlen=watcher["history_size"])
+		samples.append((polled_at, row))
+	# Nodes that left the cluster keep no history
+	for name in [name for name in watcher["history"] if name not in rows]:
+		del watcher["history"][name]
+	watcher["leader"] = leader
+	watcher["term"] = term
+	watcher["synchronized"] = stats.get("synchronized", False)
+	watcher["polled_at"] = polled_at
+	watcher["polls"] += 1
+	watcher["error"] = None
+	return rows
+
+# Poll /v1/cluster/statistics once and apply the result. Never raises, failures are kept in "error" and
+# the previous data stays in place.
+def poll_raft_watcher(watcher, cluster_url, api_key):
+	print("poll_raft_watcher() called")
+	stats = fetch_cluster_statistics(cluster_url, api_key)
+	if "error" in stats:
+		watcher["error"] = stats["error"]
+		return None
+	if "statistics" not in stats:
+		watcher["error"] = "Invalid statistics data received."
+		return None
+	return apply_statistics(watcher, stats)
+
+# True when the Leader Lag grew over each of the last `samples` polls
+def _falling_behind(samples, count=RAFT_TREND_SAMPLES):
+	lags = [row["Leader Lag"] for _, row in list(samples)[-(count + 1):]]
+	if len(lags) <= count or None in lags:
+		return False
+	return all(later > earlier for earlier, later in zip(lags, lags[1:]))
+
+# Latest row of every node with its lag trend, lagging nodes first. Lag Rate is the change of the Leader
+# Lag in entries per second over the kept history; Health is "lagging" above the threshold, "falling behind"
+# when the lag keeps growing, else "ok".
+def raft_lag_status(watcher, threshold=RAFT_LAG_THRESHOLD):
+	rows = []
+	for name, samples in watcher["history"].items():
+		polled_at, row = samples[-1]
+		first_at, first_row = samples[0]
+		lag_rate = None
+		if polled_at > first_at and row["Leader Lag"] is not None and first_row["Leader Lag"] is not None:
+			lag_rate = (row["Leader Lag"] - first_row["Leader Lag"]) / (polled_at - first_at)
+		if max(row["Leader Lag"] or 0, row["Log Lag"] or 0, row["FSM Pending"] or 0) >= threshold:
+			health = "lagging"
+		elif _falling_behind(samples):
+			health = "falling behind"
+		else:
+			health = "ok"
+		rows.append({"Node Name": name, "Health": health, **row, "Lag Rate": lag_rate})
+	df = pd.DataFrame(rows)
+	if df.empty:
+		return df
+	df["_order"] = df["Health"].map({"lagging": 0, "falling behind": 1, "ok": 2})
+	return df.sort_values(["_order", "Leader Lag"], ascending=[True, False], kind="stable").drop(columns="_order").reset_index(drop=True)
+
+# Time series of one field (e.g. "Leader Lag", "FSM Pending") with one column per node
+def raft_field_history(watcher, field):
+	series = {
+		name: pd.Series([row[field] for _, row in samples], index=pd.to_datetime([polled_at for polled_at, _ in samples], unit="s"), dtype="float")
+		for name, samples in watcher["history"].items()
+	}
+	if not series:
+		return pd.DataFrame()
+	return pd.DataFrame(series)
+
+def leader_changes(watcher):
+	if not watcher["leader_changes"]:
+		return pd.DataFrame()
+	df = pd.DataFrame(list(watcher["leader_changes"])[::-1])
+	df["Time"] = pd.to_datetime(df["Time"], unit="s")
+	return df
@@ -0,0 +1,229 @@
+import os
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from weaviate.classes.config import ConsistencyLevel
+from weaviate.classes.query import Filter
+from utils.cluster.cluster_operations import read_object_consistent
+from utils.connection.deadlines import DeadlineExceeded, OperationCancelled, OPERATION_DEADLINES
+from utils.connection.rest_session import REST_POOL_MAXSIZE, REST_TIMEOUT
+from utils.diagnostics.metrics import instrument
+
+# Object reads in flight at once, and the most reads started per second (0 = no limit). Keep the
+# concurrency at or below WEAVIATE_REST_POOL_MAXSIZE, reads above it open connections that are not reused.
+# Feel free to change them through the environment variables.
+REPAIR_CONCURRENCY = int(os.environ.get("WEAVIATE_REPAIR_CONCURRENCY", 16))
+REPAIR_RATE_LIMIT = float(os.environ.get("WEAVIATE_REPAIR_RATE_LIMIT", 0))
+# "rest" reads one object per request, "grpc" reads WEAVIATE_REPAIR_GRPC_BATCH objects per query by their
+# IDs. Feel free to change them through the environment variables.
+REPAIR_MODES = {"rest": "REST (one object per request)", "grpc": "gRPC (batches of objects)"}
+REPAIR_MODE = os.environ.get("WEAVIATE_REPAIR_MODE", "rest")
+REPAIR_GRPC_BATCH = int(os.environ.get("WEAVIATE_REPAIR_GRPC_BATCH", 200))
+# UUIDs listed per page while repairing
+REPAIR_LIST_PAGE = 1000
+# Number of recent errors kept for display
+REPAIR_ERROR_SAMPLES = 20
+
+# Counters of a repair run over `total` objects (None if unknown, e.g. while the UUIDs are still listed).
+# "next_index" objects are read in order without gaps, "cursor" is the last of them: a later run resumes
+# listing after it.
+def new_repair_stats(total=None):
+	return {
+		"total": total,
+		"done": 0,
+		"found": 0,
+		"not_found": 0,
+		"errors": 0,
+		"error_samples": deque(maxlen=REPAIR_ERROR_SAMPLES),
+		"started_at": time.monotonic(),
+		"elapsed": 0.0,
+		"next_index": 0,
+		"cursor": None,
+		"finished": False,
+		"stopped": None,
+		"cancelled": False,
+		"listing_error": None,
+	}
+
+# Throughput (reads per second), error rate and the estimated seconds left of a repair run
+def repair_rates(stats):
+	elapsed = stats["elapsed"]
+	rate = stats["done"] / elapsed if elapsed > 0 else 0.0
+	remaining = max(stats["total"] - stats["next_index"], 0) if stats["total"] is not None else None
+	return {
+		"rate": rate,
+		"error_rate": stats["errors"] / stats["done"] if stats["done"] else 0.0,
+		"eta": remaining / rate if rate > 0 and remaining is not None else None,
+	}
+
+# Results of a work unit are (uuid, status code, error) per object: 200 found, 404 not found, else an error
+def _read_one(cluster_url, api_key, collection_name, uuid, tenant, timeout):
+	try:
+		response = read_object_consistent(cluster_url, api_key, collection_name, uuid, timeout=timeout, tenant=tenant)
+	except Exception as e:
+		return [(uuid, None, str(e))]
+	if response.status_code in (200, 404):
+		return [(uuid, response.status_code, None)]
+	return [(uuid, response.status_code, f"{response.status_code}: {response.text[:200]}")]
+
+# One gRPC query for a batch of objects by their IDs at consistency level ALL. Objects missing from the
+# result do not exist. A failed query fails the whole batch.
+def _read_batch(collection, uuids):
+	try:
+		response = collection.query.fetch_objects(filters=Filter.by_id().contains_any(uuids), limit=len(uuids), return_properties=[])
+	except Exception as e:
+		return [(uuid, None, str(e)) for uuid in uuids]
+	found = {str(obj.uuid) for obj in response.objects}
+	return [(uuid, 200 if str(uuid) in found else 404, None) for uuid in uuids]
+
+def _count(stats, results):
+	errors = []
+	for uuid, status_code, error in results:
+		stats["done"] += 1
+		if status_code == 200:
+			stats["found"] += 1
+		elif status_code == 404:
+			stats["not_found"] += 1
+		else:
+			stats["errors"] += 1
+			errors.append((uuid, error))
+	# A failed batch reports its error once
+	if len(errors) > 1 and len({error for _, error in errors}) == 1:
+		stats["error_samples"].append(f"{len(errors)} objects from UUID={errors[0][0]} => {errors[0][1]}")
+	else:
+		stats["error_samples"].extend(f"UUID={uuid} => {error}" for uuid, error in errors)
+
+# Read the objects of `uuids` with consistency level ALL, which makes Weaviate repair replicas that miss
+# them or hold outdated copies. `uuids` can be a list or any iterable, e.g. iter_uuids() over a cursor
+# listing, which is then consumed while the reads run instead of being listed in full first. In "rest"
+# mode every object is one request, in "grpc" mode (needs the client) a query reads batch_size objects at
+# once. At most `concurrency` requests run at once on a worker pool sharing the pooled REST session or the
+# client's gRPC channel, and with a rate limit the objects are read evenly spaced at that many per second.
+#
+# The deadline (optional) bounds the run: once it expires or is cancelled no new request is started and
+# the run returns without waiting for the requests still in flight. A failing listing stops the run the same way. Everything
+# up to stats["cursor"] was read, a later run can list after it and pass the same stats to continue.
+# poll(stats) is called from the calling thread about every poll_interval seconds, e.g. to update
+# Streamlit elements.
+@instrument("repair_objects")
+def repair_objects(cluster_url, api_key, collection_name, uuids, tenant=None, concurrency=REPAIR_CONCURRENCY, rate_limit=REPAIR_RATE_LIMIT, deadline=None, poll=None, poll_interval=0.25, stats=None, mode=REPAIR_MODE, client=None, batch_size=REPAIR_GRPC_BATCH):
+	print(f"repair_objects() called for {collection_name} in {mode} mode with concurrency: {concurrency}, rate limit: {rate_limit or 'none'}")
+	if mode not in REPAIR_MODES:
+		raise ValueError(f"Unknown repair mode: {mode}")
+	concurrency = max(int(concurrency), 1)
+	if mode == "rest" and concurrency > REST_POOL_MAXSIZE:
+		print(f"Concurrency {concurrency} is above the REST pool size {REST_POOL_MAXSIZE}, connections above it are not reused")
+	if mode == "grpc":
+		if client is None:
+			raise ValueError("The gRPC repair mode needs a client")
+		collection = client.collections.get(collection_name).with_consistency_level(ConsistencyLevel.ALL)
+		if tenant:
+			collection = collection.with_tenant(tenant)
+	step = max(int(batch_size), 1) if mode == "grpc" else 1
+	if stats is None:
+		stats = new_repair_stats(len(uuids) if isinstance(uuids, (list, tuple)) else None)
+	# Stats carried over from an earlier run keep their counters, not its stop reason
+	stats["stopped"] = None
+	stats["cancelled"] = False
+	stats["listing_error"] = None
+	run_started_at = time.monotonic()
+	elapsed_before = stats["elapsed"]
+	next_slot = time.monotonic()
+	next_poll = time.monotonic() + poll_interval
+	remaining = iter(uuids)
+	exhausted = False
+	# Future -> (sequence number, objects, last UUID) of its unit. Units finishing out of order wait in
+	# `finished` with their results until every earlier unit is done, so the cursor never skips an unread
+	# object.
+	in_flight = {}
+	finished = {}
+	sequence = next_sequence = 0
+
+	def next_unit():
+		try:
+			return list(islice(remaining, step))
+		except (DeadlineExceeded, OperationCancelled) as e:
+			stats["cancelled"] = isinstance(e, OperationCancelled)
+			stats["stopped"] = str(e)
+		except Exception as e:
+			stats["listing_error"] = str(e)
+			stats["stopped"] = f"Listing objects failed: {e}"
+		return None
+
+	# Units still running once the deadline expired or the run was cancelled are abandoned: a gRPC query
+	# has no per-call timeout and could hold up the run (and the Streamlit rerun) well past the deadline.
+	# Their objects are after the cursor, the next run reads them again.
+	abandoned = False
+	executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="read-repair")
+	try:
+		while True:
+			# Start requests while there is room, the rate limit allows it and the deadline holds
+			while stats["stopped"] is None and not exhausted and len(in_flight) < concurrency and time.monotonic() >= next_slot:
+				try:
+					timeout = deadline.timeout(OPERATION_DEADLINES["rest"]) if deadline else REST_TIMEOUT
+				except (DeadlineExceeded, OperationCancelled) as e:
+					stats["stopped"] = str(e)
+					stats["cancelled"] = isinstance(e, OperationCancelled)
+					break
+				unit = next_unit()
+				if not unit:
+					exhausted = unit is not None
+					break
+				if mode == "grpc":
+					future = executor.submit(_read_batch, collection, unit)
+				else:
+					future = executor.submit(_read_one, cluster_url, api_key, collection_name, unit[0], tenant, timeout)
+				in_flight[future] = (sequence, len(unit), unit[-1])
+				sequence += 1
+				if rate_limit:
+					interval = len(unit) / rate_limit
+					next_slot = max(next_slot, time.monotonic() - interval) + interval
+
+			if not in_flight and (stats["stopped"] is not None or exhausted):
+				break
+
+			wait_for = max(next_poll - time.monotonic(), 0.0)
+			if rate_limit and stats["stopped"] is None and not exhausted and len(in_flight) < concurrency:
+				wait_for = min(wait_for, max(next_slot - time.monotonic(), 0.0))
+			if deadline:
+				wait_for = min(wait_for, deadline.remaining())
+			if in_flight:
+				done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+				for future in done:
+					unit_sequence, count, last_uuid = in_flight.pop(future)
+					finished[unit_sequence] = (count, last_uuid, future.result())
+				# Results are counted in order, so a unit abandoned at the deadline leaves no later unit counted
+				# that the next run reads again
+				while next_sequence in finished:
+					count, stats["cursor"], results = finished.pop(next_sequence)
+					_count(stats, results)
+					stats["next_index"] += count
+					next_sequence += 1
+				if in_flight and deadline and (deadline.expired() or deadline.cancelled()):
+					if stats["stopped"] is None:
+						try:
+							deadline.check()
+						except (DeadlineExceeded, OperationCancelled) as e:
+							stats["stopped"] = str(e)
+							stats["cancelled"] = isinstance(e, OperationCancelled)
+					abandoned = True
+					break
+			else:
+				time.sleep(wait_for)
+
+			stats["elapsed"] = elapsed_before + time.monotonic() - run_started_at
+			if poll and time.monotonic() >= next_poll:
+				poll(stats)
+				next_poll = time.monotonic() + poll_interval
+	finally:
+		executor.shutdown(wait=not abandoned, cancel_futures=True)
+
+	stats["finished"] = exhausted and stats["stopped"] is None
+	# The total may have been an estimate
+	if stats["finished"]:
+		stats["total"] = stats["next_index"]
+	stats["elapsed"] = elapsed_before + time.monotonic() - run_started_at
+	if poll:
+		poll(stats)
+	return stats
@@ -0,0 +1,266 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+import pandas as pd
+from utils.cluster.read_repair import new_repair_stats
+
+# SQLite file the read repair jobs and their checkpoints are kept in, so a repair survives a browser refresh,
+# a restart or a disconnect. Feel free to change it through the environment variables.
+REPAIR_CHECKPOINT_DB = os.environ.get("WEAVIATE_REPAIR_DB", "repair_checkpoints.db")
+# Seconds between checkpoints while a batch runs, on top of the one at the end of every batch
+REPAIR_CHECKPOINT_INTERVAL = float(os.environ.get("WEAVIATE_REPAIR_CHECKPOINT_INTERVAL", 10))
+# Seconds without a checkpoint after which a running job counts as interrupted. Its owner checkpoints at
+# least every REPAIR_CHECKPOINT_INTERVAL seconds while it works on it.
+REPAIR_STALE_AFTER = float(os.environ.get("WEAVIATE_REPAIR_STALE_AFTER", 3 * REPAIR_CHECKPOINT_INTERVAL))
+
+# Job states. A "running" job belongs to the session or process holding its owner token, and checkpoints
+# (updated_at) are its heartbeat. It was interrupted and can be resumed once its owner released it or
+# stopped checkpointing for REPAIR_STALE_AFTER seconds.
+RESUMABLE_STATUS = "running"
+FINAL_STATUSES = ("completed", "cancelled", "failed", "abandoned")
+
+# Counters of the repair stats that are checkpointed with the cursor
+STATS_COLUMNS = ["total", "done", "found", "not_found", "errors", "elapsed", "next_index", "cursor"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repair_jobs (
+	id INTEGER PRIMARY KEY AUTOINCREMENT,
+	endpoint TEXT NOT NULL,
+	collection TEXT NOT NULL,
+	tenant TEXT,
+	mode TEXT,
+	groups TEXT,
+	status TEXT NOT NULL,
+	owner TEXT,
+	error TEXT,
+	total INTEGER,
+	done INTEGER NOT NULL DEFAULT 0,
+	found INTEGER NOT NULL DEFAULT 0,
+	not_found INTEGER NOT NULL DEFAULT 0,
+	errors INTEGER NOT NULL DEFAULT 0,
+	elapsed REAL NOT NULL DEFAULT 0,
+	next_index INTEGER NOT NULL DEFAULT 0,
+	cursor TEXT,
+	created_at REAL NOT NULL,
+	updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS repair_jobs_target ON repair_jobs (endpoint, collection, tenant, status);
+CREATE TABLE IF NOT EXISTS repair_batches (
+	job_id INTEGER NOT NULL REFERENCES repair_jobs (id),
+	batch INTEGER NOT NULL,
+	started_at REAL NOT NULL,
+	finished_at REAL NOT NULL,
+	start_index INTEGER NOT NULL,
+	end_index INTEGER NOT NULL,
+	cursor TEXT,
+	found INTEGER NOT NULL,
+	not_found INTEGER NOT NULL,
+	errors INTEGER NOT NULL,
+	stopped TEXT,
+	log TEXT,
+	PRIMARY KEY (job_id, batch)
+);
+"""
+
+# A connection per call: checkpoints are written from the Streamlit script thread or the CLI, a few times
+# a minute, and WAL mode lets a page list jobs while another session writes
+def _connect(path):
+	directory = os.path.dirname(path)
+	if directory:
+		os.makedirs(directory, exist_ok=True)
+	conn = sqlite3.connect(path, timeout=30)
+	conn.row_factory = sqlite3.Row
+	conn.execute("PRAGMA journal_mode=WAL")
+	conn.executescript(SCHEMA)
+	# Files written before jobs had owners
+	if "owner" not in {row["name"] for row in conn.execute("PRAGMA table_info(repair_jobs)")}:
+		try:
+			conn.execute("ALTER TABLE repair_jobs ADD COLUMN owner TEXT")
+		except sqlite3.OperationalError as e:
+			if "duplicate column" not in str(e):
+				raise
+	return conn
+
+# Condition and parameters matching the interrupted jobs, see RESUMABLE_STATUS
+def _interrupted():
+	return "status = ? AND (owner IS NULL OR updated_at < ?)", (RESUMABLE_STATUS, time.time() - REPAIR_STALE_AFTER)
+
+# Token identifying the session or process working on a job
+def new_owner():
+	return uuid.uuid4().hex
+
+def _job(row):
+	if row is None:
+		return None
+	job = dict(row)
+	job["groups"] = json.loads(job["groups"]) if job["groups"] else None
+	return job
+
+# Record a new repair job of a target owned by `owner` and return its id. Interrupted jobs of the same
+# target are abandoned, the new job repairs it from the start. Returns None if another session or process
+# is still repairing the target.
+def create_job(endpoint, collection_name, tenant=None, mode=None, groups=None, total=None, owner=None, path=REPAIR_CHECKPOINT_DB):
+	print(f"create_job() called for {collection_name}" + (f" tenant {tenant}" if tenant else ""))
+	now = time.time()
+	interrupted, params = _interrupted()
+	with closing(_connect(path)) as conn, conn:
+		# Check and insert in one write transaction, so two sessions cannot both start the target
+		conn.execute("BEGIN IMMEDIATE")
+		conn.execute(
+			f"UPDATE repair_jobs SET status = 'abandoned', updated_at = ? WHERE endpoint = ? AND collection = ? AND tenant IS ? AND {interrupted}",
+			(now, endpoint, collection_name, tenant) + params,
+		)
+		if conn.execute(
+			"SELECT 1 FROM repair_jobs WHERE endpoint = ? AND collection = ? AND tenant IS ? AND status = ?",
+			(endpoint, collection_name, tenant, RESUMABLE_STATUS),
+		).fetchone():
+			return None
+		cursor = conn.execute(
+			"INSERT INTO repair_jobs (endpoint, collection, tenant, mode, groups, status, owner, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+			(endpoint, collection_name, tenant, mode, json.dumps(groups) if groups else None, RESUMABLE_STATUS, owner, total, now, now),
+		)
+		return cursor.lastrowid
+
+def get_job(job_id, path=REPAIR_CHECKPOINT_DB):
+	with closing(_connect(path)) as conn:
+		return _job(conn.execute("SELECT * FROM repair_jobs WHERE id = ?", (job_id,)).fetchone())
+
+# Latest interrupted job of a target, or None
+def find_resumable_job(endpoint, collection_name, tenant=None, path=REPAIR_CHECKPOINT_DB):
+	interrupted, params = _interrupted()
+	with closing(_connect(path)) as conn:
+		return _job(conn.execute(
+			f"SELECT * FROM repair_jobs WHERE endpoint = ? AND collection = ? AND tenant IS ? AND {interrupted} ORDER BY updated_at DESC LIMIT 1",
+			(endpoint, collection_name, tenant) + params,
+		).fetchone())
+
+# Interrupted jobs of an endpoint, most recently checkpointed first
+def resumable_jobs(endpoint, path=REPAIR_CHECKPOINT_DB):
+	interrupted, params = _interrupted()
+	with closing(_connect(path)) as conn:
+		rows = conn.execute(f"SELECT * FROM repair_jobs WHERE endpoint = ? AND {interrupted} ORDER BY updated_at DESC", (endpoint,) + params).fetchall()
+	return [_job(row) for row in rows]
+
+# Take over an interrupted job (as listed, with its owner) for `owner`. Only one session or process gets
+# it: returns False if it was claimed, discarded or checkpointed by its owner since it was listed.
+def claim_job(job, owner, path=REPAIR_CHECKPOINT_DB):
+	interrupted, params = _interrupted()
+	with closing(_connect(path)) as conn, conn:
+		cursor = conn.execute(
+			f"UPDATE repair_jobs SET owner = ?, updated_at = ? WHERE id = ? AND owner IS ? AND {interrupted}",
+			(owner, time.time(), job["id"], job["owner"]) + params,
+		)
+		return cursor.rowcount == 1
+
+# Abandon an interrupted job (as listed, with its owner). Returns False if it was claimed or checkpointed
+# since it was listed.
+def discard_job(job, path=REPAIR_CHECKPOINT_DB):
+	interrupted, params = _interrupted()
+	with closing(_connect(path)) as conn, conn:
+		cursor = conn.execute(
+			f"UPDATE repair_jobs SET status = 'abandoned', updated_at = ? WHERE id = ? AND owner IS ? AND {interrupted}",
+			(time.time(), job["id"], job["owner"]) + params,
+		)
+		return cursor.rowcount == 1
+
+# Give up a running job without finishing it (e.g. on Ctrl-C): it is interrupted at once, without waiting
+# REPAIR_STALE_AFTER seconds
+def release_job(job_id, owner, path=REPAIR_CHECKPOINT_DB):
+	with closing(_connect(path)) as conn, conn:
+		conn.execute("UPDATE repair_jobs SET owner = NULL WHERE id = ? AND owner = ? AND status = ?", (job_id, owner, RESUMABLE_STATUS))
+
+# Jobs as a table, of one endpoint if given, most recent first
+def list_jobs(endpoint=None, limit=100, path=REPAIR_CHECKPOINT_DB):
+	query = "SELECT id, endpoint, collection, tenant, mode, status, next_index, total, found, not_found, errors, elapsed, cursor, error, created_at, updated_at FROM repair_jobs"
+	params = ()
+	if endpoint:
+		query += " WHERE endpoint = ?"
+		params = (endpoint,)
+	with closing(_connect(path)) as conn:
+		df = pd.read_sql_query(query + " ORDER BY updated_at DESC LIMIT ?", conn, params=params + (limit,))
+	for column in ("created_at", "updated_at"):
+		df[column] = pd.to_datetime(df[column], unit="s")
+	return df
+
+# Per batch results of a job, in order
+def list_batches(job_id, path=REPAIR_CHECKPOINT_DB):
+	with closing(_connect(path)) as conn:
+		df = pd.read_sql_query("SELECT * FROM repair_batches WHERE job_id = ? ORDER BY batch", conn, params=(job_id,))
+	for column in ("started_at", "finished_at"):
+		df[column] = pd.to_datetime(df[column], unit="s")
+	return df
+
+# Save the cursor and counters of a running job of `owner`. Everything up to the cursor was read, so a
+# resumed job lists after it. Returns False if the owner lost the job: it was taken over or discarded
+# after its checkpoints went stale, or finished.
+def save_checkpoint(job_id, owner, stats, path=REPAIR_CHECKPOINT_DB):
+	with closing(_connect(path)) as conn, conn:
+		cursor = conn.execute(
+			f"UPDATE repair_jobs SET {', '.join(f'{column} = ?' for column in STATS_COLUMNS)}, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+			[stats[column] for column in STATS_COLUMNS] + [time.time(), job_id, owner, RESUMABLE_STATUS],
+		)
+		return cursor.rowcount == 1
+
+# Poll function for repair_objects() that calls `poll` (if any) and saves a checkpoint at most every
+# `interval` seconds, so a crash in the middle of a batch loses little work and the owner keeps its job.
+# If the owner lost the job the run is stopped, record_batch() then tells the caller.
+def checkpoint_poll(job_id, owner, poll=None, interval=REPAIR_CHECKPOINT_INTERVAL, path=REPAIR_CHECKPOINT_DB):
+	last_saved = [time.monotonic()]
+
+	def checkpoint(stats):
+		if poll:
+			poll(stats)
+		if time.monotonic() - last_saved[0] >= interval:
+			if not save_checkpoint(job_id, owner, stats, path) and stats["stopped"] is None:
+				stats["stopped"] = f"Job #{job_id} was taken over by another session or discarded."
+			last_saved[0] = time.monotonic()
+	return checkpoint
+
+# Start time and counters of a batch, taken before it runs, for record_batch()
+def start_batch(stats):
+	return {"started_at": time.time(), **{column: stats[column] for column in ("next_index", "found", "not_found", "errors")}}
+
+# Checkpoint at the end of a batch (one Streamlit rerun or one CLI run) and keep its results. Returns the
+# batch number, or None if the owner lost the job (see save_checkpoint) and nothing was recorded.
+def record_batch(job_id, owner, stats, start, log=None, path=REPAIR_CHECKPOINT_DB):
+	now = time.time()
+	with closing(_connect(path)) as conn, conn:
+		cursor = conn.execute(
+			f"UPDATE repair_jobs SET {', '.join(f'{column} = ?' for column in STATS_COLUMNS)}, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+			[stats[column] for column in STATS_COLUMNS] + [now, job_id, owner, RESUMABLE_STATUS],
+		)
+		if cursor.rowcount != 1:
+			return None
+		batch = conn.execute("SELECT COALESCE(MAX(batch), 0) + 1 FROM repair_batches WHERE job_id = ?", (job_id,)).fetchone()[0]
+		conn.execute(
+			"INSERT INTO repair_batches (job_id, batch, started_at, finished_at, start_index, end_index, cursor, found, not_found, errors, stopped, log) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+			(
+				job_id, batch, start["started_at"], now, start["next_index"], stats["next_index"], stats["cursor"],
+				stats["found"] - start["found"], stats["not_found"] - start["not_found"], stats["errors"] - start["errors"],
+				stats["stopped"], log,
+			),
+		)
+	return batch
+
+# Mark a running job of `owner` completed, cancelled, failed or abandoned. Returns False if the owner lost
+# the job (see save_checkpoint).
+def finish_job(job_id, owner, status, error=None, path=REPAIR_CHECKPOINT_DB):
+	if status not in FINAL_STATUSES:
+		raise ValueError(f"Unknown final status: {status}")
+	with closing(_connect(path)) as conn, conn:
+		cursor = conn.execute(
+			"UPDATE repair_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+			(status, error, time.time(), job_id, owner, RESUMABLE_STATUS),
+		)
+		return cursor.rowcount == 1
+
+# Repair stats of a checkpointed job, for repair_objects() to continue from its cursor
+def stats_from_job(job):
+	stats = new_repair_stats(job["total"])
+	for column in STATS_COLUMNS:
+		if job[column] is not None:
+			stats[column] = job[column]
+	return stats
@@ -0,0 +1,108 @@
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from utils.connection.deadlines import OPERATION_DEADLINES
+from utils.connection.rest_session import rest_get, REST_TIMEOUT
+from utils.diagnostics.metrics import instrument
+
+# Objects compared per round while comparing replicas, and the node-scoped reads in flight at once. Feel
+# free to change them through the environment variables.
+REPLICA_DIFF_PAGE = int(os.environ.get("WEAVIATE_REPLICA_DIFF_PAGE", 500))
+REPLICA_DIFF_CONCURRENCY = int(os.environ.get("WEAVIATE_REPLICA_DIFF_CONCURRENCY", 16))
+
+# Nodes that can be compared for a repair target: nodes holding exactly the same shards of the collection
+# (or the tenant's shard) must hold the same objects. Nodes with other shard sets do not hold every object
+# the group holds, so an object absent there is not missing. Returns the groups of two or more nodes,
+# empty if none.
+def replica_groups(node_info, collection_name, tenant=None):
+	shards_per_node = {}
+	for node in node_info:
+		names = frozenset(
+			shard.name for shard in node.shards or []
+			if shard.collection == collection_name and (tenant is None or shard.name == tenant)
+		)
+		if names:
+			shards_per_node.setdefault(names, []).append(node.name)
+	return [sorted(nodes) for nodes in shards_per_node.values() if len(nodes) > 1]
+
+# Version of an object on one node's replica: its lastUpdateTimeUnix, or None if the node does not hold
+# it. Only the single-object GET /v1/objects/{class}/{id} reads one node's replica with node_name, the
+# list and HEAD endpoints ignore it. Raises RuntimeError on any other answer.
+def object_version_on_node(cluster_url, api_key, collection_name, uuid, node_name, tenant=None, timeout=REST_TIMEOUT):
+	params = {"node_name": node_name}
+	if tenant:
+		params["tenant"] = tenant
+	response = rest_get(cluster_url, api_key, f"/v1/objects/{collection_name}/{uuid}", params=params, timeout=timeout)
+	if response.status_code == 404:
+		return None
+	if response.status_code != 200:
+		raise RuntimeError(f"Error reading object {uuid} of '{collection_name}' on {node_name}: {response.status_code}")
+	return response.json().get("lastUpdateTimeUnix") or 0
+
+def new_diff_stats():
+	return {"compared": 0, "divergent": 0, "missing": Counter(), "stale": Counter(), "last_compared": None}
+
+# UUIDs of the objects the replicas of a repair target disagree on, in the order of `uuids` (e.g.
+# iter_uuids() over a cursor listing). Every listed object is read on each node of the groups (see
+# replica_groups) with a node-scoped GET, `concurrency` at a time. An object is divergent if some nodes
+# of a group miss it, or hold an older version (lastUpdateTimeUnix) than the newest one in the group;
+# reading it with consistency level ALL repairs exactly those. Objects only on nodes outside the groups
+# are not listed unless the coordinator lists them.
+#
+# This costs one GET per object and replica node, more requests than reading every object once with
+# consistency level ALL. What it buys is the per node report of missing and outdated objects, and that
+# only the divergent objects are read with consistency level ALL.
+#
+# The deadline (optional) bounds the reads. stats["last_compared"] is the last UUID compared, see
+# targeted_cursor(). poll() (optional) is called after every page, e.g. to checkpoint a job while pages
+# without divergent objects give the reader nothing to do.
+@instrument("iter_divergent_uuids")
+def iter_divergent_uuids(cluster_url, api_key, collection_name, groups, uuids, tenant=None, stats=None, deadline=None, poll=None, concurrency=REPLICA_DIFF_CONCURRENCY, page=REPLICA_DIFF_PAGE):
+	print(f"iter_divergent_uuids() called for {collection_name} with node groups: {groups}")
+	stats = stats if stats is not None else new_diff_stats()
+	nodes = [node_name for group in groups for node_name in group]
+	remaining = iter(uuids)
+	with ThreadPoolExecutor(max_workers=max(int(concurrency), 1), thread_name_prefix="replica-diff") as executor:
+		while True:
+			if deadline:
+				deadline.check()
+			page_uuids = list(islice(remaining, max(int(page), 1)))
+			if not page_uuids:
+				return
+			timeout = deadline.timeout(OPERATION_DEADLINES["rest"]) if deadline else REST_TIMEOUT
+			reads = [(uuid, node_name) for uuid in page_uuids for node_name in nodes]
+			try:
+				versions = list(executor.map(lambda read: object_version_on_node(cluster_url, api_key, collection_name, read[0], read[1], tenant, timeout), reads))
+			except Exception:
+				# A read cut short by the deadline stops the run, not the listing
+				if deadline:
+					deadline.check()
+				raise
+			for position, uuid in enumerate(page_uuids):
+				version = dict(zip(nodes, versions[position * len(nodes):(position + 1) * len(nodes)]))
+				missing = []
+				stale = []
+				for group in groups:
+					held = {node_name: version[node_name] for node_name in group if version[node_name] is not None}
+					if not held:
+						continue
+					newest = max(held.values())
+					missing += [node_name for node_name in group if node_name not in held]
+					stale += [node_name for node_name, node_version in held.items() if node_version < newest]
+				stats["compared"] += 1
+				stats["last_compared"] = uuid
+				if missing or stale:
+					stats["divergent"] += 1
+					stats["missing"].update(missing)
+					stats["stale"].update(stale)
+					yield uuid
+			if poll:
+				poll()
+
+# Move the cursor of a targeted repair past the objects compared after the last divergent one, once every
+# divergent object yielded by this run (`read` objects) was read: the next run then neither compares
+# them again nor stalls when a whole run finds nothing to repair.
+def targeted_cursor(stats, diff_stats, read):
+	if diff_stats["last_compared"] and read == diff_stats["divergent"]:
+		stats["cursor"] = diff_stats["last_compared"]
@@ -0,0 +1,168 @@
+import os
+import time
+from collections import deque
+import pandas as pd
+from utils.cluster.cluster_operations import get_shards_info
+from utils.cluster.indexing_tracker import new_indexing_tracker, record_indexing_sample
+
+# Seconds between polls of the live shard monitor, and the number of samples kept per shard and for the
+# cluster totals. Feel free to change them through the environment variables.
+SHARD_MONITOR_INTERVAL = float(os.environ.get("WEAVIATE_SHARD_MONITOR_INTERVAL", 10))
+SHARD_MONITOR_HISTORY = int(os.environ.get("WEAVIATE_SHARD_MONITOR_HISTORY", 360))
+# Number of change events kept for the "Recent Changes" table
+SHARD_MONITOR_CHANGES = 1000
+
+SHARD_KEY = ["Node Name", "Class", "Shard Name"]
+SHARD_FIELDS = ["Object Count", "Index Status", "Vector Queue Length", "Compressed", "Loaded"]
+
+# Shard rows of a verbose node payload, keyed by (node, collection, shard). Values are tuples in
+# SHARD_FIELDS order, so unchanged shards compare equal without building dicts or DataFrames.
+def shard_rows(node_info):
+	rows = {}
+	for node in node_info:
+		for shard in node.shards:
+			rows[(node.name, shard.collection, shard.name)] = (
+				shard.object_count,
+				shard.vector_indexing_status,
+				shard.vector_queue_length,
+				shard.compressed,
+				shard.loaded,
+			)
+	return rows
+
+# Keys of the shards that appeared, disappeared or changed between two shard_rows() results
+def diff_shards(previous, current):
+	added = []
+	changed = []
+	for key, row in current.items():
+		old_row = previous.get(key)
+		if old_row is None:
+			added.append(key)
+		elif old_row != row:
+			changed.append(key)
+	removed = [key for key in previous if key not in current]
+	return {"added": added, "removed": removed, "changed": changed}
+
+# Empty monitor state for one connection, kept in the session
+def new_shard_monitor(client_key, history=SHARD_MONITOR_HISTORY):
+	return {
+		"client_key": client_key,
+		"history_size": history,
+		"rows": {},
+		"table": pd.DataFrame(columns=SHARD_FIELDS, index=pd.MultiIndex.from_tuples([], names=SHARD_KEY)),
+		"nodes": pd.DataFrame(),
+		# Per shard: (time, object count, index status, vector queue length), recorded when the shard changes.
+		# Shards that never change have no series, so idle shards of large clusters cost nothing here.
+		"history": {},
+		# Per poll: cluster wide totals
+		"totals": deque(maxlen=history),
+		"changes": deque(maxlen=SHARD_MONITOR_CHANGES),
+		# Vector queue samples for indexing throughput and ETA, see utils/cluster/indexing_tracker.py
+		"indexing": new_indexing_tracker(),
+		"last_diff": None,
+		"polled_at": None,
+		"polls": 0,
+		"error": None,
+	}
+
+def _record_sample(monitor, key, polled_at, row):
+	samples = monitor["history"].get(key)
+	if samples is None:
+		samples = monitor["history"][key] = deque(maxlen=monitor["history_size"])
+	samples.append((polled_at, row[0], row[1], row[2]))
+
+# Apply a new node payload to the monitor. Only the rows of added, removed and changed shards are
+# touched in the table and history, the rest is kept as it is. Returns the diff.
+def apply_node_info(monitor, node_info, polled_at=None):
+	polled_at = polled_at if polled_at is not None else time.time()
+	current = shard_rows(node_info)
+	previous = monitor["rows"]
+	diff = diff_shards(previous, current)
+	table = monitor["table"]
+
+	if not previous:
+		# First poll: build the table in one go
+		table = pd.DataFrame(list(current.values()), columns=SHARD_FIELDS, index=pd.MultiIndex.from_tuples(list(current), names=SHARD_KEY))
+	else:
+		if diff["removed"]:
+			table = table.drop(index=diff["removed"])
+		if diff["changed"]:
+			table.loc[diff["changed"], SHARD_FIELDS] = [list(current[key]) for key in diff["changed"]]
+		if diff["added"]:
+			added = pd.DataFrame([current[key] for key in diff["added"]], columns=SHARD_FIELDS, index=pd.MultiIndex.from_tuples(diff["added"], names=SHARD_KEY))
+			table = pd.concat([table, added])
+
+	for key in diff["changed"]:
+		for field, old_value, new_value in zip(SHARD_FIELDS, previous[key], current[key]):
+			if old_value != new_value:
+				monitor["changes"].append({"Time": polled_at, "Node Name": key[0], "Class": key[1], "Shard Name": key[2], "Field": field, "Old": old_value, "New": new_value})
+		if key not in monitor["history"]:
+			# First change of this shard, start its series with the value it had until now
+			_record_sample(monitor, key, monitor["polled_at"], previous[key])
+		_record_sample(monitor, key, polled_at, current[key])
+	if previous:
+		for key in diff["added"]:
+			monitor["changes"].append({"Time": polled_at, "Node Name": key[0], "Class": key[1], "Shard Name": key[2], "Field": "Shard", "Old": None, "New": "added"})
+			_record_sample(monitor, key, polled_at, current[key])
+	for key in diff["removed"]:
+		monitor["changes"].append({"Time": polled_at, "Node Name": key[0], "Class": key[1], "Shard Name": key[2], "Field": "Shard", "Old": None, "New": "removed"})
+		monitor["history"].pop(key, None)
+
+	monitor["totals"].append({
+		"Time": polled_at,
+		"Object Count": sum(row[0] or 0 for row in current.values()),
+		"Vector Queue Length": sum(row[2] or 0 for row in current.values()),
+		"Indexing Shards": sum(1 for row in current.values() if row[1] == "INDEXING"),
+		"Read-only Shards": sum(1 for row in current.values() if row[1] == "READONLY"),
+	})
+	record_indexing_sample(monitor["indexing"], current, polled_at)
+	monitor["nodes"] = pd.DataFrame([
+		{"Node Name": node.name, "Status": node.status, "Version": node.version, "Object Count (Stats)": node.stats.object_count, "Shard Count (Stats)": node.stats.shard_count}
+		for node in node_info
+	])
+	monitor["rows"] = current
+	monitor["table"] = table
+	monitor["last_diff"] = diff
+	monitor["polled_at"] = polled_at
+	monitor["polls"] += 1
+	monitor["error"] = None
+	return diff
+
+# Poll the cluster once and apply the result. Never raises, failures are kept in "error" and the
+# previous data stays in place.
+def poll_shard_monitor(monitor, client):
+	print("poll_shard_monitor() called")
+	try:
+		node_info = get_shards_info(client)
+	except Exception as e:
+		print(f"Shard monitor poll failed: {e}")
+		monitor["error"] = str(e)
+		return None
+	return apply_node_info(monitor, node_info)
+
+# Rows of the shards that were added or changed in the last poll
+def changed_rows(monitor):
+	diff = monitor["last_diff"]
+	if not diff:
+		return pd.DataFrame()
+	keys = diff["added"] + diff["changed"]
+	if not keys:
+		return pd.DataFrame()
+	return monitor["table"].loc[keys].reset_index()
+
+# Time series of one shard, one sample per recorded change
+def shard_history(monitor, key):
+	samples = monitor["history"].get(key)
+	if not samples:
+		return pd.DataFrame()
+	df = pd.DataFrame(list(samples), columns=["Time", "Object Count", "Index Status", "Vector Queue Length"])
+	df["Time"] = pd.to_datetime(df["Time"], unit="s")
+	return df.set_index("Time")
+
+# Time series of the cluster wide totals, one sample per poll
+def totals_history(monitor):
+	if not monitor["totals"]:
+		return pd.DataFrame()
+	df = pd.DataFrame(list(monitor["totals"]))
+	df["Time"] = pd.to_datetime(df["Time"], unit="s")
+	return df.set_index("Time")
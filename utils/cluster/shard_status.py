@@ -0,0 +1,87 @@
+import os
+import time
+from utils.cluster.cluster_operations import get_shards_info
+from utils.connection.async_runner import gather_limited, run_async_with_polling
+from utils.diagnostics.metrics import instrument
+
+# Shards per update_shards() call. The async client sends one request per shard of a call at once, so at
+# most concurrency x chunk size requests are in flight. Feel free to change it through the environment variable.
+SHARD_UPDATE_CHUNK_SIZE = int(os.environ.get("WEAVIATE_SHARD_UPDATE_CHUNK_SIZE", 20))
+# Verification re-polls the node status until the shards have the new status, at most this many times
+SHARD_VERIFY_ATTEMPTS = 5
+SHARD_VERIFY_DELAY = 2.0
+# Up to this many collections are verified with one collection scoped nodes request each, above it the
+# nodes of the whole cluster are read once
+SHARD_VERIFY_SCOPED_LIMIT = 20
+
+# Split {collection: [shard names]} into (collection, shard names) jobs of at most chunk_size shards
+def chunk_shards(shard_groups, chunk_size=SHARD_UPDATE_CHUNK_SIZE):
+	jobs = []
+	for collection_name, shard_names in shard_groups.items():
+		for start in range(0, len(shard_names), chunk_size):
+			jobs.append((collection_name, list(shard_names[start:start + chunk_size])))
+	return jobs
+
+async def _update_shards_async(async_client, jobs, status, concurrency, progress):
+	async def update(collection_name, shard_names):
+		entry = progress[collection_name]
+		try:
+			result = await async_client.collections.get(collection_name).config.update_shards(status=status, shard_names=shard_names)
+			updated = sum(1 for shard_status in result.values() if shard_status == status)
+			entry["updated"] += updated
+			entry["failed"] += len(shard_names) - updated
+		except Exception as e:
+			# Shards of the chunk may still have been updated, verification tells
+			entry["failed"] += len(shard_names)
+			entry["errors"].append(str(e))
+
+	await gather_limited([lambda job=job: update(*job) for job in jobs], concurrency)
+
+# Set the status of many shards ({collection: [shard names]}) concurrently on the async client. Long shard
+# lists are split into chunks and at most `concurrency` chunks run at once. poll(progress) is called from
+# the calling thread while the updates run. Returns the progress: per collection the number of requested,
+# updated and failed shards and the error messages.
+@instrument("update_shards_status")
+def update_shards_status(async_client, shard_groups, status="READY", concurrency=16, chunk_size=SHARD_UPDATE_CHUNK_SIZE, poll=None):
+	print(f"update_shards_status() called for {len(shard_groups)} collections with concurrency: {concurrency}")
+	progress = {
+		collection_name: {"requested": len(shard_names), "updated": 0, "failed": 0, "errors": []}
+		for collection_name, shard_names in shard_groups.items()
+	}
+	jobs = chunk_shards(shard_groups, chunk_size)
+	run_async_with_polling(_update_shards_async(async_client, jobs, status, concurrency, progress), lambda: poll(progress) if poll else None)
+	return progress
+
+# Shards of shard_groups that do not have the status yet on at least one replica. READY means any status
+# but READONLY, the node status reports READY shards that are indexing as INDEXING.
+def find_unchanged_shards(client, shard_groups, status="READY"):
+	print("find_unchanged_shards() called")
+	if len(shard_groups) > SHARD_VERIFY_SCOPED_LIMIT:
+		node_infos = [get_shards_info(client)]
+	else:
+		node_infos = [get_shards_info(client, collection_name) for collection_name in shard_groups]
+	wanted = {collection_name: set(shard_names) for collection_name, shard_names in shard_groups.items()}
+	want_readonly = status == "READONLY"
+	unchanged = {}
+	for node_info in node_infos:
+		for node in node_info:
+			for shard in node.shards:
+				if (shard.vector_indexing_status == "READONLY") != want_readonly and shard.name in wanted.get(shard.collection, ()):
+					unchanged.setdefault(shard.collection, set()).add(shard.name)
+	return {collection_name: sorted(shard_names) for collection_name, shard_names in unchanged.items()}
+
+# Re-poll the node status until every shard has the status or the attempts run out. Only the shards still
+# unchanged are checked again. poll(attempt, unchanged) is called after every check. Returns the shards
+# that never changed, {} if all did.
+@instrument("verify_shards_status")
+def verify_shards_status(client, shard_groups, status="READY", attempts=SHARD_VERIFY_ATTEMPTS, delay=SHARD_VERIFY_DELAY, poll=None):
+	print("verify_shards_status() called")
+	unchanged = shard_groups
+	for attempt in range(1, attempts + 1):
+		unchanged = find_unchanged_shards(client, unchanged, status)
+		if poll:
+			poll(attempt, unchanged)
+		if not unchanged or attempt == attempts:
+			break
+		time.sleep(delay)
+	return unchanged
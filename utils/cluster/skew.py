@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Coefficient of variation (std / mean) above which a distribution counts as imbalanced, and how far above
+# its even share a node may be before it is flagged. Feel free to change it through the environment variable.
+SKEW_THRESHOLD = float(os.environ.get("WEAVIATE_SKEW_THRESHOLD", 0.2))
+# Number of largest shards listed
+HOTTEST_SHARDS = 20
+
+# Population coefficient of variation, 0 for empty or all zero values
+def coefficient_of_variation(values):
+	values = np.asarray(values, dtype="float64")
+	if values.size == 0 or values.mean() == 0:
+		return 0.0
+	return float(values.std() / values.mean())
+
+def _shard_frame(shard_data):
+	df = shard_data[["Node Name", "Class", "Shard Name", "Object Count"]].copy()
+	df["Object Count"] = df["Object Count"].fillna(0).astype("int64")
+	return df
+
+# Objects and shards per node, with the node's share of the cluster and its ratio to an even share
+# (1.0 = balanced). Nodes without shards are included, they take no load at all.
+def node_skew(shard_data, threshold=SKEW_THRESHOLD):
+	df = _shard_frame(shard_data)
+	grouped = df.groupby("Node Name", observed=False)
+	nodes = pd.DataFrame({"Shards": grouped.size(), "Objects": grouped["Object Count"].sum()})
+	even_share = 1 / len(nodes) if len(nodes) else 0
+	total_objects = nodes["Objects"].sum()
+	total_shards = nodes["Shards"].sum()
+	nodes["Object Share"] = nodes["Objects"] / total_objects if total_objects else 0.0
+	nodes["Shard Share"] = nodes["Shards"] / total_shards if total_shards else 0.0
+	nodes["Object Ratio"] = nodes["Object Share"] / even_share if even_share else 0.0
+	nodes["Shard Ratio"] = nodes["Shard Share"] / even_share if even_share else 0.0
+	nodes["Imbalanced"] = ((nodes["Object Ratio"] - 1).abs() > threshold) | ((nodes["Shard Ratio"] - 1).abs() > threshold)
+	return nodes.reset_index().sort_values("Object Ratio", ascending=False, kind="stable").reset_index(drop=True)
+
+# Per collection: how evenly its objects are spread over the nodes that host it and over its shards.
+# Node CV is the coefficient of variation of the collection's objects per node, Shard CV the one of its
+# shard sizes (replicas counted once). Max Node Ratio is the busiest node's objects over the node mean.
+# Most imbalanced first.
+def collection_skew(shard_data, threshold=SKEW_THRESHOLD):
+	df = _shard_frame(shard_data)
+	per_node = df.groupby(["Class", "Node Name"], observed=True)["Object Count"].sum().reset_index()
+	node_groups = per_node.groupby("Class", observed=True)["Object Count"]
+	node_stats = node_groups.agg(["size", "mean", "max"])
+	node_stats["std"] = node_groups.std(ddof=0)
+	hottest_node = per_node.loc[per_node.groupby("Class", observed=True)["Object Count"].idxmax(), ["Class", "Node Name"]].set_index("Class")["Node Name"]
+
+	# Replicas of a shard hold the same objects, count each shard once with its largest replica
+	per_shard = df.groupby(["Class", "Shard Name"], observed=True)["Object Count"].max().reset_index()
+	shard_groups = per_shard.groupby("Class", observed=True)["Object Count"]
+	shard_stats = shard_groups.agg(["size", "sum", "mean"])
+	shard_stats["std"] = shard_groups.std(ddof=0)
+
+	collections = pd.DataFrame({
+		"Nodes": node_stats["size"],
+		"Shards": shard_stats["size"],
+		"Objects": shard_stats["sum"],
+		"Node CV": (node_stats["std"] / node_stats["mean"]).fillna(0),
+		"Shard CV": (shard_stats["std"] / shard_stats["mean"]).fillna(0),
+		"Max Node Ratio": (node_stats["max"] / node_stats["mean"]).fillna(0),
+		"Hottest Node": hottest_node.astype(str),
+	})
+	# Placement decides the load of a node. Shard sizes of multi-tenant collections differ by nature, so
+	# uneven shards are reported separately.
+	collections["Imbalanced"] = collections["Node CV"] > threshold
+	collections["Uneven Shards"] = collections["Shard CV"] > threshold
+	collections.index.name = "Collection"
+	return collections.reset_index().sort_values("Node CV", ascending=False, kind="stable").reset_index(drop=True)
+
+# Largest shard replicas of the cluster, with their share of the collection and their size relative to
+# the collection's mean shard
+def hottest_shards(shard_data, top=HOTTEST_SHARDS):
+	df = _shard_frame(shard_data)
+	if df.empty:
+		return df
+	per_shard = df.groupby(["Class", "Shard Name"], observed=True)["Object Count"].max()
+	collection_objects = per_shard.groupby(level="Class", observed=True).sum()
+	collection_mean = per_shard.groupby(level="Class", observed=True).mean()
+	hottest = df.nlargest(top, "Object Count").reset_index(drop=True)
+	classes = hottest["Class"].astype(str)
+	hottest["Collection Share"] = hottest["Object Count"] / classes.map(collection_objects.rename(index=str)).replace(0, np.nan)
+	hottest["Size vs Mean"] = hottest["Object Count"] / classes.map(collection_mean.rename(index=str)).replace(0, np.nan)
+	return hottest.fillna({"Collection Share": 0.0, "Size vs Mean": 0.0})
+
+# Skew of the whole cluster from process_shards_data() output: per node, per collection, the hottest shards
+# and the node level coefficients of variation
+def analyze_skew(processed_data, threshold=SKEW_THRESHOLD, top=HOTTEST_SHARDS):
+	print("analyze_skew() called")
+	shard_data = processed_data["shard_data"]
+	if shard_data.empty:
+		return None
+	nodes = node_skew(shard_data, threshold)
+	return {
+		"nodes": nodes,
+		"collections": collection_skew(shard_data, threshold),
+		"hottest_shards": hottest_shards(shard_data, top),
+		"object_cv": coefficient_of_variation(nodes["Objects"]),
+		"shard_cv": coefficient_of_variation(nodes["Shards"]),
+		"threshold": threshold,
+	}
@@ -0,0 +1,247 @@
+import io
+import json
+import os
+import re
+import time
+import zipfile
+import pandas as pd
+from utils.cluster.cluster_operations import get_shards_info, process_shards_data, fetch_cluster_statistics, process_statistics
+from utils.connection.metadata_cache import get_cluster_metadata
+from utils.connection.rest_session import rest_get
+from utils.diagnostics.metrics import instrument
+
+# Directory the snapshots are written to and read from, one sub directory per snapshot. Feel free to
+# change it through the environment variable.
+SNAPSHOT_DIR = os.environ.get("WEAVIATE_SNAPSHOT_DIR", "snapshots")
+# Parquet for compact files, Arrow IPC (Feather) for the fastest reads. Both ship with Streamlit's pyarrow.
+SNAPSHOT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+MANIFEST_FILE = "manifest.json"
+# Raft columns stored as numbers, so diffs show by how much the indexes moved
+RAFT_NUMERIC_COLUMNS = ["Applied Index", "Commit Index", "Last Log Index", "Last Log Term", "Initial Last Applied Index", "Num Peers", "Term", "FSM Pending", "Last Snapshot Index", "Last Snapshot Term"]
+
+# Tables of a snapshot and the columns identifying a row, used to diff two snapshots
+SNAPSHOT_TABLES = {
+	"nodes": ["Node Name"],
+	"shards": ["Node Name", "Class", "Shard Name"],
+	"collection_shards": ["Node Name", "Collection"],
+	"raft": ["Node Name"],
+	"schema": ["Collection"],
+	"tenants": ["Collection"],
+}
+
+# One row per collection with its main settings and the full configuration as JSON
+def schema_table(classes):
+	rows = []
+	for cls in classes:
+		multi_tenancy = cls.get("multiTenancyConfig", {}) or {}
+		rows.append({
+			"Collection": cls.get("class"),
+			"Multi Tenancy": bool(multi_tenancy.get("enabled", False)),
+			"Replication Factor": (cls.get("replicationConfig", {}) or {}).get("factor"),
+			"Desired Shards": (cls.get("shardingConfig", {}) or {}).get("desiredCount"),
+			"Vectorizer": cls.get("vectorizer"),
+			"Properties": len(cls.get("properties", []) or []),
+			"Config": json.dumps(cls, sort_keys=True, default=str),
+		})
+	return pd.DataFrame(rows, columns=["Collection", "Multi Tenancy", "Replication Factor", "Desired Shards", "Vectorizer", "Properties", "Config"])
+
+# Tenants per multi-tenant collection from the shard table, without listing the tenants again. Only
+# tenants loaded on a node have shards, so inactive tenants are not counted.
+def tenant_table(shard_data, df_schema):
+	multi_tenant = set(df_schema.loc[df_schema["Multi Tenancy"], "Collection"]) if not df_schema.empty else set()
+	if shard_data.empty or not multi_tenant:
+		return pd.DataFrame(columns=["Collection", "Active Tenants", "Objects"])
+	df = shard_data[shard_data["Class"].astype(str).isin(multi_tenant)]
+	# Replicas of a tenant hold the same objects, count each tenant once with its largest replica
+	per_tenant = df.groupby(["Class", "Shard Name"], observed=True)["Object Count"].max()
+	grouped = per_tenant.groupby(level="Class", observed=True)
+	return pd.DataFrame({"Active Tenants": grouped.size(), "Objects": grouped.sum()}).rename_axis("Collection").reset_index()
+
+# Object columns (mixed values such as Raft indexes next to "N/A") as nullable strings, so they can be
+# written to Parquet / Arrow
+def _arrow_safe(df):
+	df = df.copy()
+	for column in df.columns:
+		if df[column].dtype == object:
+			df[column] = df[column].astype("string")
+	return df
+
+# Read the cluster state once: nodes and shards (one verbose nodes request), Raft statistics and the schema
+# (one REST request each). Parts that fail are left out and reported in "errors", a partial snapshot of a
+# cluster under stress is better than none.
+@instrument("collect_snapshot")
+def collect_snapshot(client, cluster_url, api_key, client_key=None):
+	print("collect_snapshot() called")
+	start = time.monotonic()
+	tables = {}
+	errors = {}
+	shard_data = pd.DataFrame()
+	try:
+		processed = process_shards_data(get_shards_info(client))
+		tables["nodes"] = processed["node_data"]
+		tables["shards"] = shard_data = processed["shard_data"]
+		tables["collection_shards"] = processed["collection_shard_data"]
+	except Exception as e:
+		errors["nodes"] = str(e)
+
+	stats = fetch_cluster_statistics(cluster_url, api_key)
+	processed_stats = process_statistics(stats) if "error" not in stats else stats
+	if "error" in processed_stats:
+		errors["raft"] = processed_stats["error"]
+	else:
+		df_raft = processed_stats["data"].copy()
+		for column in RAFT_NUMERIC_COLUMNS:
+			if column in df_raft:
+				df_raft[column] = pd.to_numeric(df_raft[column], errors="coerce").astype("Int64")
+		tables["raft"] = df_raft
+
+	try:
+		response = rest_get(cluster_url, api_key, "/v1/schema")
+		response.raise_for_status()
+		tables["schema"] = schema_table(response.json().get("classes", []) or [])
+		tables["tenants"] = tenant_table(shard_data, tables["schema"])
+	except Exception as e:
+		errors["schema"] = str(e)
+
+	try:
+		meta = get_cluster_metadata(client, client_key)
+	except Exception as e:
+		errors["meta"] = str(e)
+		meta = {}
+	manifest = {
+		"endpoint": cluster_url,
+		"taken_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+		"server_version": meta.get("version"),
+		"tables": {name: len(df) for name, df in tables.items()},
+		"errors": errors,
+		"elapsed_seconds": round(time.monotonic() - start, 3),
+	}
+	return {"manifest": manifest, "tables": tables}
+
+def _endpoint_slug(endpoint):
+	return re.sub(r"[^A-Za-z0-9]+", "-", re.sub(r"^https?://", "", endpoint or "cluster")).strip("-")[:60]
+
+# Write a snapshot as one file per table plus the manifest into directory/<timestamp>_<endpoint>.
+# Returns the snapshot directory.
+@instrument("write_snapshot")
+def write_snapshot(snapshot, directory=SNAPSHOT_DIR, fmt="parquet"):
+	print(f"write_snapshot() called with format: {fmt}")
+	if fmt not in SNAPSHOT_FORMATS:
+		raise ValueError(f"Unknown snapshot format: {fmt}")
+	manifest = dict(snapshot["manifest"], format=fmt)
+	name = f"{manifest['taken_at'].replace(':', '').replace('-', '')}_{_endpoint_slug(manifest['endpoint'])}"
+	path = os.path.join(directory, name)
+	suffix = 1
+	while os.path.exists(path):
+		suffix += 1
+		path = os.path.join(directory, f"{name}_{suffix}")
+	os.makedirs(path)
+	for table, df in snapshot["tables"].items():
+		file_path = os.path.join(path, f"{table}{SNAPSHOT_FORMATS[fmt]}")
+		df = _arrow_safe(df.reset_index(drop=True))
+		if fmt == "parquet":
+			df.to_parquet(file_path, index=False)
+		else:
+			df.to_feather(file_path)
+	with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+		json.dump(manifest, f, indent=2)
+	return path
+
+# Manifests of the snapshots in a directory, newest first, each with its "path"
+def list_snapshots(directory=SNAPSHOT_DIR):
+	snapshots = []
+	if not os.path.isdir(directory):
+		return snapshots
+	for name in os.listdir(directory):
+		manifest_path = os.path.join(directory, name, MANIFEST_FILE)
+		if os.path.isfile(manifest_path):
+			try:
+				with open(manifest_path) as f:
+					manifest = json.load(f)
+			except (OSError, ValueError):
+				continue
+			manifest["path"] = os.path.join(directory, name)
+			snapshots.append(manifest)
+	return sorted(snapshots, key=lambda manifest: manifest.get("taken_at", ""), reverse=True)
+
+# Manifest and tables of a written snapshot, only the given tables if any
+def read_snapshot(path, tables=None):
+	with open(os.path.join(path, MANIFEST_FILE)) as f:
+		manifest = json.load(f)
+	extension = SNAPSHOT_FORMATS[manifest.get("format", "parquet")]
+	result = {}
+	for table in tables or manifest.get("tables", {}):
+		file_path = os.path.join(path, f"{table}{extension}")
+		if not os.path.isfile(file_path):
+			continue
+		result[table] = pd.read_parquet(file_path) if extension == ".parquet" else pd.read_feather(file_path)
+	return {"manifest": manifest, "tables": result}
+
+# All files of a snapshot directory as a zip archive, for downloads
+def snapshot_zip(path):
+	buffer = io.BytesIO()
+	with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+		for name in sorted(os.listdir(path)):
+			archive.write(os.path.join(path, name), arcname=f"{os.path.basename(path)}/{name}")
+	return buffer.getvalue()
+
+def _plain(series):
+	return series.astype(object) if isinstance(series.dtype, pd.CategoricalDtype) else series
+
+# Rows of two versions of a table that were added, removed or changed, matched on the key columns. Changed
+# rows keep the old and new value of every column that changed in any row, numeric columns also get the
+# difference. Both tables are compared column by column, no row is compared in Python.
+def diff_tables(old, new, keys):
+	columns = [column for column in old.columns if column in new.columns and column not in keys]
+	old = pd.DataFrame({column: _plain(old[column]) for column in keys + columns})
+	new = pd.DataFrame({column: _plain(new[column]) for column in keys + columns})
+	for column in keys:
+		old[column] = old[column].astype(str)
+		new[column] = new[column].astype(str)
+	merged = old.merge(new, on=keys, how="outer", suffixes=(" (old)", " (new)"), indicator=True)
+
+	changed_any = pd.Series(False, index=merged.index)
+	changed_columns = []
+	for column in columns:
+		before, after = merged[f"{column} (old)"], merged[f"{column} (new)"]
+		same = (before == after).fillna(False).astype(bool) | (before.isna() & after.isna())
+		differs = ~same & (merged["_merge"] == "both")
+		if differs.any():
+			changed_columns.append(column)
+			changed_any |= differs
+
+	merged["Change"] = merged["_merge"].map({"left_only": "removed", "right_only": "added", "both": "changed"}).astype(str)
+	result = merged[(merged["_merge"] != "both") | changed_any]
+	output = result[keys + ["Change"]].copy()
+	for column in changed_columns:
+		before, after = result[f"{column} (old)"], result[f"{column} (new)"]
+		output[f"{column} (old)"] = before
+		output[f"{column} (new)"] = after
+		if pd.api.types.is_numeric_dtype(before) and pd.api.types.is_numeric_dtype(after) and not pd.api.types.is_bool_dtype(before):
+			output[f"{column} Δ"] = after - before
+	return output.sort_values(["Change"] + keys, kind="stable").reset_index(drop=True)
+
+# Diff of every table two snapshots have in common, and a summary with the added, removed and changed
+# rows per table
+def diff_snapshots(old, new):
+	print("diff_snapshots() called")
+	diffs = {}
+	summary = []
+	for table, keys in SNAPSHOT_TABLES.items():
+		if table not in old["tables"] or table not in new["tables"]:
+			continue
+		df_old, df_new = old["tables"][table], new["tables"][table]
+		if not all(key in df_old.columns and key in df_new.columns for key in keys):
+			continue
+		diff = diff_tables(df_old, df_new, keys)
+		diffs[table] = diff
+		counts = diff["Change"].value_counts()
+		summary.append({
+			"Table": table,
+			"Rows (old)": len(df_old),
+			"Rows (new)": len(df_new),
+			"Added": int(counts.get("added", 0)),
+			"Removed": int(counts.get("removed", 0)),
+			"Changed": int(counts.get("changed", 0)),
+		})
+	return {"summary": pd.DataFrame(summary), "diffs": diffs}
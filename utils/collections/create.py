@@ -8,12 +8,45 @@ from weaviate.classes.config import Configure
 from utils.cluster.cluster_operations import get_schema
 import streamlit as st
 import re
+from utils.diagnostics.metrics import instrument
+from utils.connection.metadata_cache import get_enabled_modules
 
 # Supported vectorizers
 def get_supported_vectorizers() -> List[str]:
 	print("get_supported_vectorizers() called")
 	return ["text2vec_openai", "text2vec_huggingface", "text2vec_cohere", "text2vec_jinaai", "BYOV"]
 
+# Name of the Weaviate module a vectorizer needs, None for BYOV
+def vectorizer_module(vectorizer: str) -> Optional[str]:
+	return None if vectorizer == "BYOV" else vectorizer.replace("_", "-")
+
+# Supported vectorizers whose module is enabled on the cluster, read from the shared metadata cache.
+# All supported vectorizers if the metadata cannot be read.
+def get_available_vectorizers(client: Client) -> List[str]:
+	print("get_available_vectorizers() called")
+	try:
+		modules = get_enabled_modules(client, st.session_state.get("client_key"))
+	except Exception as e:
+		print(f"Could not read the enabled modules: {e}")
+		return get_supported_vectorizers()
+	return [vectorizer for vectorizer in get_supported_vectorizers() if vectorizer_module(vectorizer) is None or vectorizer_module(vectorizer) in modules]
+
+# Check that the module of the selected vectorizer is enabled on the cluster
+def check_vectorizer_module(client: Client, vectorizer: str) -> tuple[bool, str]:
+	print(f"check_vectorizer_module() called with vectorizer: {vectorizer}")
+	module = vectorizer_module(vectorizer)
+	if module is None:
+		return True, ""
+	try:
+		modules = get_enabled_modules(client, st.session_state.get("client_key"))
+	except Exception as e:
+		# Let the server decide when the metadata cannot be read
+		print(f"Could not read the enabled modules: {e}")
+		return True, ""
+	if module not in modules:
+		return False, f"The {module} module is not enabled on this cluster. Select another vectorizer or BYOV."
+	return True, ""
+
 # Validate file format
 def validate_file_format(file_content: str, file_type: str) -> tuple[bool, str, Optional[List[Dict[str, Any]]]]:
 	print("validate_file_format() called")
@@ -57,6 +90,7 @@ def check_vectorizer_keys(vectorizer: str) -> tuple[bool, str]:
 	return True, ""
 
 # Create a new collection
+@instrument("create_collection")
 def create_collection(client: Client, collection_name: str, vectorizer: str) -> tuple[bool, str]:
 	print(f"create_collection() called with collection_name: {collection_name}, vectorizer: {vectorizer}")
 	try:
@@ -69,6 +103,11 @@ def create_collection(client: Client, collection_name: str, vectorizer: str) ->
 		if not has_keys:
 			return False, key_message
 
+		# Check if the vectorizer module is enabled
+		has_module, module_message = check_vectorizer_module(client, vectorizer)
+		if not has_module:
+			return False, module_message
+
 		# Configure vectorizer
 		if vectorizer == "text2vec_openai":
 			vectorizer_config = Configure.Vectorizer.text2vec_openai()
@@ -105,6 +144,7 @@ def sanitize_keys(data_item: Dict[str, Any]) -> Dict[str, Any]:
 	return sanitized_item
 
 # Batch data. Reduce/Increase Batch Size as per your requirement. You can also pass concurrent_requests in batch.fixed_size(batch_size=1000, concurrent_requests=4)
+@instrument("batch_upload")
 def batch_upload(client: Client, collection_name: str, data: List[Dict[str, Any]], batch_size: int = 1000):
 	print(f"batch_upload() called")
 	if not client.collections.exists(collection_name):
@@ -129,6 +169,7 @@ def batch_upload(client: Client, collection_name: str, data: List[Dict[str, Any]
 				yield False, f"Failed to queue object {i}/{total_objects}: {str(e)}", None
 
 # Get the newely created collection
+@instrument("get_collection_info")
 def get_collection_info(client: Client, collection_name: str) -> tuple[bool, str, Optional[Dict[str, Any]]]:
 	print(f"get_collection_info() called for collection: {collection_name}")
 	try:
@@ -152,6 +193,7 @@ def get_collection_info(client: Client, collection_name: str) -> tuple[bool, str
 		return False, f"Error getting collection info: {str(e)}", None
 
 # Get the first 100 objects from the collection as check up
+@instrument("get_collection_objects")
 def get_collection_objects(client: Client, collection_name: str, limit: int = 100) -> tuple[bool, str, Optional[pd.DataFrame]]:
 	print(f"get_collection_objects() called")
 	try:
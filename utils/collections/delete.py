@@ -1,4 +1,7 @@
+from utils.diagnostics.metrics import instrument
+
 # Delete collections and tenants from collections in Weaviate
+@instrument("delete_collections")
 def delete_collections(client, collection_names):
 	print(f"delete_collections() called with: {collection_names}")
 	try:
@@ -7,6 +10,7 @@ def delete_collections(client, collection_names):
 	except Exception as e:
 		return False, f"Error deleting collections: {str(e)}"
 
+@instrument("delete_tenants_from_collection")
 def delete_tenants_from_collection(client, collection_name, tenant_names):
 	print(f"delete_tenants_from_collection() called with collection: {collection_name} and tenants: {tenant_names}")
 	try:
@@ -1,7 +1,10 @@
 import pandas as pd
 from weaviate.classes.query import Sort
 import streamlit as st
+from utils.diagnostics.metrics import instrument
+
 # List all collections
+@instrument("list_all_collections")
 def list_all_collections(client):
 	print("list_all_collections() called")
 	try:
@@ -12,6 +15,7 @@ def list_all_collections(client):
 		return []
 
 # Retrieves tenant names for a given collection if multi-tenancy is enabled.
+@instrument("get_tenant_names")
 def get_tenant_names(client, collection_name):
 	print(f"get_tenant_names() called for collection: {collection_name}")
 	try:
@@ -26,8 +30,10 @@ def get_tenant_names(client, collection_name):
 			return []
 
 # Fetches data from a collection with pagination. Caches the results for 1 hour (Feel free to change).
+# The client_key (pooled client key) keeps cached results of different clusters apart.
 @st.cache_data(ttl=3600)
-def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, items_per_page=1000):
+@instrument("fetch_collection_data")
+def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, items_per_page=1000, client_key=None):
 	print(f"fetch_collection_data() called")
 	try:
 		collection = _client.collections.get(collection_name)
@@ -90,3 +96,22 @@ def fetch_collection_data(_client, collection_name, tenant_name=None, page=1, it
 			"current_page": page,
 			"items_per_page": items_per_page
 		}
+
+# Iterates over all objects of a collection (or tenant) with the cursor API, one row (dict) at a time.
+# Unlike fetch_collection_data it is not limited by the query maximum and keeps nothing in memory.
+def iter_collection_objects(client, collection_name, tenant_name=None, include_vector=False):
+	print(f"iter_collection_objects() called for collection: {collection_name}")
+	collection = client.collections.get(collection_name)
+	if tenant_name:
+		collection = collection.with_tenant(tenant_name)
+
+	for item in collection.iterator(include_vector=include_vector, return_metadata=["creation_time", "last_update_time"]):
+		row = item.properties.copy()
+		row['uuid'] = item.uuid
+		if include_vector:
+			row['vector'] = item.vector
+		row['creation_time'] = item.metadata.creation_time
+		row['last_update_time'] = item.metadata.last_update_time
+		if tenant_name:
+			row['tenant'] = tenant_name
+		yield row
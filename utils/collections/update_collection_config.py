@@ -1,7 +1,9 @@
 from weaviate.classes.config import Reconfigure, PQEncoderType, PQEncoderDistribution, VectorFilterStrategy, ReplicationDeletionStrategy
 import pandas as pd
+from utils.diagnostics.metrics import instrument
 
 # Get the current configuration of a collection
+@instrument("get_collection_config")
 def get_collection_config(client, collection_name):
 	print(f"get_collection_config is called")
 	try:
@@ -12,6 +14,7 @@ def get_collection_config(client, collection_name):
 		raise Exception(f"Failed to get collection configuration: {str(e)}")
 
 # Update the configuration of a collection (all mutable params)
+@instrument("update_collection_config")
 def update_collection_config(client, collection_name, config_updates):
 	print(f"update_collection_config is called")
 	try:
@@ -0,0 +1,60 @@
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+
+# Streamlit runs every script in its own thread without an event loop, and the async Weaviate
+# client is bound to the loop it was connected on. All coroutines therefore run on one
+# long-lived loop in a background thread and the script thread blocks on their results.
+_loop = None
+_loop_lock = threading.Lock()
+
+# Start the background event loop on first use
+def _get_loop():
+	global _loop
+	with _loop_lock:
+		if _loop is None:
+			_loop = asyncio.new_event_loop()
+			thread = threading.Thread(target=_loop.run_forever, name="weaviate-async-runner", daemon=True)
+			thread.start()
+	return _loop
+
+# Run a coroutine on the background loop and wait for its result
+def run_async(coro, timeout=None):
+	future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+	try:
+		return future.result(timeout)
+	except Exception:
+		future.cancel()
+		raise
+
+# Run a coroutine on the background loop and call poll() from the calling thread every `interval` seconds
+# until it is done, e.g. to update Streamlit elements (which only work from the script thread).
+def run_async_with_polling(coro, poll, interval=0.25):
+	future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+	try:
+		while not future.done():
+			concurrent.futures.wait([future], timeout=interval)
+			poll()
+		return future.result()
+	except BaseException:
+		future.cancel()
+		raise
+
+# Run coroutine factories concurrently, at most `concurrency` at a time. Results keep the input order,
+# failed calls return their exception instead of raising.
+async def gather_limited(factories, concurrency):
+	semaphore = asyncio.Semaphore(max(int(concurrency), 1))
+
+	async def _run(factory):
+		async with semaphore:
+			return await factory()
+
+	return await asyncio.gather(*(_run(factory) for factory in factories), return_exceptions=True)
+
+# Stop the background loop on interpreter exit
+def _stop_loop():
+	if _loop is not None and _loop.is_running():
+		_loop.call_soon_threadsafe(_loop.stop)
+
+atexit.register(_stop_loop)
@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+
+# Time budget in seconds per operation type. Each can be changed with an environment variable,
+# e.g. WEAVIATE_DEADLINE_AGGREGATE=300.
+_DEFAULT_DEADLINES = {
+	"init": 30,           # Opening a connection
+	"nodes": 60,          # cluster.nodes() and node probes
+	"aggregate": 300,     # Aggregating all collections and tenants
+	"fetch": 120,         # Fetching / searching objects
+	"batch_insert": 600,  # Batch uploads
+	"rest": 60,           # A single REST call
+	"repair_batch": 120,  # One read repair batch, listing included (one Streamlit rerun)
+}
+OPERATION_DEADLINES = {
+	operation: float(os.environ.get(f"WEAVIATE_DEADLINE_{operation.upper()}", seconds))
+	for operation, seconds in _DEFAULT_DEADLINES.items()
+}
+
+# Raised when an operation ran out of its time budget
+class DeadlineExceeded(Exception):
+	pass
+
+# Raised when the operator cancelled an operation
+class OperationCancelled(Exception):
+	pass
+
+# Time budget of one operation, passed down into nested loops and worker threads.
+# An optional cancel event (see get_cancel_event) stops the operation cooperatively.
+class Deadline:
+	def __init__(self, operation, seconds=None, cancel_event=None):
+		self.operation = operation
+		self.seconds = OPERATION_DEADLINES[operation] if seconds is None else seconds
+		self.expires_at = time.monotonic() + self.seconds
+		self.cancel_event = cancel_event
+
+	def remaining(self):
+		return max(self.expires_at - time.monotonic(), 0.0)
+
+	def expired(self):
+		return time.monotonic() >= self.expires_at
+
+	def cancelled(self):
+		return self.cancel_event is not None and self.cancel_event.is_set()
+
+	# Raise if the operation was cancelled or ran out of time, call this between units of work
+	def check(self):
+		if self.cancelled():
+			raise OperationCancelled(f"{self.operation} was cancelled.")
+		if self.expired():
+			raise DeadlineExceeded(f"{self.operation} exceeded its {self.seconds:g}s deadline.")
+
+	# Timeout for one call: the remaining budget, capped at `cap` seconds
+	def timeout(self, cap=None):
+		self.check()
+		remaining = self.remaining()
+		return remaining if cap is None else min(remaining, cap)
+
+# Cancel events are stored in the Streamlit session state by name, so a Cancel button's on_click
+# callback can stop work started by an earlier script run (and its worker threads).
+def get_cancel_event(session_state, name):
+	events = session_state.setdefault("cancel_events", {})
+	if name not in events:
+		events[name] = threading.Event()
+	return events[name]
+
+# Request cancellation of a named operation
+def cancel_operation(session_state, name):
+	print(f"cancel_operation() called for: {name}")
+	get_cancel_event(session_state, name).set()
+
+# Reset the cancel event before starting a named operation
+def reset_cancel_event(session_state, name):
+	event = get_cancel_event(session_state, name)
+	event.clear()
+	return event
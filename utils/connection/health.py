@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+import weaviate
+from utils.connection.weaviate_connection import peek_weaviate_client
+from utils.connection.metadata_cache import get_cluster_metadata
+from utils.diagnostics.metrics import instrument
+
+# Seconds between health checks of a connected endpoint, and the age after which a snapshot is
+# shown as stale. Feel free to change them through the environment variables.
+HEALTH_POLL_INTERVAL = float(os.environ.get("WEAVIATE_HEALTH_INTERVAL", 15))
+HEALTH_STALE_AFTER = float(os.environ.get("WEAVIATE_HEALTH_STALE_AFTER", HEALTH_POLL_INTERVAL * 3))
+
+# One monitor per pooled client (client_key), shared by every session connected to the same cluster.
+# Monitors stop on their own once the pool closes their client.
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+# Readiness, version and node status of a cluster. Never raises, failures are kept in "error". The version
+# comes from the shared metadata cache, which is only fetched again when the nodes or their versions change.
+@instrument("health_check")
+def check_health(client, client_key=None):
+	print("check_health() called")
+	start = time.monotonic()
+	snapshot = {
+		"ready": False,
+		"server_version": "N/A",
+		"client_version": weaviate.__version__,
+		"nodes": [],
+		"error": None,
+	}
+	try:
+		snapshot["ready"] = client.is_ready()
+		nodes = client.cluster.nodes(output="minimal")
+		snapshot["nodes"] = [{"name": node.name, "status": node.status, "version": node.version} for node in nodes]
+		snapshot["server_version"] = get_cluster_metadata(client, client_key, nodes).get("version", "N/A")
+	except Exception as e:
+		print(f"Health check failed: {e}")
+		snapshot["error"] = str(e)
+	snapshot["checked_at"] = time.time()
+	snapshot["duration"] = time.monotonic() - start
+	return snapshot
+
+def _run_monitor(client_key, monitor):
+	while True:
+		client = peek_weaviate_client(client_key)
+		if client is None or monitor["stop"].is_set():
+			break
+		monitor["snapshot"] = check_health(client, client_key)
+		monitor["wake"].wait(HEALTH_POLL_INTERVAL)
+		monitor["wake"].clear()
+
+	print(f"Health monitor stopped for: {client_key}")
+	with _monitors_lock:
+		if _monitors.get(client_key) is monitor:
+			del _monitors[client_key]
+
+# Start polling a pooled client in the background, if it is not polled already
+def start_health_monitor(client_key):
+	with _monitors_lock:
+		if client_key in _monitors:
+			return
+		print(f"start_health_monitor() called for: {client_key}")
+		monitor = {"snapshot": None, "stop": threading.Event(), "wake": threading.Event()}
+		_monitors[client_key] = monitor
+	threading.Thread(target=_run_monitor, args=(client_key, monitor), name="health-monitor", daemon=True).start()
+
+# Latest snapshot of a pooled client, or None until its first check is done. Never blocks.
+def get_health_snapshot(client_key):
+	monitor = _monitors.get(client_key)
+	return monitor["snapshot"] if monitor else None
+
+# Ask the monitor to check now instead of waiting for the next interval
+def request_health_check(client_key):
+	monitor = _monitors.get(client_key)
+	if monitor:
+		monitor["wake"].set()
+
+# Seconds since the snapshot was taken
+def snapshot_age(snapshot):
+	return max(time.time() - snapshot["checked_at"], 0.0)
+
+def is_stale(snapshot):
+	return snapshot_age(snapshot) > HEALTH_STALE_AFTER
+
+# Human readable age, e.g. "12s ago" / "3m ago"
+def format_age(seconds):
+	if seconds < 60:
+		return f"{seconds:.0f}s ago"
+	if seconds < 3600:
+		return f"{seconds / 60:.0f}m ago"
+	return f"{seconds / 3600:.1f}h ago"
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+import pandas as pd
+from utils.diagnostics.metrics import instrument
+
+# Metadata (/v1/meta) is fetched again after this many seconds even if the version and nodes did not
+# change, e.g. after a restart with other modules. Feel free to change it through the environment variable.
+METADATA_CACHE_TTL = float(os.environ.get("WEAVIATE_METADATA_TTL", 3600))
+
+# One entry per endpoint, shared by every session and the health monitors:
+# {"meta", "fingerprint", "fetched_at", "parsed"}. The parsed tables are built on first use.
+_cache = {}
+_cache_lock = threading.Lock()
+
+# Endpoint part of a pooled client key ("mode|endpoint|credentials"). Metadata does not depend on the
+# credentials, so every connection to the same cluster shares one entry.
+def metadata_endpoint(client_key):
+	return client_key.split("|")[1] if client_key and "|" in client_key else client_key
+
+# Node set and node versions, from the minimal or verbose nodes output. A rolling upgrade changes the
+# versions, scaling changes the names.
+def cluster_fingerprint(nodes):
+	if nodes is None:
+		return None
+	return tuple(sorted((node.name, node.version) for node in nodes))
+
+def _is_valid(entry, fingerprint):
+	if entry is None:
+		return False
+	if fingerprint is not None and entry["fingerprint"] is not None and entry["fingerprint"] != fingerprint:
+		return False
+	return time.time() - entry["fetched_at"] < METADATA_CACHE_TTL
+
+# Metadata of the cluster, from the cache while the fingerprint of `nodes` (if given) matches the one it was
+# fetched with and the entry is younger than METADATA_CACHE_TTL. Without nodes the cached entry is trusted,
+# the health monitor passes the nodes on every check and so invalidates it. Raises on fetch errors.
+def get_cluster_metadata(client, client_key, nodes=None):
+	endpoint = metadata_endpoint(client_key)
+	fingerprint = cluster_fingerprint(nodes)
+	entry = _cache.get(endpoint)
+	if _is_valid(entry, fingerprint):
+		return entry["meta"]
+	meta = fetch_metadata(client)
+	with _cache_lock:
+		_cache[endpoint] = {"meta": meta, "fingerprint": fingerprint, "fetched_at": time.time(), "parsed": None}
+	return meta
+
+@instrument("get_meta")
+def fetch_metadata(client):
+	print("fetch_metadata() called")
+	return client.get_meta()
+
+# Cached metadata of an endpoint without fetching, or None
+def peek_cluster_metadata(client_key):
+	entry = _cache.get(metadata_endpoint(client_key))
+	return entry["meta"] if entry else None
+
+# Drop the cached metadata of one endpoint, or of all endpoints
+def invalidate_metadata(client_key=None):
+	with _cache_lock:
+		if client_key is None:
+			_cache.clear()
+		else:
+			_cache.pop(metadata_endpoint(client_key), None)
+
+# Seconds since the metadata of an endpoint was fetched, or None
+def metadata_age(client_key):
+	entry = _cache.get(metadata_endpoint(client_key))
+	return time.time() - entry["fetched_at"] if entry else None
+
+# General metadata and module tables of a /v1/meta response
+def parse_metadata(metadata):
+	# Process general metadata (excluding modules)
+	general_metadata = {
+		key: str(value) for key, value in metadata.items() if key != "modules"
+	}
+	general_metadata_df = pd.DataFrame(general_metadata.items(), columns=["Key", "Value"])
+
+	# Process modules
+	modules_data = metadata.get("modules", {})
+	standard_modules = []  # For modules with standard structure (name + documentationHref)
+	other_modules = []     # For modules with different structure
+
+	for module_name, module_details in modules_data.items():
+		if isinstance(module_details, dict):
+			if "name" in module_details and "documentationHref" in module_details:
+				standard_modules.append({
+					"Module": str(module_name),
+					"Name": str(module_details.get("name", "N/A")),
+					"Documentation": str(module_details.get("documentationHref", "N/A"))
+				})
+			else:
+				# Other module format
+				other_module = {"Module": str(module_name)}
+				other_module.update({k: str(v) if v is not None else "N/A" for k, v in module_details.items()})
+				other_modules.append(other_module)
+
+	return {
+		"general_metadata_df": general_metadata_df,
+		"standard_modules_df": pd.DataFrame(standard_modules) if standard_modules else pd.DataFrame(),
+		"other_modules_df": pd.DataFrame(other_modules) if other_modules else pd.DataFrame()
+	}
+
+# Parsed metadata tables, built once per cached entry
+def get_parsed_metadata(client, client_key):
+	meta = get_cluster_metadata(client, client_key)
+	entry = _cache.get(metadata_endpoint(client_key))
+	if entry is None or entry["meta"] is not meta:
+		return parse_metadata(meta)
+	if entry["parsed"] is None:
+		entry["parsed"] = parse_metadata(meta)
+	return entry["parsed"]
+
+# Names of the modules enabled on the cluster, e.g. {"text2vec-openai", "backup-s3"}
+def get_enabled_modules(client, client_key):
+	return set(get_cluster_metadata(client, client_key).get("modules", {}) or {})
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import threading
+import time
+import requests
+from utils.diagnostics.metrics import record
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled keep-alive session per endpoint + API key, shared by every session and worker thread,
+# so REST calls reuse TCP/TLS connections instead of opening one per request.
+# Feel free to change the limits through the environment variables.
+REST_POOL_MAXSIZE = int(os.environ.get("WEAVIATE_REST_POOL_MAXSIZE", 32))
+REST_MAX_RETRIES = int(os.environ.get("WEAVIATE_REST_MAX_RETRIES", 3))
+
+# Default (connect, read) timeout in seconds for REST calls
+REST_TIMEOUT = (10, 60)
+
+# Canonical form of an endpoint as typed: https:// unless a scheme is given, no trailing slash. Endpoints
+# that name the same cluster then compare equal, e.g. as the key of its repair jobs.
+def normalize_endpoint(endpoint):
+	endpoint = endpoint.strip().rstrip("/")
+	if not endpoint.startswith(("http://", "https://")):
+		endpoint = f"https://{endpoint}"
+	return endpoint
+
+# 500 is not retried: Weaviate answers it for requests that can never succeed (e.g. unknown node_name).
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Static path segments kept in metric names, anything else (collection names, UUIDs, tenants) becomes {param}
+_STATIC_SEGMENTS = {"v1", "objects", "schema", "cluster", "statistics", "nodes", "meta", "tenants", "shards", "batch", "graphql", ".well-known", "ready", "live", "users", "authz", "roles", "backups"}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Build a session with connection pooling, gzip and jittered exponential backoff on 429/5xx
+def _build_session(api_key):
+	session = requests.Session()
+	session.headers.update({
+		"Authorization": f"Bearer {api_key}",
+		"Accept-Encoding": "gzip, deflate",
+	})
+	retry = Retry(
+		total=REST_MAX_RETRIES,
+		connect=REST_MAX_RETRIES,
+		read=REST_MAX_RETRIES,
+		status=REST_MAX_RETRIES,
+		backoff_factor=0.5,
+		backoff_jitter=0.5,
+		status_forcelist=RETRY_STATUSES,
+		allowed_methods=frozenset(["GET", "HEAD"]),
+		respect_retry_after_header=True,
+		raise_on_status=False,
+	)
+	adapter = HTTPAdapter(pool_connections=4, pool_maxsize=REST_POOL_MAXSIZE, max_retries=retry)
+	session.mount("http://", adapter)
+	session.mount("https://", adapter)
+	return session
+
+# Get the shared session for an endpoint and API key
+def get_rest_session(cluster_url, api_key):
+	session_key = (cluster_url.rstrip("/"), hashlib.sha256((api_key or "").encode()).hexdigest())
+	with _sessions_lock:
+		session = _sessions.get(session_key)
+		if session is None:
+			session = _build_session(api_key)
+			_sessions[session_key] = session
+		return session
+
+# Metric name of a REST call, e.g. "GET /v1/objects/{param}/{param}"
+def _operation_name(method, path):
+	segments = [segment if segment in _STATIC_SEGMENTS else "{param}" for segment in path.strip("/").split("/") if segment]
+	return f"{method} /{'/'.join(segments)}"
+
+# GET a REST path (e.g. "/v1/schema") on the cluster through the shared session
+def rest_get(cluster_url, api_key, path, params=None, timeout=REST_TIMEOUT):
+	session = get_rest_session(cluster_url, api_key)
+	start = time.perf_counter()
+	try:
+		response = session.get(f"{cluster_url.rstrip('/')}{path}", params=params, timeout=timeout)
+	except requests.exceptions.RequestException:
+		record(_operation_name("GET", path), time.perf_counter() - start, error=True)
+		raise
+	# 404 is an answer (object not on that node / not found), not a failed call
+	failed = response.status_code >= 400 and response.status_code != 404
+	record(_operation_name("GET", path), time.perf_counter() - start, error=failed, nbytes=len(response.content))
+	return response
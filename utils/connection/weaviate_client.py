@@ -1,41 +1,102 @@
 import streamlit as st
-from utils.connection.weaviate_connection import get_weaviate_client, status
+import weaviate
+from utils.connection.weaviate_connection import acquire_weaviate_client, release_weaviate_client, touch_weaviate_client, weaviate_client_in_use, status
+from utils.connection.health import start_health_monitor, get_health_snapshot
 
 # Initializes the Weaviate client and sets the session state variables.
 def initialize_client(
-	cluster_endpoint=None, 
-	cluster_api_key=None, 
-	use_local=False, 
-	vectorizer_integration_keys=None, 
-	use_custom=False, 
-	http_host_endpoint=None, 
-	http_port_endpoint=None, 
-	grpc_host_endpoint=None, 
-	grpc_port_endpoint=None, 
-	custom_secure=False
+	cluster_endpoint=None,
+	cluster_api_key=None,
+	use_local=False,
+	vectorizer_integration_keys=None,
+	use_custom=False,
+	http_host_endpoint=None,
+	http_port_endpoint=None,
+	grpc_host_endpoint=None,
+	grpc_port_endpoint=None,
+	custom_secure=False,
+	validate_in_background=True
 ):
 	print("initialize_client() called")
+	connection_args = {
+		"cluster_endpoint": cluster_endpoint,
+		"cluster_api_key": cluster_api_key,
+		"use_local": use_local,
+		"vectorizer_integration_keys": vectorizer_integration_keys,
+		"use_custom": use_custom,
+		"http_host_endpoint": http_host_endpoint,
+		"http_port_endpoint": http_port_endpoint,
+		"grpc_host_endpoint": grpc_host_endpoint,
+		"grpc_port_endpoint": grpc_port_endpoint,
+		"custom_secure": custom_secure
+	}
+	# Release the client this session held before, if any
+	release_client()
 	try:
-		client = get_weaviate_client(
-			cluster_endpoint=cluster_endpoint,
-			cluster_api_key=cluster_api_key,
-			use_local=use_local,
-			vectorizer_integration_keys=vectorizer_integration_keys,
-			use_custom=use_custom,
-			http_host_endpoint=http_host_endpoint,
-			http_port_endpoint=http_port_endpoint,
-			grpc_host_endpoint=grpc_host_endpoint,
-			grpc_port_endpoint=grpc_port_endpoint,
-			custom_secure=custom_secure
-		)
+		client_key, client = acquire_weaviate_client(**connection_args)
+		st.session_state.client_key = client_key
+		st.session_state.client_args = connection_args
 		st.session_state.client = client
-		ready, server_version, client_version = status(client)
-		st.session_state.client_ready = ready
-		st.session_state.server_version = server_version
-		st.session_state.client_version = client_version
+		# Readiness, version and nodes are polled in the background from now on, see utils/connection/health.py
+		start_health_monitor(client_key)
+		if validate_in_background:
+			# The session counts as connected until the first health check says otherwise, see poll_client_status()
+			st.session_state.client_status_pending = True
+			st.session_state.client_ready = True
+			st.session_state.server_version = "Validating..."
+			st.session_state.client_version = weaviate.__version__
+		else:
+			ready, server_version, client_version = status(client, client_key)
+			st.session_state.client_ready = ready
+			st.session_state.server_version = server_version
+			st.session_state.client_version = client_version
 		return True
 	except Exception as e:
 		st.sidebar.error(f"Connection Error: {e}")
+		release_client()
 		st.session_state.client = None
 		st.session_state.client_ready = False
 		return False
+
+# Returns this session's pooled client, reconnecting if the pool evicted it while idle.
+def refresh_client():
+	client_key = st.session_state.get("client_key")
+	if not client_key:
+		return st.session_state.get("client")
+	client = touch_weaviate_client(client_key)
+	if client is None:
+		print(f"Pooled client {client_key} was evicted, reconnecting")
+		client_key, client = acquire_weaviate_client(**st.session_state.client_args)
+		st.session_state.client_key = client_key
+		start_health_monitor(client_key)
+	st.session_state.client = client
+	return client
+
+# Keeps this session's pooled client from being evicted while an action runs, see weaviate_client_in_use().
+def client_in_use():
+	return weaviate_client_in_use(st.session_state.get("client_key"))
+
+# Releases this session's reference to its pooled client.
+def release_client():
+	client_key = st.session_state.pop("client_key", None)
+	st.session_state.pop("client_args", None)
+	if client_key:
+		release_weaviate_client(client_key)
+
+# Applies the first health check of a new connection once it is done.
+# Returns False while the check is still running, True otherwise.
+def poll_client_status():
+	if not st.session_state.get("client_status_pending"):
+		return True
+	snapshot = get_health_snapshot(st.session_state.get("client_key"))
+	if snapshot is None:
+		return False
+	del st.session_state.client_status_pending
+	st.session_state.server_version = snapshot["server_version"]
+	st.session_state.client_version = snapshot["client_version"]
+	if not snapshot["ready"] or snapshot["server_version"] == "N/A":
+		st.session_state.client_ready = False
+		st.session_state.client_status_error = "Connection failed! The cluster is not ready or not reachable."
+		release_client()
+		st.session_state.client = None
+	return True
@@ -1,74 +1,372 @@
 import weaviate
 import atexit
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 from weaviate.config import AdditionalConfig, Timeout
+from utils.connection.async_runner import run_async
+from utils.connection.deadlines import OPERATION_DEADLINES
+from utils.connection.metadata_cache import get_cluster_metadata
 
-_client = None
+# Client pool keyed by endpoint + credentials + connection mode, so every session
+# connected to the same cluster with the same credentials shares one client while
+# sessions pointing at other clusters get their own.
+# Feel free to change the limits through the environment variables.
+POOL_MAX_SIZE = int(os.environ.get("WEAVIATE_POOL_MAX_SIZE", 16))
+POOL_IDLE_TIMEOUT = int(os.environ.get("WEAVIATE_POOL_IDLE_TIMEOUT", 1800))
+
+# Client-wide timeouts derived from the per-operation deadlines. The client has one query timeout for
+# every call, so it is the largest budget a single call may need: one aggregate (over_all) call of a large
+# collection can take the whole aggregate budget. Multi-call operations are bounded by their own Deadline
+# on top of this.
+CLIENT_TIMEOUT = Timeout(
+    init=OPERATION_DEADLINES["init"],
+    query=max(OPERATION_DEADLINES["nodes"], OPERATION_DEADLINES["fetch"], OPERATION_DEADLINES["aggregate"]),
+    insert=OPERATION_DEADLINES["batch_insert"],
+)
+
+_pool = {}
+_pool_lock = threading.Lock()
+
+# Client timeouts of a connection. A query_timeout (seconds) bounds every call of the client and its
+# connect instead of CLIENT_TIMEOUT, e.g. for the fleet view where every cluster has its own deadline.
+def _client_timeout(query_timeout=None):
+    if query_timeout is None:
+        return CLIENT_TIMEOUT
+    return Timeout(
+        init=min(OPERATION_DEADLINES["init"], query_timeout),
+        query=query_timeout,
+        insert=OPERATION_DEADLINES["batch_insert"],
+    )
+
+# Build the pool key for a set of connection arguments. Secrets are hashed so the key is safe to log.
+# Clients with their own query_timeout are separate entries, so they never shorten a session's calls.
+def make_client_key(cluster_endpoint=None, cluster_api_key=None, use_local=False, vectorizer_integration_keys=None, use_custom=False, http_host_endpoint=None, http_port_endpoint=None, grpc_host_endpoint=None, grpc_port_endpoint=None, custom_secure=False, query_timeout=None):
+    if use_local:
+        mode = "local"
+        endpoint = f"localhost:{http_port_endpoint}/{grpc_port_endpoint}"
+    elif use_custom:
+        mode = "custom"
+        endpoint = f"{http_host_endpoint}:{http_port_endpoint}/{grpc_host_endpoint}:{grpc_port_endpoint}/secure={custom_secure}"
+    else:
+        mode = "cloud"
+        endpoint = cluster_endpoint
+    headers = sorted((vectorizer_integration_keys or {}).items())
+    credentials = hashlib.sha256(f"{cluster_api_key or ''}|{headers}".encode()).hexdigest()[:16]
+    key = f"{mode}|{endpoint}|{credentials}"
+    return f"{key}|timeout={query_timeout:g}" if query_timeout is not None else key
 
 # Connect to Weaviate server
-def get_weaviate_client(cluster_endpoint=None, cluster_api_key=None, use_local=False, vectorizer_integration_keys=None, use_custom=False, http_host_endpoint=None, http_port_endpoint=None, grpc_host_endpoint=None, grpc_port_endpoint=None, custom_secure=False):
-    print("get_weaviate_client() called")
-    global _client
-    
-    if _client is None:
-        headers = vectorizer_integration_keys if vectorizer_integration_keys else {}
-        if cluster_api_key:
-            auth_credentials = weaviate.auth.AuthApiKey(cluster_api_key)
-        else:
-            auth_credentials = None
-
-        if use_local:
-            _client = weaviate.connect_to_local(
-                auth_credentials=auth_credentials,
-                port=http_port_endpoint,
-                grpc_port=grpc_port_endpoint,
-                skip_init_checks=True,
-                additional_config=AdditionalConfig(
-                    timeout=Timeout(init=90, query=900, insert=900)
-                ),
-                headers=headers,
-            )
-        elif use_custom:
-            _client = weaviate.connect_to_custom(
-                http_host=http_host_endpoint,
-                http_port=http_port_endpoint,
-                http_secure=custom_secure,
-                grpc_host=grpc_host_endpoint,
-                grpc_port=grpc_port_endpoint,
-                grpc_secure=custom_secure,
-                auth_credentials=auth_credentials,
-                skip_init_checks=True,
-                additional_config=AdditionalConfig(
-                    timeout=Timeout(init=90, query=900, insert=900)
-                ),
-                headers=headers,
-            )
-        else:
-            _client = weaviate.connect_to_weaviate_cloud(
-                cluster_url=cluster_endpoint,
-                auth_credentials=auth_credentials,
-                skip_init_checks=True,
-                additional_config=AdditionalConfig(
-                    timeout=Timeout(init=90, query=900, insert=900)
-                ),
-                headers=headers,
-            )
-        atexit.register(close_weaviate_client)
-    return _client
-
-# Close the Weaviate client connection
+def _connect(cluster_endpoint=None, cluster_api_key=None, use_local=False, vectorizer_integration_keys=None, use_custom=False, http_host_endpoint=None, http_port_endpoint=None, grpc_host_endpoint=None, grpc_port_endpoint=None, custom_secure=False, query_timeout=None):
+    print("_connect() called")
+    headers = vectorizer_integration_keys if vectorizer_integration_keys else {}
+    if cluster_api_key:
+        auth_credentials = weaviate.auth.AuthApiKey(cluster_api_key)
+    else:
+        auth_credentials = None
+
+    if use_local:
+        return weaviate.connect_to_local(
+            auth_credentials=auth_credentials,
+            port=http_port_endpoint,
+            grpc_port=grpc_port_endpoint,
+            skip_init_checks=True,
+            additional_config=AdditionalConfig(
+                timeout=_client_timeout(query_timeout)
+            ),
+            headers=headers,
+        )
+    elif use_custom:
+        return weaviate.connect_to_custom(
+            http_host=http_host_endpoint,
+            http_port=http_port_endpoint,
+            http_secure=custom_secure,
+            grpc_host=grpc_host_endpoint,
+            grpc_port=grpc_port_endpoint,
+            grpc_secure=custom_secure,
+            auth_credentials=auth_credentials,
+            skip_init_checks=True,
+            additional_config=AdditionalConfig(
+                timeout=_client_timeout(query_timeout)
+            ),
+            headers=headers,
+        )
+    else:
+        return weaviate.connect_to_weaviate_cloud(
+            cluster_url=cluster_endpoint,
+            auth_credentials=auth_credentials,
+            skip_init_checks=True,
+            additional_config=AdditionalConfig(
+                timeout=_client_timeout(query_timeout)
+            ),
+            headers=headers,
+        )
+
+# Connect the async Weaviate client, must run on the async runner loop
+async def _connect_async(cluster_endpoint=None, cluster_api_key=None, use_local=False, vectorizer_integration_keys=None, use_custom=False, http_host_endpoint=None, http_port_endpoint=None, grpc_host_endpoint=None, grpc_port_endpoint=None, custom_secure=False, query_timeout=None):
+    print("_connect_async() called")
+    headers = vectorizer_integration_keys if vectorizer_integration_keys else {}
+    if cluster_api_key:
+        auth_credentials = weaviate.auth.AuthApiKey(cluster_api_key)
+    else:
+        auth_credentials = None
+
+    if use_local:
+        client = weaviate.use_async_with_local(
+            auth_credentials=auth_credentials,
+            port=http_port_endpoint,
+            grpc_port=grpc_port_endpoint,
+            skip_init_checks=True,
+            additional_config=AdditionalConfig(
+                timeout=_client_timeout(query_timeout)
+            ),
+            headers=headers,
+        )
+    elif use_custom:
+        client = weaviate.use_async_with_custom(
+            http_host=http_host_endpoint,
+            http_port=http_port_endpoint,
+            http_secure=custom_secure,
+            grpc_host=grpc_host_endpoint,
+            grpc_port=grpc_port_endpoint,
+            grpc_secure=custom_secure,
+            auth_credentials=auth_credentials,
+            skip_init_checks=True,
+            additional_config=AdditionalConfig(
+                timeout=_client_timeout(query_timeout)
+            ),
+            headers=headers,
+        )
+    else:
+        client = weaviate.use_async_with_weaviate_cloud(
+            cluster_url=cluster_endpoint,
+            auth_credentials=auth_credentials,
+            skip_init_checks=True,
+            additional_config=AdditionalConfig(
+                timeout=_client_timeout(query_timeout)
+            ),
+            headers=headers,
+        )
+    await client.connect()
+    return client
+
+# Close a pooled client without raising, the entry must already be removed from the pool
+def _close_entry(client_key, entry):
+    if entry["client"] is None:
+        # Still connecting, acquire_weaviate_client() closes it once connected
+        return
+    print(f"Closing pooled Weaviate client: {client_key}")
+    try:
+        entry["client"].close()
+        if entry.get("async_client") is not None:
+            run_async(entry["async_client"].close(), timeout=30)
+    except Exception as e:
+        print(f"Error closing Weaviate client {client_key}: {e}")
+
+# Remove idle clients from the pool. Must be called with _pool_lock held. Returns the removed entries.
+# A client is idle when no session touched it for POOL_IDLE_TIMEOUT seconds (sessions whose browser tab
+# was closed never release their reference, so the timeout also applies to referenced clients), unless
+# an operation is using it (see weaviate_client_in_use) or it is still connecting.
+# When the pool is still full, unreferenced clients are evicted in least recently used order.
+def _evict_locked(now, make_room=False):
+    evicted = []
+    for client_key, entry in list(_pool.items()):
+        if now - entry["last_used"] > POOL_IDLE_TIMEOUT and entry["in_use"] <= 0 and entry["client"] is not None:
+            evicted.append((client_key, _pool.pop(client_key)))
+
+    if make_room and len(_pool) >= POOL_MAX_SIZE:
+        unreferenced = sorted(
+            (entry["last_used"], client_key) for client_key, entry in _pool.items() if entry["refs"] <= 0 and entry["in_use"] <= 0
+        )
+        for _, client_key in unreferenced[:len(_pool) - POOL_MAX_SIZE + 1]:
+            evicted.append((client_key, _pool.pop(client_key)))
+    return evicted
+
+# Acquire a client from the pool, connecting if no client exists for these arguments yet.
+# Returns (client_key, client). Every acquire must be paired with release_weaviate_client(client_key).
+# The connection is opened outside the pool lock, so a slow or unreachable cluster only delays the
+# sessions acquiring that same client: they wait on its pending entry instead of opening a second one.
+def acquire_weaviate_client(**connection_args):
+    print("acquire_weaviate_client() called")
+    client_key = make_client_key(**connection_args)
+    now = time.monotonic()
+    evicted = []
+    connecting = None
+
+    try:
+        with _pool_lock:
+            evicted += _evict_locked(now)
+            entry = _pool.get(client_key)
+            if entry is not None:
+                entry["refs"] += 1
+                entry["last_used"] = now
+                client = entry["client"]
+                pending = entry["connecting"]
+            else:
+                evicted += _evict_locked(now, make_room=True)
+                if len(_pool) >= POOL_MAX_SIZE:
+                    client = pending = None
+                else:
+                    client = None
+                    pending = connecting = Future()
+                    entry = {"client": None, "async_client": None, "args": connection_args, "refs": 1, "in_use": 0, "last_used": now, "connecting": connecting, "async_connecting": None}
+                    _pool[client_key] = entry
+    finally:
+        for key, old_entry in evicted:
+            _close_entry(key, old_entry)
+
+    if connecting is not None:
+        try:
+            client = _connect(**connection_args)
+        except Exception as e:
+            with _pool_lock:
+                if _pool.get(client_key) is entry:
+                    del _pool[client_key]
+            connecting.set_exception(e)
+            raise
+        with _pool_lock:
+            published = _pool.get(client_key) is entry
+            if published:
+                entry["client"] = client
+                entry["connecting"] = None
+        if not published:
+            # The pool was closed while connecting
+            client.close()
+            connecting.set_exception(RuntimeError("Weaviate client pool was closed while connecting."))
+            raise RuntimeError("Weaviate client pool was closed while connecting.")
+        connecting.set_result(client)
+    elif pending is not None:
+        # Another session is connecting the same client, its error is raised here as well
+        client = pending.result()
+
+    if client is None:
+        raise RuntimeError(f"Weaviate client pool is full ({POOL_MAX_SIZE} active connections). Try again later.")
+    return client_key, client
+
+# Mark a pooled client as used and return it, or None if it was evicted. A client that is still connecting
+# was not evicted: this waits for it (outside the pool lock) and raises its connection error, if any.
+def touch_weaviate_client(client_key):
+    with _pool_lock:
+        entry = _pool.get(client_key)
+        if entry is None:
+            return None
+        entry["last_used"] = time.monotonic()
+        client = entry["client"]
+        pending = entry["connecting"]
+    if client is None and pending is not None:
+        client = pending.result()
+    return client
+
+# Return a pooled client without marking it as used (background work must not keep it alive), or None.
+def peek_weaviate_client(client_key):
+    with _pool_lock:
+        entry = _pool.get(client_key)
+        return entry["client"] if entry is not None else None
+
+# Keep a pooled client from being evicted while a long running operation uses it, e.g. an export or a
+# sync aggregation that never touches the client between its calls.
+@contextmanager
+def weaviate_client_in_use(client_key):
+    with _pool_lock:
+        entry = _pool.get(client_key)
+        if entry is not None:
+            entry["in_use"] += 1
+            entry["last_used"] = time.monotonic()
+    try:
+        yield
+    finally:
+        if entry is not None:
+            with _pool_lock:
+                entry["in_use"] -= 1
+                entry["last_used"] = time.monotonic()
+
+# Returns the async client of a pooled connection, connecting it on the async runner loop on first use.
+# Like acquire_weaviate_client(), the connection is opened outside the pool lock.
+def get_weaviate_async_client(client_key):
+    print("get_weaviate_async_client() called")
+    connecting = None
+    with _pool_lock:
+        entry = _pool.get(client_key)
+        if entry is None or entry["client"] is None:
+            raise RuntimeError("Weaviate client is not connected. Please reconnect.")
+        entry["last_used"] = time.monotonic()
+        if entry["async_client"] is not None:
+            return entry["async_client"]
+        pending = entry["async_connecting"]
+        if pending is None:
+            pending = connecting = entry["async_connecting"] = Future()
+
+    if connecting is None:
+        return pending.result()
+    try:
+        async_client = run_async(_connect_async(**entry["args"]), timeout=120)
+    except Exception as e:
+        with _pool_lock:
+            entry["async_connecting"] = None
+        connecting.set_exception(e)
+        raise
+    with _pool_lock:
+        entry["async_connecting"] = None
+        published = _pool.get(client_key) is entry
+        if published:
+            entry["async_client"] = async_client
+    if not published:
+        # The client was evicted while connecting
+        run_async(async_client.close(), timeout=30)
+        connecting.set_exception(RuntimeError("Weaviate client is not connected. Please reconnect."))
+        raise RuntimeError("Weaviate client is not connected. Please reconnect.")
+    connecting.set_result(async_client)
+    return async_client
+
+# Release one reference to a pooled client. The client stays open for reuse until it is evicted as idle.
+def release_weaviate_client(client_key):
+    print(f"release_weaviate_client() called for: {client_key}")
+    with _pool_lock:
+        entry = _pool.get(client_key)
+        if entry is not None:
+            entry["refs"] = max(entry["refs"] - 1, 0)
+            entry["last_used"] = time.monotonic()
+        evicted = _evict_locked(time.monotonic())
+
+    for key, old_entry in evicted:
+        _close_entry(key, old_entry)
+
+# Snapshot of the client pool, one row per pooled connection (API keys are never shown)
+def get_pool_stats():
+    now = time.monotonic()
+    with _pool_lock:
+        return [
+            {
+                "Client Key": client_key.rsplit("|", 1)[0],
+                "References": entry["refs"],
+                "In Use": entry["in_use"],
+                "Connecting": entry["client"] is None,
+                "Async Client": entry["async_client"] is not None,
+                "Idle (s)": round(now - entry["last_used"], 1),
+            }
+            for client_key, entry in _pool.items()
+        ]
+
+# Close every pooled Weaviate client connection
 def close_weaviate_client():
 	print("close_weaviate_client() called")
-	global _client
-	if _client:
-		_client.close()
-		_client = None
+	with _pool_lock:
+		entries = list(_pool.items())
+		_pool.clear()
+	for client_key, entry in entries:
+		_close_entry(client_key, entry)
+
+atexit.register(close_weaviate_client)
 
-# Get Weaviate Server & Client status and version
-def status(client):
+# Get Weaviate Server & Client status and version. The version is read through the shared metadata cache.
+def status(client, client_key=None):
 	print("status() called")
 	try:
 		ready = client.is_ready()
-		server_version = client.get_meta()["version"]
+		server_version = get_cluster_metadata(client, client_key)["version"]
 		client_version = weaviate.__version__
 		return ready, server_version, client_version
 	except Exception as e:
@@ -0,0 +1,187 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency histogram bucket upper bounds in seconds (Prometheus style, +Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# Process-wide registry: operation name -> counters. Shared by every session and worker thread.
+_metrics = {}
+_metrics_lock = threading.Lock()
+_metrics_server = None
+
+# Record one call of an operation
+def record(operation, seconds, error=False, nbytes=0):
+	with _metrics_lock:
+		entry = _metrics.get(operation)
+		if entry is None:
+			entry = {"calls": 0, "errors": 0, "bytes": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)}
+			_metrics[operation] = entry
+		entry["calls"] += 1
+		entry["errors"] += 1 if error else 0
+		entry["bytes"] += nbytes
+		entry["sum"] += seconds
+		entry["max"] = max(entry["max"], seconds)
+		for index, bound in enumerate(LATENCY_BUCKETS):
+			if seconds <= bound:
+				entry["buckets"][index] += 1
+				break
+		else:
+			entry["buckets"][-1] += 1
+
+# The repo's functions report failures in their return value rather than raising:
+# {"error": ...} dicts and (False, message, ...) tuples both count as errors.
+def _is_error_result(result):
+	if isinstance(result, dict):
+		return "error" in result
+	if isinstance(result, tuple) and result and result[0] is False:
+		return True
+	return False
+
+# Time a block of code, e.g. one iteration of a loop
+@contextmanager
+def timed(operation):
+	start = time.perf_counter()
+	error = False
+	try:
+		yield
+	except BaseException:
+		error = True
+		raise
+	finally:
+		record(operation, time.perf_counter() - start, error=error)
+
+# Decorator recording latency, call and error counts of a function. Generator functions are timed
+# from the first to the last item, and count as failed when they yield a (False, ...) result.
+def instrument(operation):
+	def decorator(func):
+		if inspect.isgeneratorfunction(func):
+			@functools.wraps(func)
+			def generator_wrapper(*args, **kwargs):
+				start = time.perf_counter()
+				error = False
+				try:
+					for item in func(*args, **kwargs):
+						error = error or _is_error_result(item)
+						yield item
+				except BaseException:
+					error = True
+					raise
+				finally:
+					record(operation, time.perf_counter() - start, error=error)
+			return generator_wrapper
+
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			start = time.perf_counter()
+			try:
+				result = func(*args, **kwargs)
+			except BaseException:
+				record(operation, time.perf_counter() - start, error=True)
+				raise
+			record(operation, time.perf_counter() - start, error=_is_error_result(result))
+			return result
+		return wrapper
+	return decorator
+
+# Snapshot of all operations, one row per operation (estimated percentiles from the histogram)
+def get_metrics_summary():
+	with _metrics_lock:
+		snapshot = {operation: {**entry, "buckets": list(entry["buckets"])} for operation, entry in _metrics.items()}
+
+	def percentile(entry, fraction):
+		target = entry["calls"] * fraction
+		seen = 0
+		for index, count in enumerate(entry["buckets"]):
+			seen += count
+			if seen >= target and count:
+				return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else entry["max"]
+		return 0.0
+
+	rows = []
+	for operation, entry in sorted(snapshot.items()):
+		rows.append({
+			"Operation": operation,
+			"Calls": entry["calls"],
+			"Errors": entry["errors"],
+			"Error Rate": round(entry["errors"] / entry["calls"], 4) if entry["calls"] else 0.0,
+			"Mean (s)": round(entry["sum"] / entry["calls"], 4) if entry["calls"] else 0.0,
+			"p50 <= (s)": percentile(entry, 0.5),
+			"p95 <= (s)": percentile(entry, 0.95),
+			"Max (s)": round(entry["max"], 4),
+			"Total Time (s)": round(entry["sum"], 3),
+			"Bytes": entry["bytes"],
+		})
+	return rows
+
+# Prometheus text exposition format (version 0.0.4)
+def render_prometheus():
+	with _metrics_lock:
+		snapshot = {operation: {**entry, "buckets": list(entry["buckets"])} for operation, entry in _metrics.items()}
+
+	def label(operation):
+		return operation.replace("\\", "\\\\").replace('"', '\\"')
+
+	lines = [
+		"# HELP weaviate_cluster_app_operation_duration_seconds Latency of calls to Weaviate by operation.",
+		"# TYPE weaviate_cluster_app_operation_duration_seconds histogram",
+	]
+	for operation, entry in sorted(snapshot.items()):
+		cumulative = 0
+		for bound, count in zip(LATENCY_BUCKETS, entry["buckets"]):
+			cumulative += count
+			lines.append(f'weaviate_cluster_app_operation_duration_seconds_bucket{{operation="{label(operation)}",le="{bound}"}} {cumulative}')
+		lines.append(f'weaviate_cluster_app_operation_duration_seconds_bucket{{operation="{label(operation)}",le="+Inf"}} {entry["calls"]}')
+		lines.append(f'weaviate_cluster_app_operation_duration_seconds_sum{{operation="{label(operation)}"}} {entry["sum"]}')
+		lines.append(f'weaviate_cluster_app_operation_duration_seconds_count{{operation="{label(operation)}"}} {entry["calls"]}')
+
+	lines += [
+		"# HELP weaviate_cluster_app_operation_errors_total Failed calls to Weaviate by operation.",
+		"# TYPE weaviate_cluster_app_operation_errors_total counter",
+	]
+	for operation, entry in sorted(snapshot.items()):
+		lines.append(f'weaviate_cluster_app_operation_errors_total{{operation="{label(operation)}"}} {entry["errors"]}')
+
+	lines += [
+		"# HELP weaviate_cluster_app_response_bytes_total Response bytes received from Weaviate by operation (REST calls).",
+		"# TYPE weaviate_cluster_app_response_bytes_total counter",
+	]
+	for operation, entry in sorted(snapshot.items()):
+		lines.append(f'weaviate_cluster_app_response_bytes_total{{operation="{label(operation)}"}} {entry["bytes"]}')
+	return "\n".join(lines) + "\n"
+
+# Clear all recorded metrics
+def reset_metrics():
+	with _metrics_lock:
+		_metrics.clear()
+
+# Serve /metrics for Prometheus scraping on WEAVIATE_METRICS_PORT, if set. Safe to call on every rerun.
+def start_metrics_server_from_env():
+	global _metrics_server
+	port = os.environ.get("WEAVIATE_METRICS_PORT")
+	with _metrics_lock:
+		if not port or _metrics_server is not None:
+			return
+
+		class MetricsHandler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				if self.path.split("?")[0] != "/metrics":
+					self.send_error(404)
+					return
+				body = render_prometheus().encode()
+				self.send_response(200)
+				self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+				self.send_header("Content-Length", str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, *args):
+				pass
+
+		_metrics_server = ThreadingHTTPServer(("0.0.0.0", int(port)), MetricsHandler)
+		threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+		print(f"Metrics server listening on :{port}/metrics")
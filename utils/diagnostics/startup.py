@@ -0,0 +1,40 @@
+import importlib
+import os
+import threading
+import time
+
+# Cold start budget in seconds, from the first script run to the sidebar being painted.
+# Feel free to change it through the environment variable.
+STARTUP_BUDGET_SECONDS = float(os.environ.get("WEAVIATE_STARTUP_BUDGET", 3.0))
+
+# Process-wide timings. Imports are only slow the first time, so the first measurement is kept.
+_import_timings = {}
+_first_paint = None
+_timings_lock = threading.Lock()
+
+# Import a module and record how long the first import took
+def timed_import(module_name):
+	start = time.perf_counter()
+	module = importlib.import_module(module_name)
+	elapsed = time.perf_counter() - start
+	with _timings_lock:
+		_import_timings.setdefault(module_name, elapsed)
+	return module
+
+# Record the time from script start to the sidebar being painted. Only the first (cold) run is kept.
+def mark_first_paint(script_start):
+	global _first_paint
+	with _timings_lock:
+		if _first_paint is None:
+			_first_paint = time.perf_counter() - script_start
+		return _first_paint
+
+# Startup report: first paint, budget and per-module import times in seconds
+def get_startup_report():
+	with _timings_lock:
+		return {
+			"first_paint": _first_paint,
+			"budget": STARTUP_BUDGET_SECONDS,
+			"over_budget": _first_paint is not None and _first_paint > STARTUP_BUDGET_SECONDS,
+			"imports": sorted(_import_timings.items(), key=lambda item: item[1], reverse=True),
+		}
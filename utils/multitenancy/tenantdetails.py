@@ -1,6 +1,8 @@
 import streamlit as st
+from utils.diagnostics.metrics import instrument
 
 # Get tenants from a collection.
+@instrument("get_tenant_details")
 def get_tenant_details(client, collection):
 	print(f"get_tenant_details() called for collection: {collection}")
 	col = client.collections.get(collection)
@@ -1,7 +1,11 @@
+import asyncio
 import pandas as pd
-import requests
+from utils.connection.rest_session import rest_get
+from utils.connection.async_runner import run_async, gather_limited
+from utils.diagnostics.metrics import instrument
 
 # Get object in Non Multitenant collection
+@instrument("get_object_in_collection")
 def get_object_in_collection(client, collection_name, uuid):
 	collection = client.collections.get(collection_name)
 	data_object = collection.query.fetch_object_by_id(uuid, include_vector=True)
@@ -13,6 +17,7 @@ def get_object_in_collection(client, collection_name, uuid):
 	return data_object
 
 # Get object in Multitenant collection
+@instrument("get_object_in_tenant")
 def get_object_in_tenant(client, collection_name, uuid, tenant):
 	collection = client.collections.get(collection_name).with_tenant(tenant)
 	data_object = collection.query.fetch_object_by_id(uuid, include_vector=True)
@@ -50,67 +55,59 @@ def display_object_as_table(data_object):
 
 	return df
 
-# Find object in in the nodes in a Non Multitenant collection
-def find_object_in_collection_on_nodes(client_endpoint, api_key, collection_name, object_uuid):
-
-	node_names = [
-		"weaviate-0", "weaviate-1", "weaviate-2", "weaviate-3",
-		"weaviate-4", "weaviate-5", "weaviate-6", "weaviate-7",
-		"weaviate-8", "weaviate-9", "weaviate-10", "weaviate-11"
-	]
-
-	headers = {"Authorization": f"Bearer {api_key}"}
-	results = {}
-
-	for node in node_names:
-		url = f"{client_endpoint}/v1/objects/{collection_name}/{object_uuid}"
-		params_single = {"node_name": node}
-
-		resp_single = requests.get(url, params=params_single, headers=headers)
-
-		if resp_single.status_code == 200:
-			results[node] = "✔" # Found
-		elif resp_single.status_code == 404:
-			results[node] = "✖" # Not Found
-		elif resp_single.status_code == 500:
-			results[node] = "N/A" # Not applicable as the node does not exist
-		else:
-			results[node] = f"Error {resp_single.status_code}" # Error
+# Nodes checked for an object copy (StatefulSet pod names)
+NODE_NAMES = [
+	"weaviate-0", "weaviate-1", "weaviate-2", "weaviate-3",
+	"weaviate-4", "weaviate-5", "weaviate-6", "weaviate-7",
+	"weaviate-8", "weaviate-9", "weaviate-10", "weaviate-11"
+]
+
+# Probe one node for an object copy
+def probe_node(client_endpoint, api_key, collection_name, object_uuid, node, tenant=None):
+	params_single = {"node_name": node}
+	if tenant:
+		params_single["tenant"] = tenant
+
+	resp_single = rest_get(client_endpoint, api_key, f"/v1/objects/{collection_name}/{object_uuid}", params=params_single, timeout=(5, 30))
+
+	if resp_single.status_code == 200:
+		return "✔" # Found
+	elif resp_single.status_code == 404:
+		return "✖" # Not Found
+	elif resp_single.status_code == 500:
+		return "N/A" # Not applicable as the node does not exist
+	else:
+		return f"Error {resp_single.status_code}" # Error
+
+# Probe all nodes, one at a time or concurrently on the async runner when concurrency > 1.
+# node_names defaults to NODE_NAMES when the cluster's node names are not known.
+def probe_nodes(client_endpoint, api_key, collection_name, object_uuid, tenant=None, concurrency=1, node_names=None):
+	node_names = node_names or NODE_NAMES
+	if concurrency > 1:
+		factories = [
+			lambda node=node: asyncio.to_thread(probe_node, client_endpoint, api_key, collection_name, object_uuid, node, tenant)
+			for node in node_names
+		]
+		statuses = run_async(gather_limited(factories, concurrency))
+		statuses = [f"Error {status}" if isinstance(status, Exception) else status for status in statuses]
+	else:
+		statuses = [probe_node(client_endpoint, api_key, collection_name, object_uuid, node, tenant) for node in node_names]
+	return dict(zip(node_names, statuses))
 
+# Find object in in the nodes in a Non Multitenant collection
+def find_object_in_collection_on_nodes(client_endpoint, api_key, collection_name, object_uuid, concurrency=1, node_names=None):
+	results = probe_nodes(client_endpoint, api_key, collection_name, object_uuid, concurrency=concurrency, node_names=node_names)
 	df = pd.DataFrame([results], index=[object_uuid])
 	return df
 
 # Find object in in the nodes in a Multitenant collection
-def find_object_in_tenant_on_nodes(client_endpoint, api_key, collection_name, object_uuid, tenant):
-
-	node_names = [
-		"weaviate-0", "weaviate-1", "weaviate-2", "weaviate-3",
-		"weaviate-4", "weaviate-5", "weaviate-6", "weaviate-7",
-		"weaviate-8", "weaviate-9", "weaviate-10", "weaviate-11"
-	]
-
-	headers = {"Authorization": f"Bearer {api_key}"}
-	results = {}
-
-	for node in node_names:
-		url = f"{client_endpoint}/v1/objects/{collection_name}/{object_uuid}"
-		params_single = {"node_name": node, "tenant": tenant}
-
-		resp_single = requests.get(url, params=params_single, headers=headers)
-
-		if resp_single.status_code == 200:
-			results[node] = "✔" # Found
-		elif resp_single.status_code == 404:
-			results[node] = "✖" # Not Found
-		elif resp_single.status_code == 500:
-			results[node] = "N/A" # Not applicable as the node does not exist
-		else:
-			results[node] = f"Error {resp_single.status_code}"
-
+def find_object_in_tenant_on_nodes(client_endpoint, api_key, collection_name, object_uuid, tenant, concurrency=1, node_names=None):
+	results = probe_nodes(client_endpoint, api_key, collection_name, object_uuid, tenant=tenant, concurrency=concurrency, node_names=node_names)
 	df = pd.DataFrame([results], index=[object_uuid])
 	return df
 
 # Update object
+@instrument("update_object_properties")
 def update_object_properties(client, collection_name, uuid, properties, tenant=None):
 	try:
 		collection = client.collections.get(collection_name)
@@ -1,5 +1,7 @@
 from typing import Any, List, Dict
+from utils.diagnostics.metrics import instrument
 
+@instrument("list_all_users")
 def list_all_users(client: Any) -> List[Dict]:
     print("list_all_users() called")
     all_users = client.users.db.list_all()
@@ -13,6 +15,7 @@ def list_all_users(client: Any) -> List[Dict]:
         })
     return users_data
 
+@instrument("list_all_roles")
 def list_all_roles(client: Any) -> List[Dict]:
     print("list_all_roles() called")
     all_roles = client.roles.list_all()
@@ -51,6 +54,7 @@ def list_all_roles(client: Any) -> List[Dict]:
         })
     return roles_data
 
+@instrument("list_all_permissions")
 def list_all_permissions(client: Any) -> List[Dict]:
     print("list_all_permissions() called")
     all_roles = client.roles.list_all()
@@ -150,6 +154,7 @@ def list_all_permissions(client: Any) -> List[Dict]:
                 })
     return permissions_data
 
+@instrument("list_users_roles_permissions_combined")
 def list_users_roles_permissions_combined(client: Any) -> List[Dict]:
     print("list_users_roles_permissions_combined() called")
     all_users = client.users.db.list_all()
@@ -5,9 +5,11 @@ import pandas as pd
 from typing import Tuple
 from weaviate import Client
 from weaviate.classes.query import MetadataQuery
+from utils.diagnostics.metrics import instrument
 
 # Hybrid search function
 # This function performs a hybrid search on a specified collection in Weaviate.
+@instrument("hybrid_search")
 def hybrid_search(client: Client, collection: str, query: str, alpha: float = 0.5, limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
 	try:
 		# Get collection
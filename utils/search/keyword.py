@@ -4,9 +4,11 @@ import pandas as pd
 from typing import Tuple
 from weaviate import Client
 from weaviate.classes.query import MetadataQuery
+from utils.diagnostics.metrics import instrument
 
 # Keyword search function
 # This function performs a keyword search on a specified collection in Weaviate.
+@instrument("keyword_search")
 def keyword_search(client: Client, collection: str, query: str, limit: int = 3) -> Tuple[bool, str, pd.DataFrame, float]:
 	try:
 		# Get collection
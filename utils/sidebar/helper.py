@@ -1,15 +1,71 @@
 import streamlit as st
 
+# Poll the background connection check every second and rerun the app once it is done
+@st.fragment(run_every=1)
+def wait_for_connection_check():
+    from utils.connection.weaviate_client import poll_client_status
+    if poll_client_status():
+        st.rerun()
+    st.info("Connection Status: ⏳ Validating...")
+
+# Cluster health from the background monitor's snapshot (never queries the cluster). Reruns on its own
+# so the age of the snapshot stays current.
+@st.fragment(run_every=5)
+def health_status():
+    from utils.connection.health import get_health_snapshot, request_health_check, snapshot_age, is_stale, format_age
+    client_key = st.session_state.get("client_key")
+    snapshot = get_health_snapshot(client_key)
+    if snapshot is None:
+        st.info("Connection Status: ⏳ Checking...")
+        return
+
+    healthy_nodes = sum(1 for node in snapshot["nodes"] if node["status"] == "HEALTHY")
+    if snapshot["ready"] and not snapshot["error"] and healthy_nodes == len(snapshot["nodes"]):
+        st.info("Connection Status: ✅")
+    elif snapshot["ready"]:
+        st.warning("Connection Status: ⚠️ Degraded")
+    else:
+        st.error("Connection Status: ❌ Not ready")
+    if snapshot["nodes"]:
+        st.info(f"Healthy Nodes: {healthy_nodes}/{len(snapshot['nodes'])}")
+    if snapshot["error"]:
+        st.caption(f"Last check failed: {snapshot['error']}")
+
+    age = snapshot_age(snapshot)
+    if is_stale(snapshot):
+        st.warning(f"Health data is stale, last checked {format_age(age)}")
+    else:
+        st.caption(f"Health checked {format_age(age)}")
+    if st.button("Check Health Now", use_container_width=True):
+        request_health_check(client_key)
+
 # Update the side bar labels on the fly
 def update_side_bar_labels():
     print("update_side_bar_labels called")
+    if st.session_state.get("client_ready"):
+        # Imported here so pages render before the Weaviate client is loaded
+        from utils.connection.weaviate_client import refresh_client, poll_client_status
+        poll_client_status()
+    if st.session_state.get("client_status_error"):
+        st.sidebar.error(st.session_state.pop("client_status_error"))
     if not st.session_state.get("client_ready"):
         st.warning("Please Establish a connection to Weaviate on the side bar")
+    elif "client_status_pending" in st.session_state:
+        refresh_client()
+        with st.sidebar:
+            wait_for_connection_check()
+        st.sidebar.info(f"Current Connected Endpoint: {st.session_state.get('active_endpoint', 'N/A')}")
     else:
-        st.sidebar.info("Connection Status: ✅")
+        refresh_client()
+        # The shared metadata cache is kept current by the health monitor, reading it never calls the cluster
+        from utils.connection.metadata_cache import peek_cluster_metadata
+        meta = peek_cluster_metadata(st.session_state.get("client_key"))
+        server_version = meta.get("version", "N/A") if meta else st.session_state.get('server_version', 'N/A')
+        with st.sidebar:
+            health_status()
         st.sidebar.info(f"Current Connected Endpoint: {st.session_state.get('active_endpoint', 'N/A')}")
         st.sidebar.info(f"Client Version: {st.session_state.get('client_version', 'N/A')}")
-        st.sidebar.info(f"Server Version: {st.session_state.get('server_version', 'N/A')}")
+        st.sidebar.info(f"Server Version: {server_version}")
 
 # Clear the session state
 def clear_session_state():
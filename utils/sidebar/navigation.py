@@ -9,6 +9,7 @@ def navigate():
 	logo_image = Image.open(logo_path)
 	st.sidebar.image(logo_image,width=100)
 	st.sidebar.page_link("streamlit_app.py", label="Cluster", icon="🔍")
+	st.sidebar.page_link("pages/fleet.py", label="Fleet", icon="🛰️")
 	st.sidebar.page_link("pages/multitenancy.py", label="Multi Tenancy", icon="📄")
 	st.sidebar.page_link("pages/rbac.py", label="Role-Based Access Control", icon="🔐")
 	st.sidebar.page_link("pages/search.py", label="Search", icon="🧐")
@@ -16,4 +17,5 @@ def navigate():
 	st.sidebar.page_link("pages/read.py", label="Read", icon="📁")
 	st.sidebar.page_link("pages/update.py", label="Update", icon="🗃️")
 	st.sidebar.page_link("pages/delete.py", label="Delete", icon="🗑️")
+	st.sidebar.page_link("pages/diagnostics.py", label="Diagnostics", icon="📈")
 	st.sidebar.markdown("---")